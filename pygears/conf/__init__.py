@@ -1,7 +1,7 @@
 from .log import (register_custom_log, CustomLogger, LogFmtFilter, conf_log,
                   core_log, gear_log, set_log_level, typing_log, util_log)
 from .registry import (PluginBase, clear, reset, load_plugin_folder, inject,
-                       Inject, MayInject, inject_async, reg)
+                       Inject, MayInject, inject_async, reg, reg_path, RegistryPath)
 from .trace import pygears_excepthook, register_issue, MultiAlternativeError
 from .trace_format import TraceLevel, enum_traceback
 
@@ -10,5 +10,5 @@ __all__ = [
     'typing_log', 'util_log', 'gear_log', 'conf_log', 'CustomLogger',
     'LogFmtFilter', 'pygears_excepthook', 'TraceLevel', 'enum_traceback',
     'set_log_level', 'inject', 'Inject', 'MayInject', 'MultiAlternativeError',
-    'register_custom_log'
+    'register_custom_log', 'reg_path', 'RegistryPath'
 ]
@@ -1,5 +1,6 @@
 import inspect
 import fnmatch
+import functools
 import importlib
 import os
 import re
@@ -8,8 +9,7 @@ import copy
 from dataclasses import dataclass
 from typing import Any, Callable
 
-from .utils import (dict_generator, intercept_arguments, nested_get,
-                    nested_set, safe_nested_set)
+from .utils import (dict_generator, nested_get, nested_set, safe_nested_set)
 
 delimiter = '/'
 wildcard_list = ['*', '?', '[', ']']
@@ -44,9 +44,7 @@ def inject_async(func):
     injections = tuple(v.default.args[0] for k, v in sig.parameters.items()
                        if isinstance(v.default, Inject))
 
-    func = intercept_arguments(func,
-                               cb_named=get_args_from_registry,
-                               cb_kwds=get_args_from_registry)
+    func = inject(func)
 
     try:
         all(reg[i] for i in injections)
@@ -57,10 +55,62 @@ def inject_async(func):
     return func
 
 
+def resolve_injection(dflt, path):
+    if isinstance(dflt, MayInject):
+        try:
+            return path.get()
+        except KeyError:
+            return None
+
+    return path.get()
+
+
 def inject(func):
-    return intercept_arguments(func,
-                               cb_named=get_args_from_registry,
-                               cb_kwds=get_args_from_registry)
+    '''Decorator which supplies the function arguments whose default values are
+    Inject('path') or MayInject('path') with the values from the registry at
+    the time of the call. The registry paths are bound once, when the function
+    is decorated. Inject('path') or MayInject('path') can also be passed
+    explicitly, either for these arguments, or via the **kwds of the
+    function.'''
+
+    sig = inspect.signature(func)
+
+    # For each injected argument: its name, the position at which it can be
+    # passed positionally (or None), the default value and the path handle
+    injections = []
+    for i, (name, p) in enumerate(sig.parameters.items()):
+        if isinstance(p.default, (Inject, MayInject)):
+            pos = i if p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD else None
+            injections.append((name, pos, p.default, reg_path(p.default.args[0])))
+
+    var_kwds = any(p.kind is inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values())
+
+    if not injections and not var_kwds:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwds):
+        if var_kwds:
+            for name, val in kwds.items():
+                if isinstance(val, (Inject, MayInject)) and name not in sig.parameters:
+                    kwds[name] = resolve_injection(val, reg_path(val.args[0]))
+
+        for name, pos, dflt, path in injections:
+            if pos is not None and pos < len(args):
+                val = args[pos]
+                if isinstance(val, (Inject, MayInject)):
+                    args = list(args)
+                    args[pos] = resolve_injection(val, reg_path(val.args[0]))
+            elif name in kwds:
+                val = kwds[name]
+                if isinstance(val, (Inject, MayInject)):
+                    kwds[name] = resolve_injection(val, reg_path(val.args[0]))
+            else:
+                kwds[name] = resolve_injection(dflt, path)
+
+        return func(*args, **kwds)
+
+    return wrapper
 
 
 class RegistryException(Exception):
@@ -175,10 +225,18 @@ class ConfigVariable:
 
 
 class Registry:
+    # Incremented whenever a registry or a dictionary which is a part of some
+    # registry path is replaced or removed, invalidating the RegistryPath
+    # handles
+    _version = 0
+
     def __init__(self, *args, **kwds):
         self._dict = dict(*args, **kwds)
 
     def __getitem__(self, key):
+        return self._getitem(key)
+
+    def _getitem(self, key):
         key, _, subpath = key.partition('/')
         val = self._dict.__getitem__(key)
 
@@ -201,6 +259,7 @@ class Registry:
 
     def clear(self):
         self._dict.clear()
+        Registry._version += 1
 
     def keys(self):
         return self._dict.keys()
@@ -226,6 +285,9 @@ class Registry:
                     cfgvar.val = val
                     return
 
+                if isinstance(cfgvar, (Registry, dict)):
+                    Registry._version += 1
+
             return self._dict.__setitem__(key, val)
 
         if key not in self:
@@ -268,7 +330,95 @@ class Registry:
         return self[key]
 
 
-reg = Registry()
+class RootRegistry(Registry):
+    '''Registry which looks up the paths via the interned RegistryPath
+    handles.'''
+
+    def __getitem__(self, key):
+        try:
+            path = _reg_paths[key]
+        except KeyError:
+            path = reg_path(key)
+
+        return path.get()
+
+
+reg = RootRegistry()
+
+
+class RegistryPath:
+    '''Handle for the registry path, i.e. ``reg_path('gear/root')``, which
+    resolves the path once and is then read with a single dictionary lookup.
+    The path is resolved again after any of the registries along it has been
+    replaced.
+
+    >>> root = reg_path('gear/root')
+    >>> root.get() is reg['gear/root']
+    True
+    '''
+
+    __slots__ = ('path', '_version', '_container', '_key', '_cfg')
+
+    def __init__(self, path):
+        self.path = path
+        self._version = -1
+
+    def _resolve(self):
+        container = reg
+        key = self.path
+        cfg = False
+
+        while True:
+            if isinstance(container, Registry):
+                name, _, subpath = key.partition('/')
+                if not subpath:
+                    container, key, cfg = container._dict, name, True
+                    break
+
+                container, key = container._dict[name], subpath
+            elif isinstance(container, dict):
+                break
+            else:
+                # Path continues within some other object, which needs to be
+                # resolved on each access
+                container = None
+                break
+
+        self._container = container
+        self._key = key
+        self._cfg = cfg
+        self._version = Registry._version
+
+    def get(self):
+        if self._version != Registry._version:
+            self._resolve()
+
+        if self._container is None:
+            return reg._getitem(self.path)
+
+        val = self._container[self._key]
+        if self._cfg and isinstance(val, ConfigVariable):
+            return val.val
+
+        return val
+
+    def set(self, val):
+        reg[self.path] = val
+
+    def __repr__(self):
+        return f'RegistryPath({self.path!r})'
+
+
+_reg_paths = {}
+
+
+def reg_path(path) -> RegistryPath:
+    '''Returns the interned handle for the registry path.'''
+
+    try:
+        return _reg_paths[path]
+    except KeyError:
+        return _reg_paths.setdefault(path, RegistryPath(path))
 
 
 def load_plugin_folder(path, package=None):
@@ -4,7 +4,7 @@ import inspect
 
 from typing import List
 from dataclasses import dataclass
-from pygears.conf import PluginBase, reg
+from pygears.conf import PluginBase, reg, reg_path
 from pygears.core.graph import has_async_producer
 from traceback import walk_stack
 from .intf import Intf
@@ -25,8 +25,11 @@ class GearArgsNotSpecified(Exception):
     pass
 
 
+_current_module = reg_path('gear/current_module')
+
+
 def module():
-    return reg['gear/current_module']
+    return _current_module.get()
 
 
 def filter_internals(t):
@@ -87,8 +90,13 @@ def struct_copy(s):
 
 
 class Gear(NamedHierNode):
+    # Instance dictionary is kept for the attributes set by the various passes
+    # and extensions, and is only allocated when one of them is set
+    __slots__ = ('meta_kwds', 'trace', 'args', 'params', 'func', 'const_args', 'in_ports',
+                 'out_ports', '__dict__', '__weakref__')
+
     def __init__(self, func, params):
-        super().__init__(params['name'], reg['gear/current_module'] if func else None)
+        super().__init__(params['name'], _current_module.get() if func else None)
         self.meta_kwds = getattr(func, 'meta_kwds', {}).copy()
 
         self.trace = list(enum_stacktrace())
@@ -300,6 +308,20 @@ class OutSig:
         pass
 
 
+class GearCleaner(HierVisitorBase):
+    def HierNode(self, node):
+        super().HierNode(node)
+        node.__dict__.clear()
+
+        for c in type(node).__mro__:
+            for name in getattr(c, '__slots__', ()):
+                if name not in ('__dict__', '__weakref__'):
+                    try:
+                        delattr(node, name)
+                    except AttributeError:
+                        pass
+
+
 class GearPlugin(PluginBase):
     @classmethod
     def bind(cls):
@@ -324,13 +346,5 @@ class GearPlugin(PluginBase):
 
     @classmethod
     def clear(cls):
-        class GearCleaner(HierVisitorBase):
-            def HierNode(self, node):
-                if node.definition:
-                    node.definition._cache.clear()
-
-                super().HierNode(node)
-                node.__dict__.clear()
-
         GearCleaner().visit(reg['gear/root'])
         reg['gear/root'] = Gear(None, params={'name': ''})
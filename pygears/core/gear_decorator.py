@@ -176,7 +176,7 @@ def create_unpacked_tuple_alternative(g):
         gear_inst.parent.child.remove(gear_inst)
         for port in gear_inst.in_ports:
             if port.basename not in gear_inst.const_args:
-                port.producer.consumers.remove(port)
+                port.producer.disconnect(port)
             else:
                 gear_inst.parent.child.remove(get_producer_port(port).gear)
         raise e
@@ -532,7 +532,7 @@ def gear_base_resolver(func, *args, name=None, intfs=None, **kwds):
             gear_inst.parent.child.remove(gear_inst)
             for port in gear_inst.in_ports:
                 if port.basename not in gear_inst.const_args:
-                    port.producer.consumers.remove(port)
+                    port.producer.disconnect(port)
                 else:
                     gear_inst.parent.child.remove(get_producer_port(port).gear)
 
@@ -550,7 +550,7 @@ class GearInstPlugin(GearDecoratorPlugin):
     def bind(cls):
         reg['gear/code_map'] = []
         reg['gear/gear_dflt_resolver'] = gear_base_resolver
-        reg.confdef('gear/memoize', False)
+        reg.confdef('gear/memoize', True)
         reg.confdef('gear/infer_signal_names', 'debug')
         reg.confdef('debug/trace', default=[])
 
@@ -1,12 +1,12 @@
-import inspect
+import hashlib
 from pygears.conf import PluginBase, reg
 from .intf import Intf
-from .gear import Gear, create_hier
+from .gear import Gear, enum_stacktrace, struct_copy
+from .hier_node import visitor_dispatch
 from .port import InPort, OutPort, HDLConsumer, HDLProducer
 from .graph import has_async_producer
 from copy import deepcopy, copy
 from pygears.typing import is_type
-from pygears.typing.base import hashabledict
 
 
 def field_names_eq(a, b):
@@ -26,20 +26,59 @@ def field_names_eq(a, b):
     return True
 
 
-def copy_gear_full(g: Gear, name=None):
+def clone_gear(g: Gear, parent, name=None):
+    '''Creates the bare copy of the gear ``g`` (without ports) as a child of the
+    ``parent``. The copy shares all the immutable state of the original, and
+    skips the call stack inspection done in the ``Gear`` constructor for all but
+    the top gear of the copied subgraph.'''
+
+    extra = reg['gear/params/extra']
+
     params = {}
     for n, val in g.params.items():
-        if isinstance(val, (list, dict)):
-            params[n] = val.copy()
+        if n in extra:
+            params[n] = struct_copy(val)
         else:
+            # Mutable parameters are only shared by the calls that received
+            # the same object (i.e. the result list of the collect), so the
+            # copy needs to refer to it and not to its copy
             params[n] = val
 
     params['memoized'] = g
 
+    cp_g = Gear.__new__(Gear)
+    cp_g.child = []
+    cp_g.parent = None
+    cp_g.meta_kwds = g.meta_kwds.copy()
+    cp_g.args = {}
+    cp_g.params = params
+    cp_g.func = g.func
+    cp_g.const_args = {}
+    cp_g.in_ports = []
+    cp_g.out_ports = []
+
     if name:
-        params['name'] = name
+        # Top of the copied subgraph is placed among the new siblings, so its
+        # name needs to be made unique
+        params['name'] = cp_g.basename = name
+        cp_g.trace = list(enum_stacktrace())
+        parent.add_child(cp_g)
+        parent.unique_rename()
+    else:
+        # Children keep the names that were already made unique among the
+        # original siblings
+        cp_g.basename = g.basename
+        cp_g.trace = g.trace
+        parent.add_child(cp_g)
+
+    return cp_g
+
+
+def copy_gear_full(g: Gear, name=None, parent=None):
+    if parent is None:
+        parent = reg['gear/current_module']
 
-    cp_g = Gear(g.func, params)
+    cp_g = clone_gear(g, parent, name)
 
     # Important! Have to keep the copy in local array, or garbage collector
     # collects unconnected port consumers
@@ -74,9 +113,8 @@ def copy_gear_full(g: Gear, name=None):
 
     cp_map = {g: cp_g}
     cp_outside_intf_map = {}
-    with create_hier(cp_g):
-        for c in g.child:
-            cp_map[c], cp_outside_intf_map[c] = copy_gear_full(c)
+    for c in g.child:
+        cp_map[c], cp_outside_intf_map[c] = copy_gear_full(c, parent=cp_g)
 
     def copy_port_connection(p):
         cp_prod_gear = cp_map[p.gear]
@@ -138,48 +176,156 @@ def copy_gear(mem_gear: Gear, args, kwds, name, intf_mapping, kwd_intfs):
 
 
 class ContainerVisitor:
-    def __init__(self, kwd_intfs):
+    '''Serializes the gear call arguments into the list of tokens from which
+    the deterministic digest of the call is computed. Interfaces found within
+    the arguments are collected into kwd_intfs and represented by their types.
+
+    Raises TypeError for the unhashable objects, since they cannot be compared
+    to decide whether the gear call can be memoized. Objects without a custom
+    __repr__ are serialized via their __getstate__ or __dict__, and raise
+    TypeError if they have neither.
+
+    If ``identity`` is set, the lists and dicts are additionally identified by
+    the objects themselves, since the gears can modify them during the
+    simulation. The digest is then not stable between the runs.
+    '''
+
+    def __init__(self, kwd_intfs, tokens, identity=False):
         self.kwd_intfs = kwd_intfs
-        self.cur_addr = []
+        self.tokens = tokens
+        self.identity = identity
+        self.funcs = set()
+        self.objs = set()
 
     def visit(self, obj):
-        for base_class in inspect.getmro(obj.__class__):
-            if hasattr(self, f'visit_{base_class.__name__}'):
-                return getattr(self, f'visit_{base_class.__name__}')(obj)
+        for method in visitor_dispatch(type(self), type(obj), 'visit_'):
+            return method(self, obj)
         else:
             return self.generic_visit(obj)
 
     def visit_tuple(self, obj):
-        hsh = []
-        for i, o in enumerate(obj):
-            hsh.append((self.visit(o), i))
-
-        return hash(tuple(hsh))
+        self.tokens.append(f'{type(obj).__name__}({len(obj)}')
+        for o in obj:
+            self.visit(o)
 
-    def visit_NoneType(self, obj):
-        return hash('None')
+        self.tokens.append(')')
 
-    visit_list = visit_tuple
+    def visit_list(self, obj):
+        self.visit_mutable(obj)
+        self.visit_tuple(obj)
 
     def visit_dict(self, obj):
-        hsh = []
-        for i, o in obj.items():
-            hsh.append((self.visit(o), i))
+        self.visit_mutable(obj)
+        self.visit_items(obj)
 
-        return hash(tuple(hsh))
+    def visit_mutable(self, obj):
+        if self.identity:
+            self.tokens.append(f'id:{id(obj)}')
+
+    def visit_items(self, obj):
+        items = obj.items()
+
+        # Order of the keyword arguments should not matter
+        if all(isinstance(k, str) for k in obj):
+            items = sorted(items, key=lambda kv: kv[0])
+
+        self.tokens.append(f'dict({len(obj)}')
+        for k, v in items:
+            self.visit(k)
+            self.visit(v)
+
+        self.tokens.append(')')
+
+    def visit_int(self, obj):
+        self.tokens.append(f'{type(obj)!r}:{obj!r}')
+
+    visit_NoneType = visit_float = visit_complex = visit_str = visit_bytes = visit_int
 
     def visit_Intf(self, obj):
         self.kwd_intfs.append(obj)
-        return hash(obj.dtype)
+        self.tokens.append(f'Intf:{obj.dtype!r}')
+
+    def visit_TypingMeta(self, obj):
+        self.tokens.append(f'type:{obj!r}')
+
+    def visit_type(self, obj):
+        self.tokens.append(f'class:{obj.__module__}.{obj.__qualname__}')
+
+    def visit_function(self, obj):
+        self.tokens.append(f'func:{func_identity(obj)}')
+
+        # Functions created by the same factory share the code object, so
+        # they are told apart by the values they close over
+        if not obj.__closure__ or obj in self.funcs:
+            return
+
+        self.funcs.add(obj)
+        self.tokens.append('closure(')
+        for cell in obj.__closure__:
+            try:
+                self.visit(cell.cell_contents)
+            except ValueError:
+                self.tokens.append('cell:empty')
+
+        self.tokens.append(')')
+
+    def visit_builtin_function_or_method(self, obj):
+        self.tokens.append(f'func:{getattr(obj, "__module__", None)}.{obj.__qualname__}')
 
     def visit_slice(self, obj):
-        return hash(obj.__reduce__())
+        self.tokens.append('slice(')
+        self.visit(obj.start)
+        self.visit(obj.stop)
+        self.visit(obj.step)
+        self.tokens.append(')')
 
     def generic_visit(self, obj):
-        return hash(obj)
+        hash(obj)
+
+        cls = type(obj)
+        if cls.__repr__ is not object.__repr__:
+            self.tokens.append(f'{cls.__module__}.{cls.__qualname__}:{obj!r}')
+            return
+
+        # Default __repr__ contains the object id, which differs between the
+        # runs, so the object state is serialized instead
+        self.tokens.append(f'obj:{cls.__module__}.{cls.__qualname__}')
+        self.visit_mutable(obj)
+
+        if id(obj) in self.objs:
+            # Reference back to the object that is being serialized
+            self.tokens.append('obj:cycle')
+            return
+
+        getstate = getattr(cls, '__getstate__', None)
+        if getstate is not None and getstate is not getattr(object, '__getstate__', None):
+            state = obj.__getstate__()
+        else:
+            # Raises TypeError if there is no __dict__
+            state = vars(obj)
+
+        self.objs.add(id(obj))
+        self.tokens.append('state(')
+        self.visit(state)
+        self.tokens.append(')')
+        self.objs.discard(id(obj))
 
 
-def make_gear_call_hash(func, args, const_args, kwds, fix_intfs):
+def func_identity(func):
+    # Cannot use hash(func) since it is dependent on the id(func). File name
+    # is needed since the scripts are all loaded as the __main__ module
+    # TODO: This will not distinguish between lambdas or closures defined on
+    # the same line
+    code = func.__code__
+    return f'{func.__module__}.{func.__qualname__}:{code.co_filename}:{code.co_firstlineno}'
+
+
+def make_gear_call_hash(func, args, const_args, kwds, fix_intfs, identity=False):
+    '''Computes the SHA-256 digest of the gear call, which is stable between
+    the Python processes unless ``identity`` is set (see ContainerVisitor).
+    Returns the digest (or None if the call cannot be memoized) and the list of
+    interfaces passed via keyword arguments.'''
+
     user_kwds = kwds.copy()
     for key in reg['gear/params/extra']:
         if key != '__hdl__':
@@ -187,27 +333,35 @@ def make_gear_call_hash(func, args, const_args, kwds, fix_intfs):
 
     try:
         kwd_intfs = []
-        v = ContainerVisitor(kwd_intfs)
-        kwd_hsh = v.visit(user_kwds)
-
-        v = ContainerVisitor(kwd_intfs)
-        fixi_hsh = v.visit(fix_intfs)
-
-        # Cannot use hash(func) since it is dependent on the id(func)
-        # TODO: This func hashing will not work for lambda
-        hsh = kwd_hsh ^ fixi_hsh ^ hash((
-            func.__code__.co_name,
-            func.__code__.co_firstlineno,
-            func.__code__.co_filename,
-            tuple(a.dtype if isinstance(a, Intf) else a for a in args.values()),
-            hashabledict(const_args),
-        ))
+        tokens = []
+        v = ContainerVisitor(kwd_intfs, tokens, identity)
+        v.visit(func)
+
+        # Containers of the arguments are created anew for each call
+        tokens.append('kwds')
+        v.visit_items(user_kwds)
+
+        tokens.append('fix_intfs')
+        if isinstance(fix_intfs, dict):
+            v.visit_items(fix_intfs)
+        else:
+            v.visit_tuple(fix_intfs)
+
+        tokens.append('args')
+        ContainerVisitor([], tokens).visit(
+            tuple(a.dtype if isinstance(a, Intf) else a for a in args.values()))
+
+        tokens.append('const_args')
+        ContainerVisitor([], tokens).visit(const_args)
+
+        hsh = hashlib.sha256('\0'.join(tokens).encode()).hexdigest()
 
         return hsh, tuple(kwd_intfs)
 
     except TypeError:
         return None, None
 
+
 def gear_inst_hash(g):
 
     kwds = g.params.copy()
@@ -217,8 +371,11 @@ def gear_inst_hash(g):
 
     return make_gear_call_hash(g.func, g.args, g.const_args, kwds, ())[0]
 
+
 def get_memoized_gear(func, args, const_args, kwds, fix_intfs, name):
-    key, kwd_intfs = make_gear_call_hash(func, args, const_args, kwds, fix_intfs)
+    # Memoized gear keeps the mutable parameters alive, so their ids cannot be
+    # reused while it is in the memoization map
+    key, kwd_intfs = make_gear_call_hash(func, args, const_args, kwds, fix_intfs, identity=True)
 
     if key is None:
         return None, None, None
@@ -3,6 +3,7 @@ from pygears.core.port import InPort, OutPort, Port, HDLConsumer, HDLProducer
 from pygears.core.hier_node import HierNode
 
 sim_reg = None
+graph_reg = None
 
 
 class PathError(Exception):
@@ -99,46 +100,97 @@ def get_source_producer(obj, sim=False):
     raise PathError(f'{str(err)} -> {obj.name}')
 
 
-def _get_consumer_tree_rec(root_intf, cur_intf, consumers, end_producer):
+def _get_consumer_tree_rec(root_intf, cur_intf, consumers, end_producer, consumer_tree):
+    start = len(consumers)
     for port in cur_intf.consumers:
         if isinstance(port, HDLConsumer):
             continue
 
         cons_intf = port.consumer
         if is_end_consumer(port, sim=True):
-            end_producer[port] = (root_intf, len(consumers))
+            if end_producer is not None:
+                end_producer[port] = (root_intf, len(consumers))
+
             consumers.append(port)
         elif cons_intf is not None:
-            start = len(consumers)
-            _get_consumer_tree_rec(root_intf, cons_intf, consumers, end_producer)
-            if len(consumers) - start > 1:
-                end_producer[port] = (root_intf, slice(start, len(consumers)))
+            port_start = len(consumers)
+            _get_consumer_tree_rec(root_intf, cons_intf, consumers, end_producer, consumer_tree)
+
+            if end_producer is None:
+                continue
+
+            if len(consumers) - port_start > 1:
+                end_producer[port] = (root_intf, slice(port_start, len(consumers)))
             else:
-                end_producer[port] = (root_intf, start)
+                end_producer[port] = (root_intf, port_start)
+
+    consumer_tree[cur_intf] = consumers[start:]
 
 
 def get_consumer_tree(intf):
-    consumer_tree = reg['graph/consumer_tree']
-    end_producer = reg['graph/end_producer']
+    '''Returns the end consumers of the interface.
+
+    Connectivity index is built for the whole tree of the interfaces driven by
+    the source producer of the interface in a single pass: the end consumers
+    of each interface in the tree are stored to the "graph/consumer_tree" and
+    the end producer interface and the queue slot of each port are stored to
+    the "graph/end_producer". The index is dropped by invalidate_graph()
+    whenever the graph is modified.
+    '''
+
+    consumer_tree = graph_reg['consumer_tree']
     if intf in consumer_tree:
         return consumer_tree[intf]
 
-    consumers = []
-    _get_consumer_tree_rec(intf, intf, consumers, end_producer)
-    return consumers
+    try:
+        src = get_source_producer(intf, sim=True)
+    except PathError:
+        src = None
+
+    if src is not None and src not in consumer_tree:
+        _get_consumer_tree_rec(src, src, [], graph_reg['end_producer'], consumer_tree)
+
+    # Interface is not reachable from its source producer, i.e. it is inside
+    # a module simulated by sim_cls, so the queue slots are not relevant
+    if intf not in consumer_tree:
+        _get_consumer_tree_rec(intf, intf, [], None, consumer_tree)
+
+    return consumer_tree[intf]
+
+
+def invalidate_graph():
+    '''Drops the connectivity index, called whenever the graph is modified.
+
+    Interfaces whose simulation channels were already created keep their end
+    consumers, since the channels are allocated one per end consumer.
+    '''
+
+    if graph_reg is None:
+        return
+
+    consumer_tree = graph_reg['consumer_tree']
+    if consumer_tree:
+        for intf in consumer_tree:
+            if not intf._out_queues:
+                intf._end_consumers = None
+
+        consumer_tree.clear()
+
+    graph_reg['end_producer'].clear()
 
 
 class IntfOperPlugin(PluginBase):
     @classmethod
     def bind(cls):
-        global sim_reg
+        global sim_reg, graph_reg
         sim_reg = None
         reg['graph/consumer_tree'] = {}
         reg['graph/end_producer'] = {}
+        graph_reg = reg['graph']._dict
 
 
 def get_end_producer(obj):
-    end_producer = reg['graph/end_producer']
+    end_producer = graph_reg['end_producer']
     if obj not in end_producer:
         intf = get_source_producer(obj, sim=True)
         get_consumer_tree(intf)
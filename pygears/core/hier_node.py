@@ -1,14 +1,48 @@
+import functools
 import string
 from collections import Counter
 
 
+@functools.lru_cache(maxsize=1024)
+def visitor_dispatch(visitor_cls, node_cls, prefix=''):
+    '''Returns the methods of the ``visitor_cls`` that handle the nodes of the
+    ``node_cls``, in the order of the node class MRO. The method handling the
+    node class ``Cls`` is named ``{prefix}Cls``. Computed once for each pair of
+    the visitor and the node class.'''
+
+    methods = []
+    for base_class in node_cls.__mro__:
+        method = getattr(visitor_cls, f'{prefix}{base_class.__name__}', None)
+        if method is not None:
+            methods.append(method)
+
+    return tuple(methods)
+
+
+def push_children(stack, node):
+    if hasattr(node, "child"):
+        # Children are pushed in reverse so that they are visited in order.
+        # Pushing them all at once also copies the list, in case visiting
+        # removes or adds children from the parent
+        stack.extend(reversed(node.child))
+
+
 class HierYielderBase:
+    '''Base for the generators enumerating the hierarchy nodes. For each node,
+    the methods named after the classes in the node MRO are called in turn,
+    until one of them returns True. Reaching the ``HierNode`` method, which is
+    not overridden, schedules the node children to be visited next. The
+    hierarchy is traversed depth-first using an explicit stack.'''
+
     def visit(self, node):
-        import inspect
-        for base_class in inspect.getmro(node.__class__):
-            if hasattr(self, base_class.__name__):
-                if (yield from getattr(self, base_class.__name__)(node)):
-                    return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for method in visitor_dispatch(type(self), type(node)):
+                if method is HierYielderBase.HierNode:
+                    push_children(stack, node)
+                elif (yield from method(self, node)):
+                    break
 
     def HierNode(self, node):
         if hasattr(node, "child"):
@@ -19,12 +53,18 @@ class HierYielderBase:
 
 
 class HierVisitorBase:
+    '''Base for the hierarchy visitors. Dispatches the nodes and traverses the
+    hierarchy in the same way as :class:`HierYielderBase`.'''
+
     def visit(self, node):
-        import inspect
-        for base_class in inspect.getmro(node.__class__):
-            if hasattr(self, base_class.__name__):
-                if getattr(self, base_class.__name__)(node):
-                    return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for method in visitor_dispatch(type(self), type(node)):
+                if method is HierVisitorBase.HierNode:
+                    push_children(stack, node)
+                elif method(self, node):
+                    break
 
     def HierNode(self, node):
         if hasattr(node, "child"):
@@ -35,6 +75,8 @@ class HierVisitorBase:
 
 
 class HierNode:
+    __slots__ = ('child', 'parent')
+
     def __init__(self, parent=None):
         self.child = []
         self.parent = None
@@ -99,6 +141,8 @@ def find_unique_names(names):
 
 
 class NamedHierNode(HierNode):
+    __slots__ = ('basename', )
+
     def __init__(self, basename=None, parent=None):
         super().__init__(parent)
         if basename is not None:
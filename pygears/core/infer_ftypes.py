@@ -1,7 +1,9 @@
 import collections
+import functools
 
 from pygears.conf import reg
 from pygears.typing.base import GenericMeta, param_subs, is_type, T
+from pygears.typing.base import compile_template, template_names
 
 from pygears.typing import TypeMatchError, get_match_conds
 
@@ -62,11 +64,75 @@ def resolve_param(val, match, namespace):
             return True, new_p
 
     elif isinstance(val, bytes):
-        return True, eval(val, namespace, match)
+        return True, eval(compile_template(val), namespace, match)
 
     return False, None
 
 
+def template_deps(val):
+    '''Returns the set of names the parameter template refers to.'''
+
+    if isinstance(val, bytes):
+        return template_names(val)
+    elif isinstance(val, T):
+        return {val.__name__}
+    elif isinstance(val, GenericMeta):
+        deps = set()
+        for templ in val.templates:
+            deps |= template_deps(templ) if isinstance(templ, T) else template_names(templ)
+
+        return deps
+    elif isinstance(val, dict):
+        return set().union(*(template_deps(v) for v in val.values()))
+    elif is_type_iterable(val):
+        return set().union(*(template_deps(v) for v in val))
+
+    return set()
+
+
+def _template_plan(templates, arg_names):
+    names = {name for name, _ in templates}
+    deps = {
+        name: frozenset((template_deps(val) & names) - {name})
+        for name, val in templates if name not in arg_names
+    }
+
+    order = [name for name, _ in templates if name in arg_names]
+    pending = [name for name, _ in templates if name not in arg_names]
+    while pending:
+        placed = set(order)
+        # In case of circular dependencies, fall back to the original order
+        name = next((n for n in pending if deps[n] <= placed), pending[0])
+        pending.remove(name)
+        order.append(name)
+
+    return tuple(order), deps
+
+
+_template_plan_cached = functools.lru_cache(maxsize=4096)(_template_plan)
+
+
+def template_order(postponed, args):
+    '''Orders the postponed parameters for the resolution. Arguments come first
+    in their original order, followed by the rest of the parameters, each
+    placed after the parameters its template depends on. Returns the ordered
+    parameters and their dependencies on the other postponed parameters.
+
+    The plan is computed once for each distinct set of parameter templates,
+    i.e. once per gear definition.'''
+
+    templates = tuple(postponed.items())
+    arg_names = frozenset(name for name in postponed if name in args)
+
+    try:
+        order, deps = _template_plan_cached(templates, arg_names)
+    except TypeError:
+        # Some of the templates are not hashable
+        order, deps = _template_plan(templates, arg_names)
+
+    return {name: postponed[name] for name in order}, deps
+
+
 def infer_ftypes(params, args, namespace={}):
     # Add all registered objects (types and transformations) to the namespace
     namespace = dict(namespace)
@@ -85,6 +151,7 @@ def infer_ftypes(params, args, namespace={}):
 
     postponed = {name: val for name, val in params.items() if is_postponed(name, val)}
     match = {name: val for name, val in params.items() if name not in postponed}
+    postponed, deps = template_order(postponed, args)
 
     substituted = True
     final_check = False
@@ -124,6 +191,11 @@ def infer_ftypes(params, args, namespace={}):
                     err.params = match
                     raise err
             else:
+                if not final_check and not deps[name].isdisjoint(postponed):
+                    # Some of the parameters this template refers to are still
+                    # unresolved, so there is no point in evaluating it yet
+                    continue
+
                 try:
                     substituted, new_p = resolve_param(val, match, namespace)
                     if substituted and (name == 'return'):
@@ -1,11 +1,12 @@
 import asyncio
 
-from .graph import get_consumer_tree, get_producer_queue, get_end_producer
+from .graph import get_consumer_tree, get_producer_queue, get_end_producer, invalidate_graph
 from pygears import GearDone
 from pygears.conf import PluginBase, reg, MultiAlternativeError
 from pygears.core.port import InPort, OutPort, HDLConsumer, HDLProducer
 from pygears.core.partial import Partial
 from pygears.core.sim_event import SimEvent
+from pygears.core.mailbox import Mailbox
 from pygears.typing import TypeMatchError
 from pygears.typing import typeof, Any
 from pygears.typing.base import TypingMeta
@@ -32,6 +33,23 @@ def operator_methods_gen(cls):
     return cls
 
 
+EVENTS = ('put', 'put_out', 'ack', 'ack_in', 'pull_start', 'pull_done', 'finish')
+
+# Event table shared by all the interfaces with no callbacks registered. It is
+# only ever triggered, never subscribed to.
+_no_events = {name: SimEvent() for name in EVENTS}
+
+
+def sim_queue():
+    '''Creates the channel between the interface producer and one of its end
+    consumers, based on the "sim/channel" setting.'''
+
+    if reg['sim/channel'] == 'mailbox':
+        return Mailbox(reg['sim/simulator'])
+
+    return asyncio.Queue(maxsize=1, loop=reg['sim/simulator'])
+
+
 @operator_methods_gen
 class Intf:
     OPERATOR_SUPPORT = [
@@ -41,6 +59,12 @@ class Intf:
         '__matmul__'
     ]
 
+    # Instance dictionary is kept for the rarely set attributes, i.e.
+    # "var_name", and is only allocated when one of them is set
+    __slots__ = ('consumers', '_end_consumers', '_end_producer', 'dtype', 'producer',
+                 '_in_queue', '_out_queues', '_done', '_data', '_put_conv', '_pull_conv',
+                 '_events', '__dict__', '__weakref__')
+
     def __init__(self, dtype):
         self.consumers = []
         self._end_consumers = None
@@ -52,15 +76,22 @@ class Intf:
         self._done = False
         self._data = None
 
-        self.events = {
-            'put': SimEvent(),
-            'put_out': SimEvent(),
-            'ack': SimEvent(),
-            'ack_in': SimEvent(),
-            'pull_start': SimEvent(),
-            'pull_done': SimEvent(),
-            'finish': SimEvent()
-        }
+        # Converters of the data put to and pulled from the interface, resolved
+        # once the simulation channels are created. None means that the data
+        # is passed through as is.
+        self._put_conv = None
+        self._pull_conv = dtype
+        self._events = None
+
+    @property
+    def events(self):
+        '''Simulation events of the interface, allocated on the first access,
+        i.e. when the first callback is registered.'''
+
+        if self._events is None:
+            self._events = {name: SimEvent() for name in EVENTS}
+
+        return self._events
 
     @property
     def sole_intf(self):
@@ -128,6 +159,7 @@ class Intf:
                 f"Interface '{self}' is already connected to a producer '{self.producer.name}'\n")
 
         self.producer = iout.producer
+        invalidate_graph()
 
         return self
 
@@ -145,6 +177,7 @@ class Intf:
     def source(self, port):
         self.producer = port
         port.consumer = self
+        invalidate_graph()
 
     def disconnect(self, port):
         if port in self.consumers:
@@ -154,12 +187,15 @@ class Intf:
             port.consumer = None
             self.producer = None
 
+        invalidate_graph()
+
     def connect(self, port):
         if self.consumers and isinstance(self.consumers[0], HDLConsumer):
             self.consumers.clear()
 
         self.consumers.append(port)
         port.producer = self
+        invalidate_graph()
 
     def __repr__(self):
         return f'Intf({repr(self.dtype)})'
@@ -188,6 +224,12 @@ class Intf:
                 # self._in_queue = self.producer.get_queue()
                 self._in_queue = get_producer_queue(self)
 
+                # Producer has already converted the data to the same type
+                if self._in_queue is not None:
+                    src = self._in_queue.intf
+                    if src.dtype is self.dtype and src._put_conv is not None:
+                        self._pull_conv = None
+
         return self._in_queue
 
     @property
@@ -195,9 +237,8 @@ class Intf:
         if self._out_queues:
             return self._out_queues
 
-        self._out_queues = [
-            asyncio.Queue(maxsize=1, loop=reg['sim/simulator']) for _ in self.end_consumers
-        ]
+        self._out_queues = [sim_queue() for _ in self.end_consumers]
+        self._put_conv = None if typeof(self.dtype, Any) else self.dtype
 
         for i, q in enumerate(self._out_queues):
             q.intf = self
@@ -206,13 +247,13 @@ class Intf:
         return self._out_queues
 
     def put_nb(self, val):
-        put_event = self.events['put']
+        put_event = (self._events or _no_events)['put']
+        out_queues = self.out_queues
 
-        if self.dtype is not type(val):
+        if self.dtype is not type(val) and self._put_conv is not None:
             err = None
             try:
-                if not typeof(self.dtype, Any):
-                    val = self.dtype(val)
+                val = self._put_conv(val)
             except (TypeError, ValueError) as e:
                 err = e
 
@@ -225,11 +266,11 @@ class Intf:
         if put_event:
             put_event(self, val)
 
-        for q, c in zip(self.out_queues, self.end_consumers):
+        for q, c in zip(out_queues, self.end_consumers):
             if c.consumer is None or c.consumer._done:
                 raise GearDone
 
-            put_event = c.consumer.events['put']
+            put_event = (c.consumer._events or _no_events)['put']
             if put_event:
                 put_event(c.consumer, val)
 
@@ -273,7 +314,10 @@ class Intf:
         propagates from the producers to the consumers.
         '''
 
-        self.events['finish'](self)
+        e = (self._events or _no_events)['finish']
+        if e:
+            e(self)
+
         self._done = True
 
         for q, c in zip(self.out_queues, self.end_consumers):
@@ -292,13 +336,17 @@ class Intf:
         if self._data is None:
             self._data = self.in_queue.get_nowait()
 
-        if isinstance(self._data, self.dtype):
-            return self._data
+        return self._pull_convert(self._data)
+
+    def _pull_convert(self, val):
+        conv = self._pull_conv
+        if conv is None or isinstance(val, conv):
+            return val
 
         try:
-            return self.dtype(self._data)
+            return conv(val)
         except TypeError:
-            return self._data
+            return val
 
     def get_nb(self):
         val = self.pull_nb()
@@ -306,7 +354,7 @@ class Intf:
         return val
 
     async def pull(self):
-        ev = self.events
+        ev = self._events or _no_events
         e = ev['pull_start']
         if e:
             e(self)
@@ -324,31 +372,105 @@ class Intf:
             e(self)
 
         self._data = val
-        if isinstance(val, self.dtype):
+        if self._pull_conv is None:
             return val
 
-        try:
-            return self.dtype(val)
-        except TypeError:
-            return val
+        return self._pull_convert(val)
 
     def ack(self):
         inq = self.in_queue
         if not inq._unfinished_tasks:
             return
 
-        e = self.events['ack']
+        e = (self._events or _no_events)['ack']
         if e:
             e(self)
 
         inq.task_done()
         if inq.intf.ready_nb():
-            e = inq.intf.events['ack']
-            e(inq.intf)
+            e = (inq.intf._events or _no_events)['ack']
+            if e:
+                e(inq.intf)
 
         self._data = None
         return
 
+    def specialize(self, put=False, pull=False):
+        '''Replaces put_nb(), pull() and ack() methods of this interface with
+        their hook-free variants, if no callbacks are registered to the events
+        they would trigger.
+
+        Should be called only once all the callbacks are registered, i.e. after
+        the "before_run" simulator event, and only on the source interfaces
+        (put=True) and on the interfaces pulled by the end consumers
+        (pull=True). Reverted by unspecialize().
+        '''
+
+        self.unspecialize()
+
+        ev = self._events or _no_events
+
+        if put and not ev['put']:
+            if not any(c.consumer is not None and (c.consumer._events or _no_events)['put']
+                       for c in self.end_consumers):
+                self.put_nb = self._put_nb_nohook
+
+        if pull:
+            if not (ev['pull_start'] or ev['pull_done']):
+                self.pull = self._pull_nohook
+
+            inq = self.in_queue
+            if inq is not None and not (ev['ack'] or (inq.intf._events or _no_events)['ack']):
+                self.ack = self._ack_nohook
+
+    def unspecialize(self):
+        for name in ('put_nb', 'pull', 'ack'):
+            self.__dict__.pop(name, None)
+
+    def _put_nb_nohook(self, val):
+        out_queues = self.out_queues
+
+        if self.dtype is not type(val) and self._put_conv is not None:
+            err = None
+            try:
+                val = self._put_conv(val)
+            except (TypeError, ValueError) as e:
+                err = e
+
+            if err:
+                raise TypeMatchError(f'{str(err)}\n, when converting output data "{repr(val)}"'
+                                     f' from the "{reg["gear/current_module"].name}"'
+                                     f' module to the type {repr(self.dtype)}')
+
+        for q, c in zip(out_queues, self.end_consumers):
+            if c.consumer is None or c.consumer._done:
+                raise GearDone
+
+            q.put_nowait(val)
+
+    async def _pull_nohook(self):
+        if self._done:
+            raise GearDone
+
+        val = self._data
+        if val is None:
+            gear_reg['current_sim'].phase = 'forward'
+            val = await self.in_queue.get()
+
+        self._data = val
+        if self._pull_conv is None:
+            return val
+
+        return self._pull_convert(val)
+
+    def _ack_nohook(self):
+        inq = self.in_queue
+        if not inq._unfinished_tasks:
+            return
+
+        inq.task_done()
+        self._data = None
+
     async def get(self):
         val = await self.pull()
         self.ack()
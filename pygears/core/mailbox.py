@@ -0,0 +1,113 @@
+import asyncio
+
+
+class MailboxWaiter:
+    """Lightweight awaitable used by the Mailbox in place of the asyncio.Future.
+
+    When awaited, the waiter is yielded directly to the simulator, which
+    registers the waiting simulation gear in its wait list. When the waiter is
+    woken up (or cancelled), simulator's call_soon() is invoked directly to mark
+    the simulation gear as ready (or to schedule it to finish), bypassing the
+    callback machinery of the asyncio.Future.
+    """
+
+    __slots__ = ('_loop', '_pending', '_cancelled')
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._pending = False
+        self._cancelled = False
+
+    def cancelled(self):
+        return self._cancelled
+
+    def done(self):
+        return not self._pending
+
+    def wake(self):
+        if self._pending:
+            self._pending = False
+            self._loop.call_soon(None, self)
+
+    def cancel(self):
+        if self._pending:
+            self._pending = False
+            self._cancelled = True
+            self._loop.call_soon(None, self)
+
+    def __await__(self):
+        self._cancelled = False
+        self._pending = True
+        yield self
+
+    def __hash__(self):
+        return id(self)
+
+
+class Mailbox:
+    """Single slot channel between the producer and one end consumer of the
+    interface, used as an alternative to the asyncio.Queue(maxsize=1).
+
+    Mailbox implements only the subset of the asyncio.Queue interface that is
+    used by the Intf. Since each channel has a single producer and a single
+    consumer, the waiters for the data (get) and for the acknowledge (join) are
+    allocated once and reused.
+    """
+
+    __slots__ = ('intf', 'index', '_val', '_valid', '_unfinished_tasks', '_getter', '_joiner')
+
+    def __init__(self, loop):
+        self._val = None
+        self._valid = False
+        self._unfinished_tasks = 0
+        self._getter = MailboxWaiter(loop)
+        self._joiner = MailboxWaiter(loop)
+
+    @property
+    def _getters(self):
+        return [] if self._getter.done() else [self._getter]
+
+    def qsize(self):
+        return int(self._valid)
+
+    def empty(self):
+        return not self._valid
+
+    def full(self):
+        return self._valid
+
+    def put_nowait(self, val):
+        if self._valid:
+            raise asyncio.QueueFull
+
+        self._val = val
+        self._valid = True
+        self._unfinished_tasks += 1
+        self._getter.wake()
+
+    def get_nowait(self):
+        if not self._valid:
+            raise asyncio.QueueEmpty
+
+        val = self._val
+        self._val = None
+        self._valid = False
+        return val
+
+    async def get(self):
+        while not self._valid:
+            await self._getter
+
+        return self.get_nowait()
+
+    def task_done(self):
+        if self._unfinished_tasks <= 0:
+            raise ValueError('task_done() called too many times')
+
+        self._unfinished_tasks -= 1
+        if self._unfinished_tasks == 0:
+            self._joiner.wake()
+
+    async def join(self):
+        if self._unfinished_tasks:
+            await self._joiner
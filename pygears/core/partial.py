@@ -1,13 +1,19 @@
 import functools
 import inspect
 import sys
-from pygears.conf import MultiAlternativeError
-from pygears.typing.base import hashabledict
+from pygears.conf import MultiAlternativeError, PluginBase, reg
+from pygears.typing import TypeMatchError
+from pygears.typing.type_cache import cache_key
+
+
+@functools.lru_cache(maxsize=None)
+def getfullargspec(func):
+    return inspect.getfullargspec(func)
 
 
 def extract_arg_kwds(kwds, func):
     try:
-        arg_names, _, varkw, _, kwonlyargs, *_ = inspect.getfullargspec(func)
+        arg_names, _, varkw, _, kwonlyargs, *_ = getfullargspec(func)
     except TypeError:
         # Function not inspectable (probably a builtin), do nothing
         return {}, kwds
@@ -28,7 +34,7 @@ def extract_arg_kwds(kwds, func):
 
 def combine_arg_kwds(args, kwds, func):
     try:
-        arg_names, varargs, *_ = inspect.getfullargspec(func)
+        arg_names, varargs, *_ = getfullargspec(func)
     except TypeError:
         # Function not inspectable (probably a builtin), do nothing
         return args
@@ -54,7 +60,7 @@ def combine_arg_kwds(args, kwds, func):
 
 
 def all_args_specified(args, func):
-    arg_names, varargs, _, _, kwds, _, types = inspect.getfullargspec(func)
+    arg_names, varargs, _, _, kwds, _, types = getfullargspec(func)
     if varargs:
         return len(args) > 0
     elif len(args) == len(arg_names):
@@ -63,6 +69,27 @@ def all_args_specified(args, func):
         return False
 
 
+def alternative_key(func, args, kwds):
+    '''Returns the key under which the alternative of ``func`` that matched the
+    call is cached, together with the list of types referenced by the key. The
+    interfaces are represented by their types and the rest of the arguments by
+    their values. Raises TypeError if some of the arguments are not hashable.'''
+
+    from pygears.core.intf import Intf
+
+    def arg_key(a):
+        if isinstance(a, Intf):
+            return (Intf, cache_key(a.dtype, refs))
+
+        return cache_key(a, refs)
+
+    refs = []
+    key = (func, tuple(arg_key(a) for a in args),
+           tuple(sorted((k, arg_key(v)) for k, v in kwds.items())))
+
+    return key, refs
+
+
 class Partial:
     '''The Partial class implements a mechanism similar to that of the
     functools.partial, with one important difference with how calling
@@ -91,7 +118,6 @@ class Partial:
         self.args = args
         self.kwds = kwds
         self.errors = []
-        self._cache = {}
 
     def __str__(self):
         return f'{self.func.__name__}'
@@ -108,15 +134,33 @@ class Partial:
         if self.args:
             args = self.args + args
 
-        try:
-            key = hash(functools._make_key(args, kwds, False)) ^ hash(self.func)
-        except TypeError:
-            key = None
-
-        if key in self._cache:
-            return self._cache[key](*args, **kwds)
+        key = None
+        alt_cache = reg['gear/alternatives_cache']
+        if getattr(self.func, 'alternatives', None):
+            try:
+                key, refs = alternative_key(self.func, args, kwds)
+            except TypeError:
+                pass
 
         no_unpack_alt = kwds.pop('__no_unpack_alt__', False)
+
+        cached_err = None
+        if key in alt_cache:
+            from .gear import TooManyArguments, GearTypeNotSpecified, GearArgsNotSpecified
+
+            # Dispatch directly to the alternative that matched the call with
+            # the same argument types and parameters before
+            func = alt_cache[key][0]
+            try:
+                kwd_intfs, kwd_params = extract_arg_kwds(kwds, func)
+                return func(*combine_arg_kwds(args, kwd_intfs, func), **kwd_params)
+            except (TooManyArguments, GearTypeNotSpecified, GearArgsNotSpecified, TypeError,
+                    TypeMatchError, MultiAlternativeError):
+                # The cached alternative does not match anymore, fall back to
+                # trying the other alternatives to get the full error report
+                del alt_cache[key]
+                cached_err = (func, *sys.exc_info())
+
         alternatives = [self.func] + getattr(self.func, 'alternatives', [])
         if no_unpack_alt:
             alternatives = [f for f in alternatives if not f.__name__.endswith('_unpack__')]
@@ -124,6 +168,10 @@ class Partial:
         errors = [None] * len(alternatives)
 
         for i, func in enumerate(alternatives):
+            if cached_err is not None and func is cached_err[0]:
+                errors[i] = cached_err
+                continue
+
             try:
                 kwd_intfs, kwd_params = extract_arg_kwds(kwds, func)
                 args_comb = combine_arg_kwds(args, kwd_intfs, func)
@@ -132,7 +180,7 @@ class Partial:
                     ret = func(*args_comb, **kwd_params)
 
                     if key is not None:
-                        self._cache[key] = func
+                        alt_cache[key] = (func, refs)
 
                     errors = []
                     return ret
@@ -189,3 +237,13 @@ class Partial:
             return self(*iin)
         else:
             return self(iin)
+
+
+class PartialPlugin(PluginBase):
+    @classmethod
+    def bind(cls):
+        reg['gear/alternatives_cache'] = {}
+
+    @classmethod
+    def reset(cls):
+        reg['gear/alternatives_cache'] = {}
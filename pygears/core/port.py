@@ -8,6 +8,8 @@ from functools import partial
 
 
 class Port:
+    __slots__ = ('gear', 'index', 'producer', '_dtype', '_consumer', 'basename')
+
     def __init__(self, gear, index, basename, dtype=None, producer=None, consumer=None):
         self.gear = gear
         self.index = index
@@ -47,6 +49,7 @@ class Port:
 
 
 class InPort(Port):
+    __slots__ = ()
     direction = "in"
 
     @property
@@ -64,6 +67,7 @@ class InPort(Port):
 
 
 class OutPort(Port):
+    __slots__ = ()
     direction = "out"
 
     def __repr__(self):
@@ -97,6 +97,11 @@ class HDLPlugin(GearPlugin):
         reg.confdef('hdl/include', default=[])
         reg.confdef('hdl/lang', default='sv')
         reg.confdef('hdl/toplang', default=None)
+        reg.confdef('hdl/jobs', default=1)
+        reg.confdef('hdl/incremental', default=False)
+        reg.confdef('hdl/template_cache_dir', default=None)
+        reg['hdlgen/manifest'] = None
+        reg['hdlgen/changed'] = None
         reg['hdl/top'] = None
 
         reg.confdef('debug/hide_interm_vals', default=True)
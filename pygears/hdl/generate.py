@@ -1,13 +1,14 @@
+import multiprocessing
 import os
-from pygears.core.hier_node import HierVisitorBase
+from pygears.core.hier_node import HierVisitorBase, HierYielderBase
 from pygears.util.fileio import save_file
-from pygears import reg
+from pygears import find, reg
 from pygears.hdl import mod_lang
 
 
 class HDLGenGenerateVisitor(HierVisitorBase):
     def __init__(self, outdir):
-        self.hdlgen_map = reg[f'hdlgen/map']
+        self.hdlgen_map = reg['hdlgen/map']
         self.templenv = {lang: reg[f'{lang}gen/templenv'] for lang in ['sv', 'v']}
 
         self.outdir = outdir
@@ -20,7 +21,72 @@ class HDLGenGenerateVisitor(HierVisitorBase):
             hdlgen.generate(self.templenv[lang], self.outdir)
 
 
+class HDLGenTranslationCollector(HierYielderBase):
+    '''Yields the modules whose resolvers perform the translation that depends
+    only on the module itself, i.e. the leaves of the module dependency graph,
+    which have not yet been translated.'''
+
+    def __init__(self):
+        self.hdlgen_map = reg['hdlgen/map']
+
+    def Gear(self, node):
+        hdlgen = self.hdlgen_map.get(node, None)
+        if hdlgen is None or getattr(hdlgen, 'memoized', True):
+            return
+
+        resolver = hdlgen.resolver
+        if hasattr(resolver, 'translate') and not resolver.translated:
+            yield node, resolver
+
+
+def translate_worker(name, outdir):
+    node = find(name)
+    lang = mod_lang(node)
+
+    try:
+        return reg['hdlgen/map'][node].resolver.translate(reg[f'{lang}gen/templenv'], outdir)
+    except Exception:
+        # Translation is repeated by the parent process, which reports the
+        # error in the same way as the serial generation
+        return None
+
+
+def translate(top, outdir, jobs):
+    '''Translates the independent modules in the pool of forked processes,
+    which inherit the elaborated design. Instances sharing the translation are
+    translated once, since the rest of them fetch it from the translation
+    cache. Modules are afterwards generated serially in the hierarchy order, so
+    that the output does not depend on the number of jobs.'''
+
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return
+
+    resolvers = {}
+    for node, resolver in HDLGenTranslationCollector().visit(top):
+        key = node.name if resolver.digest is None else resolver.digest
+        resolvers.setdefault(key, (node, resolver))
+
+    if len(resolvers) < 2:
+        return
+
+    tasks = [(node.name, outdir) for node, _ in resolvers.values()]
+
+    with multiprocessing.get_context('fork').Pool(min(jobs, len(tasks))) as pool:
+        translations = pool.starmap(translate_worker, tasks)
+
+    for (_, resolver), svlines in zip(resolvers.values(), translations):
+        if svlines is not None:
+            resolver.set_translation(svlines)
+
+
 def generate(top, conf):
+    jobs = conf.get('jobs', 1)
+    if jobs is None or jobs < 1:
+        jobs = os.cpu_count() or 1
+
+    if jobs > 1:
+        translate(top, conf['outdir'], jobs)
+
     v = HDLGenGenerateVisitor(conf['outdir'])
     v.visit(top)
     return top
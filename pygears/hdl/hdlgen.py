@@ -1,9 +1,14 @@
 import shutil
 import os
+import runpy
 from pygears import Intf, find, reg
-from pygears.util.fileio import expand, save_file
+from pygears.conf.custom_settings import load_rc
+from pygears.entry import EntryPlugin, cmd_register
+from pygears.util.fileio import expand
+from . import hdl_log
 from .common import list_hdl_files
 from .generate import generate as hdlgen_generate
+from .manifest import HDLManifest, save_hdl_file
 
 
 def hdlgen(top=None,
@@ -12,6 +17,8 @@ def hdlgen(top=None,
            copy_files=False,
            generate=True,
            outdir=None,
+           jobs=None,
+           incremental=None,
            **conf):
 
     if lang is None:
@@ -26,6 +33,14 @@ def hdlgen(top=None,
     conf['outdir'] = expand(outdir)
     outdir = conf['outdir']
 
+    if jobs is None:
+        jobs = reg['hdl/jobs']
+
+    conf['jobs'] = jobs
+
+    if incremental is None:
+        incremental = reg['hdl/incremental']
+
     if isinstance(top, tuple):
         top = top[0]
 
@@ -52,36 +67,93 @@ def hdlgen(top=None,
 
     reg['hdl/toplang'] = toplang
 
+    # HLS modules are shared only among the instances generated in the same
+    # run, so that they are not named after the gears outside of the top.
+    # Recursive calls for the HLS submodules do not generate.
+    if generate:
+        reg['hls/modules'] = {}
+
     reg['svgen/conf'] = conf
     for oper in reg[f'{lang}gen/flow']:
         oper(top, conf)
 
     os.makedirs(outdir, exist_ok=True)
-    if generate:
+    if not generate:
+        return top
+
+    manifest = HDLManifest(outdir) if incremental else None
+
+    # hdlgen is called recursively for the submodules instantiated from the
+    # HLS code, but only to elaborate them, i.e. with generate=False
+    reg['hdlgen/manifest'] = manifest
+    try:
         hdlgen_generate(top, conf)
         hdltop = reg[f'hdlgen/map'][top]
         if toplang == hdltop.lang == 'sv':
-            save_file(f'{hdltop.wrap_module_name}_wrap.sv', outdir, hdltop.get_synth_wrap(reg[f'svgen/templenv']))
+            save_hdl_file(f'{hdltop.wrap_module_name}_wrap.sv', outdir,
+                          hdltop.get_synth_wrap(reg[f'svgen/templenv']))
 
         for (modname, lang), (fn, fn_dis) in reg['hdlgen/disambig'].items():
             with open(fn) as fin:
-                with open(fn_dis, 'w') as fout:
-                    mod = fin.read()
-                    mod = mod.replace(f'module {modname}',
-                                      f'module {modname}_{lang}')
-                    fout.write(mod)
-
-    if copy_files and generate:
-        for fn in list_hdl_files(top.name, outdir=outdir, rtl_only=True):
-            modname, ext = os.path.splitext(os.path.basename(fn))
-            if (modname, ext[1:]) in reg['hdlgen/disambig']:
-                continue
-
-            try:
-                shutil.copy(fn, outdir)
-            except shutil.SameFileError:
-                pass
-            except FileNotFoundError:
-                pass
+                mod = fin.read()
+                mod = mod.replace(f'module {modname}', f'module {modname}_{lang}')
+                save_hdl_file(os.path.basename(fn_dis), os.path.dirname(fn_dis), mod)
+
+        if copy_files:
+            for fn in list_hdl_files(top.name, outdir=outdir, rtl_only=True):
+                modname, ext = os.path.splitext(os.path.basename(fn))
+                if (modname, ext[1:]) in reg['hdlgen/disambig']:
+                    continue
+
+                try:
+                    if manifest is None:
+                        shutil.copy(fn, outdir)
+                    elif os.path.dirname(fn) != outdir:
+                        manifest.copy(fn)
+                except shutil.SameFileError:
+                    pass
+                except FileNotFoundError:
+                    pass
+    finally:
+        reg['hdlgen/manifest'] = None
+
+    if manifest is None:
+        reg['hdlgen/changed'] = None
+    else:
+        manifest.dump()
+        reg['hdlgen/changed'] = [os.path.join(outdir, fn) for fn in manifest.changed]
+        hdl_log().info(f'Changed HDL files: {", ".join(manifest.changed) or "none"}')
 
     return top
+
+
+def hdlgen_entry(design, top='/', outdir=None, include=None, lang='sv', jobs=None, copy=False):
+    design = os.path.abspath(os.path.expanduser(design))
+
+    load_rc('.pygears', os.path.dirname(design))
+    runpy.run_path(design)
+
+    if include:
+        reg['hdl/include'].extend(include)
+
+    return hdlgen(top, lang=lang, outdir=outdir, jobs=jobs, copy_files=copy)
+
+
+class HdlgenPlugin(EntryPlugin):
+    @classmethod
+    def bind(cls):
+        conf = cmd_register(['hdl'], hdlgen_entry, aliases=['hdlgen'], help='generate HDL')
+
+        parser = conf['parser']
+
+        parser.add_argument('design', type=str)
+        parser.add_argument(
+            '-I', '--include', action='append', default=[], help="HDL include directory")
+        parser.add_argument('--top', '-t', type=str, default='/')
+        parser.add_argument('--outdir', '-o', type=str)
+        parser.add_argument(
+            '--lang', '-l', type=str, choices=['v', 'sv'], default='sv')
+        parser.add_argument(
+            '--jobs', '-j', type=int, help="number of processes translating the modules")
+        parser.add_argument(
+            '--copy', '-c', action='store_true', help="copy the library HDL files to the outdir")
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from pygears import reg
+from pygears.util.fileio import save_file
+
+
+class HDLManifest:
+    '''Records the SHA-256 digests of the files generated into the output
+    directory, so that the files whose contents did not change are not
+    rewritten and keep their modification times. Generated files are
+    identified by their path relative to the output directory.
+
+    Besides the files, the manifest records the keys of the generated modules,
+    which resolvers can use to skip the generation of the unchanged modules
+    altogether.'''
+
+    fn = '.pygears_hdlgen.json'
+
+    def __init__(self, outdir):
+        self.outdir = outdir
+        self.changed = []
+        self.dirty = False
+
+        try:
+            with open(os.path.join(outdir, self.fn)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+
+        self.files = manifest.get('files', {})
+        self.modules = manifest.get('modules', {})
+
+    def intact(self, fn, digest=None):
+        '''Checks whether the file was left as it was generated, and that it
+        has the given contents digest if one is supplied.'''
+
+        entry = self.files.get(fn, None)
+        if entry is None or (digest is not None and entry[0] != digest):
+            return False
+
+        try:
+            st = os.stat(os.path.join(self.outdir, fn))
+        except OSError:
+            return False
+
+        return [st.st_mtime_ns, st.st_size] == entry[1:]
+
+    def record(self, fn, digest):
+        st = os.stat(os.path.join(self.outdir, fn))
+        self.files[fn] = [digest, st.st_mtime_ns, st.st_size]
+        self.changed.append(fn)
+        self.dirty = True
+
+    def save(self, fn, content):
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        if not self.intact(fn, digest):
+            save_file(fn, self.outdir, content)
+            self.record(fn, digest)
+
+        return os.path.join(self.outdir, fn)
+
+    def copy(self, src):
+        fn = os.path.basename(src)
+
+        with open(src, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        if not self.intact(fn, digest):
+            shutil.copy(src, self.outdir)
+            self.record(fn, digest)
+
+        return os.path.join(self.outdir, fn)
+
+    def module_intact(self, module_name, key, files):
+        return self.modules.get(module_name, None) == key and all(
+            self.intact(fn) for fn in files)
+
+    def module_record(self, module_name, key):
+        if self.modules.get(module_name, None) != key:
+            self.modules[module_name] = key
+            self.dirty = True
+
+    def dump(self):
+        if not self.dirty:
+            return
+
+        # Manifest is written under a temporary name and renamed into place,
+        # so that an interrupted hdlgen never leaves a partially written one
+        fd, tmp_fn = tempfile.mkstemp(dir=self.outdir, prefix='.tmp_')
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'files': self.files, 'modules': self.modules}, f, indent=1, sort_keys=True)
+
+        os.replace(tmp_fn, os.path.join(self.outdir, self.fn))
+
+
+def save_hdl_file(fn, outdir, content):
+    '''Saves the generated HDL file, skipping the write if the file is
+    unchanged since the last incremental hdlgen into the same directory.'''
+
+    manifest = reg['hdlgen/manifest']
+    if manifest is None or manifest.outdir != outdir:
+        return save_file(fn, outdir, content)
+
+    return manifest.save(fn, content)
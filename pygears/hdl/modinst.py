@@ -7,7 +7,7 @@ from .base_resolver import ResolverTypeError
 from . import hdl_log
 from .sv.sv_keywords import sv_keywords
 from pygears.hdl import mod_lang, hdlmod
-from pygears.util.fileio import save_file
+from .manifest import save_hdl_file
 
 
 def path_name(path):
@@ -175,4 +175,4 @@ class HDLModuleInst:
         # TODO: What about reusing memoized module that didn't need a
         # wrapper. Discern this.
         if self.wrapped:
-            save_file(self.wrap_file_name, outdir, self.get_wrap(self.parent_lang))
+            save_hdl_file(self.wrap_file_name, outdir, self.get_wrap(self.parent_lang))
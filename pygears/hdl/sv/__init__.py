@@ -30,7 +30,7 @@ class SVGenPlugin(PluginBase):
             HDLFileResolver, HDLTemplateResolver, HierarchicalResolver, HLSResolver
         ]
         reg['svgen/dflt_resolver'] = BlackBoxResolver
-        reg['svgen/templenv'] = SVTemplateEnv()
+        reg['svgen/templenv'] = SVTemplateEnv.shared()
 
         reg['svgen/module_namespace'] = {'Gear': SVModuleInst, 'GearHierRoot': SVModuleInst}
 
@@ -49,7 +49,7 @@ class VTemplateEnv(TemplateEnv):
 class VGenPlugin(PluginBase):
     @classmethod
     def bind(cls):
-        reg['vgen/templenv'] = VTemplateEnv()
+        reg['vgen/templenv'] = VTemplateEnv.shared()
 
         reg['vgen/module_namespace'] = {'Gear': SVModuleInst, 'GearHierRoot': SVModuleInst}
 
@@ -7,7 +7,8 @@ from pygears import reg
 from pygears.core.gear import OutSig
 from ...sv.sv_keywords import sv_keywords
 from ...base_resolver import ResolverBase, ResolverTypeError
-from pygears.util.fileio import find_in_dirs, save_file
+from ...manifest import save_hdl_file
+from pygears.util.fileio import find_in_dirs
 from pygears.conf import inject, Inject
 from pygears.hdl import hdlmod
 
@@ -108,4 +109,4 @@ class HierarchicalResolver(ResolverBase):
         return template_env.render_local(__file__, "hier_module.j2", context)
 
     def generate(self, template_env, outdir):
-        save_file(self.file_basename, outdir, self.get_hier_module(template_env))
+        save_hdl_file(self.file_basename, outdir, self.get_hier_module(template_env))
@@ -1,22 +1,276 @@
+import functools
+import hashlib
+import os
+import tempfile
 import typing
-import ast
+from types import ModuleType
+
+import pygears
 from ...base_resolver import ResolverBase, ResolverTypeError
-from ..svcompile import compile_gear
-from pygears.hls.ast.utils import is_func_empty
-from pygears.util.fileio import save_file
-from pygears.conf import inject, Inject
+from ..svcompile import compile_gear, compile_gear_body
+from pygears.core.gear_memoize import ContainerVisitor, func_identity
+from pygears.core.partial import Partial
+from pygears.hls.ast.utils import get_function_source, is_func_empty
+from ...manifest import save_hdl_file
+from pygears.conf import PluginBase, reg, inject, Inject
+
+
+class TranslationDigestVisitor(ContainerVisitor):
+    '''Serializes the gear function, together with the functions and the
+    global values it references, into the tokens from which the translation
+    digest is computed.
+
+    Raises TypeError if the translation cannot be shared between the
+    instances, i.e. when a gear is referenced, since the gears called from the
+    HLS code are instantiated as the submodules of each instance.
+    '''
+
+    def __init__(self, tokens):
+        super().__init__([], tokens)
+        self.visited = set()
+
+    def visit_Partial(self, obj):
+        raise TypeError
+
+    def visit_Registry(self, obj):
+        if obj is reg:
+            raise TypeError
+
+        self.visit(dict(obj.items()))
+
+    def visit_module(self, obj):
+        self.tokens.append(f'module:{obj.__name__}')
+
+    def visit_function(self, func):
+        self.tokens.append(f'func:{func_identity(func)}')
+
+        # Sources of the PyGears functions are covered by the compiler digest
+        if not (func.__module__ or '').startswith('pygears.'):
+            self.visit_source(func)
+
+    def visit_source(self, func):
+        if func in self.visited:
+            return
+
+        self.visited.add(func)
+
+        source = get_function_source(func)
+        if not source:
+            raise TypeError
+
+        self.tokens.append(source)
+
+        self.visit(func.__defaults__)
+        self.visit(func.__kwdefaults__)
+
+        try:
+            self.visit(tuple(c.cell_contents for c in func.__closure__ or ()))
+        except ValueError:
+            # Empty closure cell
+            raise TypeError
+
+        names = code_names(func.__code__)
+        for name in sorted(names):
+            if name in func.__globals__:
+                self.tokens.append(f'global:{name}')
+                val = func.__globals__[name]
+                if isinstance(val, ModuleType):
+                    self.visit_module_attrs(val, names, set())
+
+                self.visit(val)
+
+    def visit_module_attrs(self, module, names, visited):
+        '''Modules are represented only by their names, but the gears reached
+        through their attributes (i.e. pygears.lib.mux) would be instantiated as
+        the submodules too.'''
+
+        visited.add(module)
+        for name in names:
+            attr = getattr(module, name, None)
+            if isinstance(attr, Partial):
+                raise TypeError
+
+            if isinstance(attr, ModuleType) and attr not in visited:
+                self.visit_module_attrs(attr, names, visited)
+
+
+def code_names(code):
+    names = set(code.co_names)
+    for c in code.co_consts:
+        if hasattr(c, 'co_names'):
+            names |= code_names(c)
+
+    return names
+
+
+@functools.lru_cache()
+def compiler_digest():
+    '''Computes SHA-256 digest of the PyGears sources, so that the translations
+    cached on disk are invalidated by any change to the HLS compiler.'''
+
+    hsh = hashlib.sha256(pygears.__version__.encode())
+
+    basedir = os.path.dirname(pygears.__file__)
+    fns = []
+    for dirpath, dirnames, filenames in os.walk(basedir):
+        fns.extend(os.path.join(dirpath, fn) for fn in filenames if fn.endswith('.py'))
+
+    for fn in sorted(fns):
+        hsh.update(os.path.relpath(fn, basedir).encode())
+        hsh.update(b'\0')
+        with open(fn, 'rb') as f:
+            hsh.update(f.read())
+
+        hsh.update(b'\0')
+
+    return hsh.hexdigest()
+
+
+def translation_digest(node, lang):
+    '''Computes SHA-256 digest of everything the HLS translation of the gear
+    depends on: the gear function source, the port names and types, the gear
+    parameters and the HDL configuration. Returns None if the translation
+    cannot be cached.'''
+
+    tokens = [lang, compiler_digest()]
+
+    params = {
+        k: v
+        for k, v in node.params.items() if k not in reg['gear/params/extra'] or k == '__hdl__'
+    }
+
+    try:
+        v = TranslationDigestVisitor(tokens)
+
+        tokens.append(f'func:{func_identity(node.func)}')
+        v.visit_source(node.func)
+
+        tokens.append('ports')
+        for p in node.in_ports + node.out_ports:
+            tokens.append(f'{type(p).__name__}:{p.basename}:{p.dtype!r}')
+
+        tokens.append('params')
+        v.visit(params)
+
+        tokens.append('meta')
+        v.visit(node.meta_kwds.get('hdl', {}))
+        v.visit(tuple(node.meta_kwds['signals']))
+    except TypeError:
+        return None
+
+    return hashlib.sha256('\0'.join(tokens).encode()).hexdigest()
+
+
+@inject
+def translation_cache_fetch(digest, lang, cache_dir=Inject('hls/cache_dir')):
+    '''Returns the translated body of the module with the given digest, or None
+    if it has not been translated neither in this process nor in the previous
+    ones.'''
+
+    translations = reg['hls/translations']
+    if digest in translations:
+        return translations[digest]
+
+    if not cache_dir:
+        return None
+
+    entry = os.path.join(cache_dir, f'{digest}.{lang}')
+    try:
+        with open(entry) as f:
+            body = f.read()
+    except OSError:
+        return None
+
+    # Entry modification time is used for the LRU eviction
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+    translations[digest] = body
+    return body
+
+
+@inject
+def translation_cache_store(digest,
+                            lang,
+                            body,
+                            cache_dir=Inject('hls/cache_dir'),
+                            cache_size=Inject('hls/cache_size')):
+
+    reg['hls/translations'][digest] = body
+
+    if not cache_dir:
+        return
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Entry is written under a temporary name and renamed into place, so
+        # that concurrent processes never see a partially written entry
+        fd, tmp_entry = tempfile.mkstemp(dir=cache_dir, prefix='.tmp_')
+        with os.fdopen(fd, 'w') as f:
+            f.write(body)
+
+        os.replace(tmp_entry, os.path.join(cache_dir, f'{digest}.{lang}'))
+    except OSError:
+        return
+
+    translation_cache_evict(cache_dir, cache_size)
+
+
+def translation_cache_evict(cache_dir, cache_size):
+    if cache_size is None:
+        return
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.startswith('.'):
+            continue
+
+        path = os.path.join(cache_dir, name)
+        try:
+            entries.append((os.stat(path).st_mtime, path))
+        except OSError:
+            pass
+
+    if len(entries) <= cache_size:
+        return
+
+    entries.sort(reverse=True)
+    for _, path in entries[cache_size:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 
 class HLSResolver(ResolverBase):
     @inject
-    def __init__(self, node):
+    def __init__(self,
+                 node,
+                 dedup=Inject('hls/dedup'),
+                 cache_dir=Inject('hls/cache_dir')):
         self.node = node
         self.generated = False
 
         if self.empty_impl:
             raise ResolverTypeError
 
+        self.digest = None
+        if dedup or cache_dir:
+            self.digest = translation_digest(node, self.lang)
+
+        # All the instances with the same translation share the module named
+        # after the first one of them generated in the current hdlgen run. The
+        # digest is None whenever the translation could instantiate the
+        # submodules, which are specific to each instance
+        self._module_name = self.hier_path_name
+        if dedup and self.digest is not None:
+            self._module_name = reg['hls/modules'].setdefault(self.digest, self._module_name)
+
         self._files = [self.file_basename]
+        self.svlines = None
 
     @property
     def empty_impl(self):
@@ -30,7 +284,7 @@ class HLSResolver(ResolverBase):
 
     @property
     def module_name(self) -> str:
-        return self.hier_path_name
+        return self._module_name
 
     @property
     def file_basename(self):
@@ -40,18 +294,93 @@ class HLSResolver(ResolverBase):
     def files(self) -> typing.List[str]:
         return self._files
 
+    @property
+    def intact(self):
+        '''Checks whether the module generated by the previous incremental hdlgen
+        is up to date. The translation digest covers everything the module
+        contents depend on.'''
+
+        manifest = reg['hdlgen/manifest']
+        if manifest is None or self.digest is None:
+            return False
+
+        return manifest.module_intact(self.module_name, self.digest, [self.file_basename])
+
+    @property
+    def translated(self):
+        return self.svlines is not None or self.intact or (
+            self.digest is not None
+            and translation_cache_fetch(self.digest, self.lang) is not None)
+
+    def translate(self, template_env, outdir):
+        '''Translates the module body without generating the module. Returns
+        None if the translation instantiated submodules, since these need to be
+        generated within the process that generates the rest of the design.'''
+
+        svlines, subsvmods = compile_gear_body(self.node, outdir, template_env)
+        if subsvmods:
+            return None
+
+        return svlines
+
+    def set_translation(self, svlines):
+        self.svlines = svlines
+        if self.digest is not None:
+            translation_cache_store(self.digest, self.lang, svlines)
+
     def generate(self, template_env, outdir):
+        if self.intact:
+            return
+
         attrib = self.cfg.get('attrib', None)
         if isinstance(attrib, str):
             attrib = [attrib]
 
-        contents, subsvmods = compile_gear(self.node,
-                                           template_env,
-                                           self.module_name,
-                                           outdir,
-                                           attrib=attrib)
+        svlines = self.svlines
+        if svlines is None and self.digest is not None:
+            svlines = translation_cache_fetch(self.digest, self.lang)
+
+        if svlines is None:
+            svlines, subsvmods = compile_gear_body(self.node, outdir, template_env)
+
+            for s in subsvmods:
+                self._files.extend(s.files)
+
+            # Submodules are the gears instantiated by this particular instance,
+            # so the translation cannot be reused, nor can the module be
+            # skipped by the next incremental hdlgen, since its files would not
+            # be listed
+            if subsvmods:
+                self.digest = None
+
+            if self.digest is not None:
+                translation_cache_store(self.digest, self.lang, svlines)
+
+        contents, _ = compile_gear(self.node,
+                                   template_env,
+                                   self.module_name,
+                                   outdir,
+                                   attrib=attrib,
+                                   svlines=svlines)
+
+        save_hdl_file(self.file_basename, outdir, contents)
+
+        manifest = reg['hdlgen/manifest']
+        if manifest is not None and self.digest is not None:
+            manifest.module_record(self.module_name, self.digest)
+
+
+class HLSResolverPlugin(PluginBase):
+    @classmethod
+    def bind(cls):
+        reg.confdef('hls/dedup', default=True)
+        reg.confdef('hls/cache_dir', default=None)
+        reg.confdef('hls/cache_size', default=4096)
 
-        save_file(self.file_basename, outdir, contents)
+        reg['hls/modules'] = {}
+        reg['hls/translations'] = {}
 
-        for s in subsvmods:
-            self._files.extend(s.files)
+    @classmethod
+    def reset(cls):
+        reg['hls/modules'] = {}
+        reg['hls/translations'] = {}
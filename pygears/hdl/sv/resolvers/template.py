@@ -4,7 +4,8 @@ import os
 import pygears
 from pygears import reg, Intf
 from ...base_resolver import ResolverBase, ResolverTypeError
-from pygears.util.fileio import find_in_dirs, save_file
+from ...manifest import save_hdl_file
+from pygears.util.fileio import find_in_dirs
 from pygears.conf import inject, Inject
 from pygears.hdl.sv.v.accessors import rewrite
 
@@ -114,4 +115,4 @@ class HDLTemplateResolver(ResolverBase):
 
             module = rewrite(module, index)
 
-        save_file(self.file_basename, outdir, module)
+        save_hdl_file(self.file_basename, outdir, module)
@@ -752,7 +752,13 @@ def compile_gear_body(gear, outdir, template_env):
     return '\n'.join(writer.lines), subsvmods
 
 
-def compile_gear(gear, template_env, module_name, outdir, comment=None, attrib=None):
+def compile_gear(gear,
+                 template_env,
+                 module_name,
+                 outdir,
+                 comment=None,
+                 attrib=None,
+                 svlines=None):
     # TODO: Harden the case where local variable shadows a global one
     context = {
         'module_name': module_name,
@@ -765,6 +771,11 @@ def compile_gear(gear, template_env, module_name, outdir, comment=None, attrib=N
         }
     }
 
-    context['svlines'], subsvmods = compile_gear_body(gear, outdir, template_env)
+    if svlines is None:
+        svlines, subsvmods = compile_gear_body(gear, outdir, template_env)
+    else:
+        subsvmods = []
+
+    context['svlines'] = svlines
 
     return template_env.render_string(gear_module_template, context), subsvmods
@@ -1,3 +1,5 @@
+import functools
+import hashlib
 import importlib
 import ctypes
 import re
@@ -5,7 +7,9 @@ import os
 import sys
 import jinja2
 from jinja2.ext import Extension
+from pygears.conf import reg
 from pygears.typing import bitw, code, decode
+from pygears.util.fileio import find_in_dirs
 from textwrap import dedent
 from io import StringIO
 
@@ -66,11 +70,108 @@ def get_port_intfs(node):
 
     return intfs
 
+
+@functools.lru_cache(maxsize=None)
+def bytecode_cache(cache_dir):
+    if not cache_dir:
+        return None
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+
+    return jinja2.FileSystemBytecodeCache(cache_dir)
+
+
+class TemplateLoader(jinja2.BaseLoader):
+    '''Loads the templates by their absolute paths, or relative to the base
+    directory, and the template strings registered with :meth:`add_string` by
+    the digests of their contents.'''
+
+    def __init__(self, basedir):
+        self.basedir = basedir
+        self.strings = {}
+
+    def add_string(self, string):
+        name = f'<string {hashlib.sha1(string.encode()).hexdigest()}>'
+        self.strings[name] = string
+        return name
+
+    def get_source(self, environment, template):
+        if template in self.strings:
+            return self.strings[template], None, lambda: True
+
+        path = template
+        if not os.path.isabs(path):
+            path = find_in_dirs(template, [self.basedir])
+            if path is None:
+                raise jinja2.TemplateNotFound(template)
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                source = f.read()
+
+            mtime = os.path.getmtime(path)
+        except OSError:
+            raise jinja2.TemplateNotFound(template)
+
+        def uptodate():
+            try:
+                return os.path.getmtime(path) == mtime
+            except OSError:
+                return False
+
+        return source, path, uptodate
+
+
+class TemplateEnvironment(jinja2.Environment):
+    '''Jinja environment with a single loader for all the template directories,
+    so that the compiled templates are cached by the environment, and with
+    the bytecode cache configured via ``hdl/template_cache_dir`` at the time
+    the environment is created. Templates imported from other templates are
+    searched for in the base directory first, and then in the directory of
+    the importing template.'''
+
+    def __init__(self, basedir, **kwds):
+        kwds.setdefault('bytecode_cache', bytecode_cache(reg['hdl/template_cache_dir']))
+        super().__init__(loader=TemplateLoader(basedir), **kwds)
+        self.basedir = basedir
+        self.paths = {}
+
+    def join_path(self, template, parent):
+        key = (template, parent)
+        if key not in self.paths:
+            dirs = [self.basedir]
+            if os.path.isabs(parent):
+                dirs.append(os.path.dirname(parent))
+
+            self.paths[key] = find_in_dirs(template, dirs) or template
+
+        return self.paths[key]
+
+
+def harness_env(basedir):
+    '''Returns the environment shared by all the harnesses generated from the
+    templates in the basedir, e.g. by the cosimulation builds.'''
+
+    return _harness_env(basedir, reg['hdl/template_cache_dir'])
+
+
+@functools.lru_cache(maxsize=None)
+def _harness_env(basedir, cache_dir):
+    jenv = TemplateEnvironment(basedir, trim_blocks=True, lstrip_blocks=True)
+    jenv.globals.update(int=int)
+    return jenv
+
+
 class TemplateEnv:
     def __init__(self, basedir):
         self.basedir = basedir
         self.templates = {}
-        self.jenv = jinja2.Environment(
+        self.strings = {}
+        self.jenv = TemplateEnvironment(
+            basedir,
             extensions=['jinja2.ext.do', PythonExtension],
             trim_blocks=True,
             lstrip_blocks=True,
@@ -101,17 +202,42 @@ class TemplateEnv:
     def port_intfs(self, node):
         return get_port_intfs(node)
 
+    @classmethod
+    def shared(cls):
+        '''Returns the instance of the environment which is shared between the
+        registry resets, so that the templates are compiled only once.'''
+
+        return cls._shared(reg['hdl/template_cache_dir'])
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _shared(cls, cache_dir):
+        return cls()
+
     def load(self, tmplt_dir, tmplt_fn):
-        key = os.path.join(self.basedir, tmplt_dir, tmplt_fn)
-        if key not in self.templates:
-            self.jenv.loader = jinja2.FileSystemLoader([self.basedir, tmplt_dir])
-            template = self.jenv.get_template(tmplt_fn)
-            self.templates[key] = template
+        key = (tmplt_dir, tmplt_fn)
+        template = self.templates.get(key, None)
+
+        # Environment outlives the registry resets, so the templates edited in
+        # the meantime need to be reloaded
+        if template is None or not template.is_up_to_date:
+            path = find_in_dirs(tmplt_fn, [self.basedir, tmplt_dir])
+            if path is None:
+                raise jinja2.TemplateNotFound(tmplt_fn)
+
+            template = self.templates[key] = self.jenv.get_template(os.path.abspath(path))
 
-        return self.templates[key]
+        return template
 
     def render_string(self, string, context):
-        return self.jenv.from_string(string).render(context)
+        # Template strings are mostly module level constants, so the
+        # dictionary lookup reuses their cached hashes
+        template = self.strings.get(string, None)
+        if template is None:
+            template = self.jenv.get_template(self.jenv.loader.add_string(string))
+            self.strings[string] = template
+
+        return template.render(context)
 
     def render_local(self, fn, tmplt_fn, context):
         return self.render(os.path.dirname(fn), tmplt_fn, context)
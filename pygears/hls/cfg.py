@@ -20,11 +20,14 @@ CFG.
 """
 from __future__ import absolute_import
 import functools
+import heapq
 import operator
-import inspect
+from collections.abc import Mapping
 
 import ast as gast
 
+from pygears.core.hier_node import visitor_dispatch
+
 from . import ir
 from . import HDLVisitor
 from .debug import hls_debug_log_enabled
@@ -266,9 +269,62 @@ class CFG(HDLVisitor):
         raise ValueError('unknown control flow')
 
 
+def reverse_postorder(entry):
+    """Returns the CFG nodes reachable from the entry in the reverse postorder.
+    Nodes without the value are listed, but their successors are not
+    followed."""
+
+    order = []
+    visited = {entry}
+    stack = [(entry, iter(entry.next if entry.value else ()))]
+    while stack:
+        node, succs = stack[-1]
+        for succ in succs:
+            if succ not in visited:
+                visited.add(succ)
+                stack.append((succ, iter(succ.next if succ.value else ())))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+
+    order.reverse()
+    return order
+
+
+class ForwardSets(Mapping):
+    """Results of the forward analysis for a single CFG node, i.e. the 'in',
+    'out', 'gen' and 'kill' sets. The sets are kept as bit-vectors and
+    converted to frozensets on the first access."""
+
+    __slots__ = ('analysis', 'bits', 'sets')
+
+    def __init__(self, analysis, **bits):
+        self.analysis = analysis
+        self.bits = bits
+        self.sets = {}
+
+    def __getitem__(self, key):
+        res = self.sets.get(key)
+        if res is None:
+            res = self.sets[key] = self.analysis.decode(self.bits[key])
+
+        return res
+
+    def __iter__(self):
+        return iter(self.bits)
+
+    def __len__(self):
+        return len(self.bits)
+
+
 class Forward(object):
     """Forward analysis on CFG.
 
+    The analysis is solved iteratively over the worklist ordered by the reverse
+    postorder of the CFG nodes. Each value is assigned a bit, so that the sets
+    of values are represented by integer bit-vectors.
+
   Args:
     label: A name for this analysis e.g. 'active' for activity analysis. The
         AST nodes in the CFG will be given annotations 'name_in', 'name_out',
@@ -277,14 +333,15 @@ class Forward(object):
         statement respectively.
     gen: A function which takes the CFG node as well as a set of incoming
         values. It must return a set of newly generated values by the statement
-        as well as a set of deleted (killed) values.
+        as well as a set of deleted (killed) values. If omitted, the
+        subclass needs to implement ``definitions()`` instead.
     op: Either the AND or OR operator. If the AND operator is used it turns
         into forward must analysis (i.e. a value will only be carried forward
         if it appears on all incoming paths). The OR operator means that
         forward may analysis is done (i.e. the union of incoming values will be
         taken).
   """
-    def __init__(self, label, gen, op=operator.or_):
+    def __init__(self, label, gen=None, op=operator.or_):
         self.gen = gen
         self.op = op
         self.out_label = label + '_out'
@@ -292,37 +349,119 @@ class Forward(object):
         self.gen_label = label + '_gen'
         self.kill_label = label + '_kill'
         self.reaching = {}
+        self.values = []
+        self.index = {}
+
+    def definitions(self, node):
+        """Returns the values generated by the node and the keys of the values
+        killed by the node. Used when the analysis has no ``gen`` function, in
+        which case the transfer cannot depend on the incoming values."""
+        raise NotImplementedError
+
+    def key(self, value):
+        """Returns the key by which the value is killed"""
+        return value
+
+    def encode(self, values):
+        index = self.index
+        bits = 0
+        for v in values:
+            i = index.get(v)
+            if i is None:
+                i = index[v] = len(self.values)
+                self.values.append(v)
+
+            bits |= 1 << i
+
+        return bits
+
+    def decode(self, bits):
+        values = self.values
+        res = []
+        while bits:
+            low = bits & -bits
+            res.append(values[low.bit_length() - 1])
+            bits ^= low
+
+        return frozenset(res)
+
+    def static_transfer(self, nodes):
+        gen = {}
+        kill_keys = {}
+        key_bits = {}
+
+        for node in nodes:
+            values, kill_keys[node] = self.definitions(node)
+            gen[node] = 0
+            for v in values:
+                bit = self.encode((v, ))
+                gen[node] |= bit
+                key = self.key(v)
+                key_bits[key] = key_bits.get(key, 0) | bit
+
+        kill = {}
+        for node in nodes:
+            kill[node] = 0
+            for key in kill_keys[node]:
+                kill[node] |= key_bits.get(key, 0)
+
+        return gen, kill
 
     def visit(self, node):
-        if node not in self.reaching:
-            self.reaching[node] = {}
+        order = reverse_postorder(node)
+        nodes = [n for n in order if n.value]
+        priority = {n: i for i, n in enumerate(order)}
 
-        reaching = self.reaching[node]
+        if self.gen is None:
+            gen, kill = self.static_transfer(nodes)
+        else:
+            gen, kill = {}, {}
 
-        if node.value:
-            if 'out' in reaching:
-                before = hash(reaching['out'])
-            else:
-                before = None
+        op = self.op
+        incoming = {}
+        out = {}
 
-            preds = [
-                self.reaching[pred]['out'] for pred in node.prev
-                if 'out' in self.reaching.get(pred, {})
-            ]
-            if preds:
-                incoming = functools.reduce(self.op, preds[1:], preds[0])
-            else:
-                incoming = frozenset()
+        worklist = [priority[n] for n in nodes]
+        pending = set(worklist)
 
-            reaching['in'] = incoming
-            gen, kill = self.gen(node, incoming)
-            reaching['gen'] = gen
-            reaching['kill'] = kill
-            reaching['out'] = (incoming - kill) | gen
+        while worklist:
+            i = heapq.heappop(worklist)
+            pending.remove(i)
+            n = order[i]
 
-            if hash(reaching['out']) != before:
-                for succ in node.next:
-                    self.visit(succ)
+            preds = [out[pred] for pred in n.prev if pred in out]
+            if preds:
+                n_in = functools.reduce(op, preds[1:], preds[0])
+            else:
+                n_in = 0
+
+            incoming[n] = n_in
+
+            if self.gen is not None:
+                n_gen, n_kill = self.gen(n, self.decode(n_in))
+                gen[n] = self.encode(n_gen)
+                kill[n] = self.encode(n_kill)
+
+            n_out = (n_in & ~kill[n]) | gen[n]
+            if out.get(n) == n_out:
+                continue
+
+            out[n] = n_out
+            for succ in n.next:
+                j = priority.get(succ)
+                if j is not None and succ.value and j not in pending:
+                    pending.add(j)
+                    heapq.heappush(worklist, j)
+
+        for n in order:
+            if n.value:
+                self.reaching[n] = ForwardSets(self,
+                                               gen=gen[n],
+                                               kill=incoming[n] & kill[n],
+                                               out=out[n],
+                                               **{'in': incoming[n]})
+            else:
+                self.reaching.setdefault(n, {})
 
 
 def forward(node, analysis):
@@ -387,20 +526,19 @@ class ReachingDefinitions(Forward):
 
   """
     def __init__(self, update=get_updated):
-        def definition(node, incoming):
-            if isinstance(node.value, ir.Await) and isinstance(node.value.expr, ir.Component):
-                intf_name = node.value.expr.val.name
-                # gen = frozenset([(f'{intf_name}.ready', node.value)])
-                gen = frozenset()
-                kill = frozenset(def_ for def_ in incoming if def_[0] == f'{intf_name}.data')
-            else:
-                definitions = update(node.value)
-                gen = frozenset((id_, node) for id_ in definitions)
-                kill = frozenset(def_ for def_ in incoming if def_[0] in definitions)
+        self.update = update
+        super(ReachingDefinitions, self).__init__('definitions')
+
+    def definitions(self, node):
+        if isinstance(node.value, ir.Await) and isinstance(node.value.expr, ir.Component):
+            intf_name = node.value.expr.val.name
+            return (), (f'{intf_name}.data', )
 
-            return gen, kill
+        names = self.update(node.value)
+        return [(name, node) for name in names], names
 
-        super(ReachingDefinitions, self).__init__('definitions', definition)
+    def key(self, value):
+        return value[0]
 
 
 class Defined(Forward):
@@ -410,11 +548,10 @@ class Defined(Forward):
   be defined at that point.
   """
     def __init__(self):
-        def defined(node, incoming):
-            gen = get_updated(node.value)
-            return gen, frozenset()
+        super(Defined, self).__init__('defined', op=operator.and_)
 
-        super(Defined, self).__init__('defined', defined, operator.and_)
+    def definitions(self, node):
+        return get_updated(node.value), ()
 
 
 class CfgDfs:
@@ -422,23 +559,18 @@ class CfgDfs:
         self.scopes = []
 
     def visit(self, node):
-        for base_class in inspect.getmro(node.value.__class__):
-            if hasattr(self, base_class.__name__):
-                return getattr(self, base_class.__name__)(node)
+        for method in visitor_dispatch(type(self), type(node.value)):
+            return method(self, node)
         else:
             return self.generic_visit(node)
 
     def enter(self, node):
-        for base_class in inspect.getmro(node.value.__class__):
-            method_name = f'enter_{base_class.__name__}'
-            if hasattr(self, method_name):
-                return getattr(self, method_name)(node)
+        for method in visitor_dispatch(type(self), type(node.value), 'enter_'):
+            return method(self, node)
 
     def exit(self, node):
-        for base_class in inspect.getmro(node.value.__class__):
-            method_name = f'exit_{base_class.__name__}'
-            if hasattr(self, method_name):
-                return getattr(self, method_name)(node)
+        for method in visitor_dispatch(type(self), type(node.value), 'exit_'):
+            return method(self, node)
 
     @property
     def parent(self):
@@ -146,6 +146,11 @@ def call_uint_matmul(obj, arg):
     return ir.CastExpr(ir.ConcatExpr(operands=[arg, obj]), cast_to=(obj.dtype @ arg.dtype))
 
 
+def call_int_new(cls, arg):
+    # Trusted construction of the operator results, i.e. Integer.__add__()
+    return ir.CastExpr(arg, cast_to=cls.val)
+
+
 def call_sub(obj, arg):
     return ir.CastExpr(arg, cast_to=obj.sub())
 
@@ -373,6 +378,7 @@ class AddIntfOperPlugin(PluginBase):
             clk: call_clk,
             float: call_float,
             int: call_int,
+            int.__new__: call_int_new,
             len: call_len,
             print: call_print,
             type: call_type,
@@ -399,19 +399,14 @@ class ReachingNodes(Forward):
 
   """
     def __init__(self):
-        def definition(node, incoming):
-            kill = frozenset()
-            gen = frozenset((node, node))
+        super(ReachingNodes, self).__init__('definitions')
 
-            # if isinstance(node.value, ir.BaseBlockSink) and isinstance(
-            #         node.source.value, ir.LoopBody):
-            #     gen = frozenset((node.source.value.state_id, node.source.value))
-            # else:
-            #     gen = frozenset()
+    def definitions(self, node):
+        # if isinstance(node.value, ir.BaseBlockSink) and isinstance(
+        #         node.source.value, ir.LoopBody):
+        #     return (node.source.value.state_id, node.source.value), ()
 
-            return gen, kill
-
-        super(ReachingNodes, self).__init__('definitions', definition)
+        return (node, ), ()
 
 
 class Piggyback(CfgDfs):
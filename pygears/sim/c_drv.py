@@ -1,4 +1,5 @@
 import ctypes
+import sys
 from math import ceil
 from pygears.sim.modules.cosim_base import CosimNoData
 from pygears.sim import log
@@ -8,6 +9,67 @@ class IdleIteration(Exception):
     pass
 
 
+def batch_words(width):
+    '''Number of 32-bit words a single transaction takes in the batch buffers'''
+    return (width + 31) // 32
+
+
+def pack_batch(codes, width):
+    '''Packs the list of coded values into the ctypes buffer of 32-bit words
+    used for the batched transfers.'''
+
+    size = batch_words(width) * 4
+    buf = (ctypes.c_uint * (batch_words(width) * len(codes)))()
+    if codes:
+        ctypes.memmove(buf, b''.join(c.to_bytes(size, 'little') for c in codes), len(codes) * size)
+
+    return buf
+
+
+def unpack_batch(buf, num, width):
+    '''Unpacks the first num coded values from the ctypes buffer of 32-bit
+    words used for the batched transfers.'''
+
+    size = batch_words(width) * 4
+    mem = memoryview(buf).cast('B')
+    return [int.from_bytes(mem[i:i + size], 'little') for i in range(0, num * size, size)]
+
+
+# Buffers of 32-bit words are copied to and from Python integers in bulk, by
+# viewing them as byte arrays, which is valid only on little-endian hosts
+_bulk_copy = sys.byteorder == 'little'
+
+
+def c_buf_to_int(view, buf, word_width):
+    '''Converts the ctypes buffer to the integer, using the byte view of the
+    buffer when possible.'''
+
+    if _bulk_copy:
+        return int.from_bytes(view, 'little')
+
+    dout = 0
+    for d in reversed(list(buf)):
+        dout <<= word_width
+        dout |= d
+
+    return dout
+
+
+def int_to_c_buf(data, view, buf, word_width):
+    '''Copies the integer to the ctypes buffer, using the byte view of the
+    buffer when possible.'''
+
+    if _bulk_copy:
+        view[:] = data.to_bytes(len(view), 'little')
+    else:
+        mask = (1 << word_width) - 1
+        for i in range(len(buf)):
+            buf[i] = data & mask
+            data >>= word_width
+
+    return buf
+
+
 class CGet:
     def __init__(self, verilib, name, dtype):
         self.c_get_api = getattr(verilib, f'get_{name}', None)
@@ -22,13 +84,15 @@ class CGet:
         else:
             self.c_dtype = ctypes.c_uint
 
-    def from_c_data(self, data):
-        dout = 0
-        for d in reversed(list(data)):
-            dout <<= 32
-            dout |= d
+        if self.width <= 64:
+            self.c_dtype = self.c_dtype * 1
 
-        return dout
+        self.dout = self.c_dtype()
+        self.dout_view = memoryview(self.dout).cast('B')
+
+    def from_c_data(self, data):
+        view = self.dout_view if data is self.dout else memoryview(data).cast('B')
+        return c_buf_to_int(view, data, ctypes.sizeof(data._type_) * 8)
 
     def get(self):
         self.c_get_api(self.dout)
@@ -63,18 +127,17 @@ class CInputDrv(CDrv):
         super().__init__(verilib, port, name)
         self.c_set_api.argtypes = (self.c_dtype, ctypes.c_uint)
 
+        # Wide data is passed via the buffer that is reused for each transfer
+        if self.width > 64:
+            self.din = self.c_dtype()
+            self.din_view = memoryview(self.din).cast('B')
+
     def close(self):
         pass
 
     def to_c_data(self, data):
         if self.width > 64:
-
-            def dgen(data):
-                for i in range(ceil(self.width / 32)):
-                    yield data & 0xffffffff
-                    data >>= 32
-
-            return self.c_dtype(*list(dgen(data)))
+            return int_to_c_buf(data, self.din_view, self.din, self.c_width)
         else:
             return self.c_dtype(data)
 
@@ -106,14 +169,11 @@ class COutputDrv(CDrv):
 
         self.active = False
         self.dout = self.c_dtype()
+        self.dout_view = memoryview(self.dout).cast('B')
 
     def from_c_data(self, data):
-        dout = 0
-        for d in reversed(list(data)):
-            dout <<= self.c_width
-            dout |= d
-
-        return dout
+        view = self.dout_view if data is self.dout else memoryview(data).cast('B')
+        return c_buf_to_int(view, data, self.c_width)
 
     def reset(self):
         self.c_set_api(0)
@@ -33,12 +33,16 @@ typedef int SOCKET;
 //         https://github.com/jimloco/Csocket
 
 #define BUFFER_SIZE (1024 / 32 * sizeof(uint32_t))
+#define FRAME_HEADER_SIZE sizeof(uint32_t)
 struct handle {
   SOCKET sock;
-  char wbuf[BUFFER_SIZE];
-  char rbuf[BUFFER_SIZE + 1];
-  size_t roff; // Read pointer
-  size_t eoff; // Read end
+  char *wbuf;   // Response frame being assembled, starts with the header
+  size_t wsize; // Write buffer size
+  size_t woff;  // Write pointer
+  char *rbuf;   // Received data not yet consumed
+  size_t rsize; // Read buffer size
+  size_t roff;  // Read pointer
+  size_t eoff;  // Read end
   int timeout;
 };
 
@@ -63,14 +67,42 @@ struct handle *init_struct(SOCKET sock, int timeout) {
   struct handle *h = malloc(sizeof(struct handle));
   if (h) {
     h->sock = sock;
+    h->wbuf = malloc(BUFFER_SIZE);
+    h->wsize = BUFFER_SIZE;
+    h->woff = FRAME_HEADER_SIZE;
+    h->rbuf = malloc(BUFFER_SIZE);
+    h->rsize = BUFFER_SIZE;
     h->roff = 0;
     h->eoff = 0;
-    h->rbuf[BUFFER_SIZE] = '\0'; // Overflow protection for long strings
     h->timeout = timeout;
+
+    if (!h->wbuf || !h->rbuf) {
+      free(h->wbuf);
+      free(h->rbuf);
+      free(h);
+      return NULL;
+    }
   }
   return h;
 }
 
+int grow_buf(char **buf, size_t *size, size_t need) {
+  if (need <= *size)
+    return 0;
+
+  size_t new_size = *size;
+  while (new_size < need)
+    new_size *= 2;
+
+  char *new_buf = realloc(*buf, new_size);
+  if (!new_buf)
+    return 1;
+
+  *buf = new_buf;
+  *size = new_size;
+  return 0;
+}
+
 void *tcp_sock_open(const char *name, int timeout) {
   // Extract hostname / port
   char *string = strdup(name);
@@ -203,9 +235,28 @@ void sock_close(void *handle) {
 
   struct handle *h = handle;
   closesocket(h->sock);
+  free(h->wbuf);
+  free(h->rbuf);
   free(h);
 }
 
+// Sends the whole buffer, looping over the partial sends
+int send_all(struct handle *h, const void *buf, size_t len) {
+  const char *ptr = buf;
+  while (len > 0) {
+    int ret = send(h->sock, ptr, len, 0);
+    if (ret < 0) {
+      if (errno == EINTR)
+        continue;
+      return 1;
+    }
+    ptr += ret;
+    len -= ret;
+  }
+
+  return 0;
+}
+
 int sock_done(void *handle) {
   // Validate input
   if (!handle)
@@ -245,6 +296,59 @@ int sock_done(void *handle) {
 
 extern void pause_sim();
 
+// Receives until at least "need" bytes are available in the read buffer.
+// Returns 0 on success, 1 on error and 2 if the socket is non-blocking and
+// the data is not yet available.
+int sock_fill(struct handle *h, size_t need) {
+  int ret;
+
+  if (h->eoff - h->roff >= need)
+    return 0;
+
+  if (h->roff) {
+    memmove(h->rbuf, h->rbuf + h->roff, h->eoff - h->roff);
+    h->eoff -= h->roff;
+    h->roff = 0;
+  }
+
+  if (grow_buf(&h->rbuf, &h->rsize, need))
+    return 1;
+
+  while (h->eoff < need) {
+    ret = recv(h->sock, h->rbuf + h->eoff, h->rsize - h->eoff, 0);
+
+    /* printf("Ret value %d for %d bytes, errno value %d\n", ret, need, errno); */
+    if (ret > 0) {
+      h->eoff += ret;
+    } else if (ret == 0) {
+      // Connection closed
+      return 1;
+    } else if ((errno == EAGAIN) || (errno == EWOULDBLOCK)) {
+      if (h->timeout > 0) {
+        /* printf("%p timeout\n", h); */
+        pause_sim();
+      } else if (h->timeout == 0) {
+        return 2;
+      }
+    } else if (errno != EINTR) {
+      /* printf("Ret value %d, errno value %d\n", ret, errno); */
+      return 1;
+    }
+  }
+
+  return 0;
+}
+
+// Receives the whole command frame of "words" 32-bit words at once, so that
+// the commands it contains can be read without further system calls
+int sock_get_frame(void *handle, int words) {
+  if (!handle) {
+    return 1;
+  }
+
+  return sock_fill(handle, words * sizeof(uint32_t));
+}
+
 int sock_get_bv(void *handle, int width, svBitVecVal *signal) {
   // Validate input
   if (!handle) {
@@ -253,32 +357,15 @@ int sock_get_bv(void *handle, int width, svBitVecVal *signal) {
 
   struct handle *h = handle;
   int ret;
-  int words = SV_PACKED_DATA_NELEMS(width);
+  size_t len = SV_PACKED_DATA_NELEMS(width) * sizeof(svBitVecVal);
 
-  do {
-    /* ret = recv(h->sock, h->rbuf, BUFFER_SIZE, 0); */
-    /* ret = recv(h->sock, h->rbuf, words * 4, 0); */
-    ret = recv(h->sock, signal, words * 4, 0);
-
-    /* printf("Got: "); */
-    /* print_time(); */
-
-    /* printf("Ret value %d for width %d, errno value %d\n", ret, words*4, errno); */
-    if (ret <= 0) {
-      if ((errno == EAGAIN) || (errno == EWOULDBLOCK)) {
-        if (h->timeout > 0) {
-          /* printf("%p timeout\n", handle); */
-          /* printf("Ret value %d, errno value %d\n", ret, errno); */
-          pause_sim();
-        } else if (h->timeout == 0) {
-          return 2;
-        }
-      } else if (errno != EINTR) {
-        /* printf("Ret value %d, errno value %d\n", ret, errno); */
-        return 1;
-      }
-    }
-  } while (ret <= 0);
+  ret = sock_fill(h, len);
+  if (ret) {
+    return ret;
+  }
+
+  memcpy(signal, h->rbuf + h->roff, len);
+  h->roff += len;
 
   /* uint32_t *rval = (uint32_t *)h->rbuf; */
 
@@ -323,11 +410,45 @@ int sock_put(void *handle, const svOpenArrayHandle signal) {
   /* } */
   /* printf("\n"); */
 
-  send(h->sock, ptr, SV_PACKED_DATA_NELEMS(width) * sizeof(svBitVecVal), 0);
+  return send_all(h, ptr, SV_PACKED_DATA_NELEMS(width) * sizeof(svBitVecVal));
+}
+
+// Appends the signal to the response frame, which is sent by sock_frame_send()
+int sock_frame_put(void *handle, const svOpenArrayHandle signal) {
+  if (!handle) {
+    return 1;
+  }
+
+  struct handle *h = handle;
+  int width = svSize(signal, 0);
+  size_t len = SV_PACKED_DATA_NELEMS(width) * sizeof(svBitVecVal);
+
+  if (grow_buf(&h->wbuf, &h->wsize, h->woff + len))
+    return 1;
+
+  memcpy(h->wbuf + h->woff, svGetArrayPtr(signal), len);
+  h->woff += len;
 
   return 0;
 }
 
+// Sends the response frame assembled by sock_frame_put() calls, prefixed with
+// its length in 32-bit words
+int sock_frame_send(void *handle) {
+  if (!handle) {
+    return 1;
+  }
+
+  struct handle *h = handle;
+  uint32_t words = (h->woff - FRAME_HEADER_SIZE) / sizeof(uint32_t);
+  memcpy(h->wbuf, &words, FRAME_HEADER_SIZE);
+
+  int ret = send_all(h, h->wbuf, h->woff);
+  h->woff = FRAME_HEADER_SIZE;
+
+  return ret;
+}
+
 /* int main() { */
 /* 	struct handle* handle; */
 
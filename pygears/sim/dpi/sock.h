@@ -8,5 +8,8 @@ int sock_get(void* handle, const svOpenArrayHandle signal);
 void* sock_open(const char* uri, const char* channel);
 void sock_close(void* handle);
 int sock_put(void* handle, const svOpenArrayHandle signal);
+int sock_get_frame(void* handle, int words);
+int sock_frame_put(void* handle, const svOpenArrayHandle signal);
+int sock_frame_send(void* handle);
 
 #endif
@@ -35,6 +35,15 @@ import "DPI-C" function int sock_done(input chandle handle);
 // Returns 1 on success, 0 on error
 import "DPI-C" function int sock_put(input chandle handle, input bit [] signal);
 
+// Receives the whole command frame of the given number of 32-bit words
+import "DPI-C" function int sock_get_frame(input chandle handle, input int words);
+
+// Appends the signal to the response frame
+import "DPI-C" function int sock_frame_put(input chandle handle, input bit [] signal);
+
+// Sends the response frame assembled by the sock_frame_put() calls
+import "DPI-C" function int sock_frame_send(input chandle handle);
+
    export "DPI-C" function pause_sim;
 
    function void pause_sim();
@@ -2,9 +2,7 @@ import time
 import atexit
 import tempfile
 from math import ceil
-import jinja2
 import array
-import math
 import os
 import socket
 import logging
@@ -14,6 +12,7 @@ from pygears import reg
 from pygears.sim.extens.sim_extend import SimExtend
 from pygears.sim import SimPlugin
 from pygears.util.fileio import save_file
+from pygears.hdl.templenv import harness_env
 from pygears.sim import log
 
 from pygears.conf import inject, Inject
@@ -26,6 +25,11 @@ CMD_CYCLE = 0x08000000
 CMD_READ = 0x04000000
 CMD_ACK = 0x02000000
 CMD_FINISH = 0x01000000
+CMD_POLL = 0x00800000
+CMD_FRAME = 0x00400000
+
+# Maximum number of 32-bit words in a single command frame
+MAX_FRAME_WORDS = 0xffff
 
 
 class CosimulatorStartError(Exception):
@@ -75,15 +79,28 @@ def u32_bytes_decode(data, dtype):
     return dtype.decode(u32_bytes_to_int(data) & ((1 << dtype.width) - 1))
 
 
+def u32_size(dtype):
+    return max(ceil(dtype.width / 32), 1) * 4
+
+
 class SVSock(SimExtend):
     @inject
-    def __init__(self, run=Inject('sim/svsock/run'), **kwds):
+    def __init__(self,
+                 run=Inject('sim/svsock/run'),
+                 pipeline=Inject('sim/svsock/pipeline'),
+                 **kwds):
         reg['sim/svsock/server'] = self
         self.run_cosim = run
+        self.pipeline = pipeline
         self.kwds = kwds
         self.sock = None
         self.conn = None
         self.cosim_pid = None
+
+        # In the pipelined protocol, the commands are collected in the frame
+        # which is sent only once the response from the cosimulator is needed
+        self.frame = array.array('I')
+        self.status = None
         super().__init__()
         atexit.register(self.finish)
 
@@ -96,9 +113,7 @@ class SVSock(SimExtend):
     def build(self, intfs=Inject('sim/svsock/intfs')):
 
         base_addr = os.path.dirname(__file__)
-        env = jinja2.Environment(loader=jinja2.FileSystemLoader(base_addr),
-                                 trim_blocks=True,
-                                 lstrip_blocks=True)
+        env = harness_env(base_addr)
         env.globals.update(zip=zip,
                            int=int,
                            print=print,
@@ -107,7 +122,7 @@ class SVSock(SimExtend):
         context = {'port': self.port}
         for phase in [
                 'declaration', 'init', 'set_data', 'read', 'ack', 'reset',
-                'sys_reset'
+                'sys_reset', 'poll'
         ]:
             context[phase] = {}
             for i, intf in enumerate(intfs):
@@ -125,25 +140,107 @@ class SVSock(SimExtend):
     def sendall(self, pkt):
         self.conn.sendall(pkt)
 
+    def queue(self, words):
+        if len(self.frame) + len(words) > MAX_FRAME_WORDS:
+            self.flush()
+
+        self.frame.extend(words)
+        self.status = None
+
+    def flush(self):
+        '''Sends all the queued commands to the cosimulator in a single frame'''
+
+        if not self.frame:
+            return
+
+        header = array.array('I', [CMD_FRAME | len(self.frame)])
+        self.conn.sendall(header.tobytes() + self.frame.tobytes())
+        del self.frame[:]
+
     def send_cmd(self, req):
-        pkt = req.to_bytes(4, byteorder='little')
-        self.conn.sendall(pkt)
+        if not self.pipeline:
+            pkt = req.to_bytes(4, byteorder='little')
+            self.conn.sendall(pkt)
+            return
+
+        self.queue(array.array('I', [req]))
+
+        if req & CMD_SYS_RESET:
+            # Cosimulator sends a status word after initiating the reset
+            self.recv(4)
+        elif req & CMD_FINISH:
+            self.flush()
+
+    def send_data(self, req, data, dtype):
+        '''Sends the command followed by the data, keeping them in the same
+        frame for the pipelined protocol'''
+
+        if not self.pipeline:
+            self.send_cmd(req)
+            self.dtype_send(data, dtype)
+            return
+
+        words = u32_repr(data, dtype)
+        words.insert(0, req)
+        self.queue(words)
 
     def recv(self, size):
-        return self.conn.recv(size)
+        '''Receives exactly size bytes, sending the queued commands first'''
+
+        self.flush()
+
+        data = self.conn.recv(size)
+        while len(data) < size:
+            chunk = self.conn.recv(size - len(data))
+            if not chunk:
+                raise ConnectionResetError
+
+            data += chunk
+
+        return data
+
+    @inject
+    def poll(self, intfs=Inject('sim/svsock/intfs')):
+        '''Returns the status of all the cosimulated interfaces: (ready, None)
+        for the inputs and (valid, data) for the outputs, indexed by the
+        interface id. The whole status is received in a single response
+        frame, which is reused until a new command is issued.'''
+
+        if self.status is not None:
+            return self.status
+
+        self.send_cmd(CMD_POLL)
+        size = int.from_bytes(self.recv(4), byteorder='little')
+        frame = self.recv(size * 4)
+
+        status = {}
+        offset = 0
+        for i, intf in enumerate(intfs):
+            if not hasattr(intf, 'poll'):
+                continue
+
+            active = bool(int.from_bytes(frame[offset:offset + 4], byteorder='little'))
+            offset += 4
+
+            data = None
+            if intf.port.direction == 'out':
+                data_size = u32_size(intf.dtype)
+                if active:
+                    data = u32_bytes_decode(frame[offset:offset + data_size], intf.dtype)
+
+                offset += data_size
+
+            status[i] = (active, data)
+
+        self.status = status
+        return status
 
     def dtype_send(self, data, dtype):
         pkt = u32_repr(data, dtype).tobytes()
         self.sendall(pkt)
 
     def dtype_recv(self, dtype):
-        buff_size = math.ceil(dtype.width / 8)
-        if buff_size < 4:
-            buff_size = 4
-        if buff_size % 4:
-            buff_size += 4 - (buff_size % 4)
-
-        data = self.recv(buff_size)
+        data = self.recv(u32_size(dtype))
         return u32_bytes_decode(data, dtype)
 
     @inject
@@ -259,6 +356,8 @@ class SVSock(SimExtend):
             self.sock = None
             self.cosim_pid = None
             self.conn = None
+            del self.frame[:]
+            self.status = None
             atexit.unregister(self.finish)
 
     def after_cleanup(self, sim):
@@ -270,5 +369,6 @@ class SVSockPlugin(SimPlugin):
     def bind(cls):
         reg.confdef('sim/svsock/backend', default={})
         reg.confdef('sim/svsock/run', default=True)
+        reg.confdef('sim/svsock/pipeline', default=True)
         reg['sim/svsock/intfs'] = []
         reg['sim/svsock/server'] = None
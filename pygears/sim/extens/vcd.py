@@ -229,13 +229,6 @@ class VCDHierVisitor(HierVisitorBase):
         self.sim_map = sim_map
         self.vcd_vars = {}
         self.end_consumers = {}
-        self.indent = 0
-
-    def enter_hier(self, name):
-        self.indent += 4
-
-    def exit_hier(self, name):
-        self.indent -= 4
 
     def trace_if_included(self, p):
         if not is_trace_included(p, self.include, self.vcd_tlm):
@@ -249,9 +242,7 @@ class VCDHierVisitor(HierVisitorBase):
 
     def Gear(self, module):
         if module.parent is None:
-            return super().HierNode(module)
-
-        self.enter_hier(module.basename)
+            return
 
         for p in module.in_ports:
             self.trace_if_included(p)
@@ -266,12 +257,10 @@ class VCDHierVisitor(HierVisitorBase):
                 # it can be looked upon in the list. Make it in a better way
                 self.end_consumers[p.consumer] = {'prods': [], 'intf': id(p.consumer)}
 
-        if (module in self.sim_map or module.hierarchical) and module.params['sim_cls'] is None:
-            super().HierNode(module)
-
-        self.exit_hier(module.basename)
-
-        return True
+        # Descend only into the hierarchical gears that are not simulated as a
+        # whole
+        return not ((module in self.sim_map or module.hierarchical)
+                    and module.params['sim_cls'] is None)
 
 
 class VCD(SimExtend):
@@ -377,9 +366,6 @@ class VCD(SimExtend):
             for vs in v['srcs']:
                 vs['prods'].append(v)
 
-        reg['graph/consumer_tree'] = {}
-        reg['graph/end_producer'] = {}
-
     def var_put(self, v, val):
         cur_timestep = timestep() * 10
         if typeof(v['dtype'], (Any, TLM)):
@@ -54,17 +54,8 @@ class WaveJSONHierVisitor(HierVisitorBase):
         self.sim_map = sim_map
         self.vcd_vars = {}
         self.writer = writer
-        self.indent = 0
-
-    def enter_hier(self, name):
-        self.indent += 4
-
-    def exit_hier(self, name):
-        self.indent -= 4
 
     def Gear(self, module):
-        self.enter_hier(module.basename)
-
         # if module in self.sim_map and module.params['sim_cls'] is None:
         gear_vcd_scope = module.name[1:].replace('/', '.')
         for p in itertools.chain(module.in_ports, module.out_ports):
@@ -97,12 +88,6 @@ class WaveJSONHierVisitor(HierVisitorBase):
 
             self.vcd_vars[intf] = intf_vars
 
-        super().HierNode(module)
-
-        self.exit_hier(module.basename)
-
-        return True
-
 
 @dataclass(frozen=True)
 class WaveSignal:
@@ -8,6 +8,7 @@ from pygears.core.gear import GearPlugin
 from pygears.core.gear_inst import gear_base_resolver
 from pygears.core.hier_node import HierVisitorBase
 from pygears.core.port import HDLConsumer, HDLProducer
+from pygears.core.graph import invalidate_graph
 
 intfs = []
 
@@ -36,8 +37,10 @@ def sim_compile_resolver(func, *args, **kwds):
         if isinstance(outputs, tuple):
             raise Exception("Not yet supported")
 
-        # outputs.connect(HDLConsumer())
+        # Intf.connect() would reference the outputs from the HDLConsumer,
+        # and the reference cycle would postpone the out of scope callback
         outputs.consumers.append(HDLConsumer())
+        invalidate_graph()
 
         gear_inst = outputs.producer.gear
         gear_inst.trace = None
@@ -62,12 +65,12 @@ def sim_compile_resolver(func, *args, **kwds):
         simulator.tasks[sim_gear] = sim_gear.run()
         simulator.task_data[sim_gear] = None
 
-        import asyncio
+        from pygears.core.intf import sim_queue
         for intf, a in zip(local_in, args):
             if isinstance(a, Intf):
                 continue
 
-            intf._in_queue = asyncio.Queue(maxsize=1, loop=reg['sim/simulator'])
+            intf._in_queue = sim_queue()
             intf.put_nb(a)
 
         def callback(p):
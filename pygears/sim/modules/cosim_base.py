@@ -7,11 +7,24 @@ from pygears import GearDone, reg
 from .cosim_port import CosimNoData, InCosimPort, OutCosimPort
 
 
+def always_accepts(port):
+    '''Checks whether the consumer port belongs to a sink @datagear (i.e. the
+    collect), which acknowledges the data in the same cycle it receives it.'''
+
+    g = getattr(port, 'gear', None)
+    if g is None or g.out_ports or g.params.get('sim_cls', None) is not None:
+        return False
+
+    return hasattr(g.func, 'exec')
+
+
 class CosimBase(SimGear):
     @inject
-    def __init__(self, gear, timeout=-1, sim_map=Inject('sim/map')):
+    def __init__(self, gear, timeout=-1, batch=0, sim_map=Inject('sim/map')):
         super().__init__(gear)
         self.timeout = timeout
+        self.batch = batch
+        self.batch_mode = False
         self.in_cosim_ports = [InCosimPort(self, p) for p in gear.in_ports]
         self.out_cosim_ports = [OutCosimPort(self, p) for p in gear.out_ports]
         self.eval_needed = False
@@ -19,9 +32,77 @@ class CosimBase(SimGear):
         for p in (self.in_cosim_ports + self.out_cosim_ports):
             sim_map[p.port] = p
 
+    def setup(self):
+        batch_inputs = self.batch_sources()
+        self.batch_mode = batch_inputs is not None and self.batch_sinks()
+        super().setup()
+
+        # Cosimulation is run natively in advance, i.e. prior to the first
+        # simulation cycle, and the output transactions are replayed in the
+        # same cycles they were output by the module
+        if self.batch_mode:
+            outputs = self.run_batch(batch_inputs)
+            for cp in self.out_cosim_ports:
+                cp.batch_data = outputs[cp.name]
+
     def cycle(self):
         raise NotImplementedError()
 
+    def run_batch(self, in_seqs):
+        '''Runs the cosimulation natively, with inputs supplied from in_seqs
+        dictionary, until the module stays inactive for "timeout" cycles.
+        Returns the dictionary of output transactions per output port, as the
+        lists of (cycle, value) pairs. Cycles are counted from the start of the
+        cosimulation.'''
+
+        raise NotImplementedError()
+
+    def batch_sources(self):
+        '''Returns the full sequences of the input transactions if all the
+        inputs are driven directly by the drv gears, and None otherwise, i.e.
+        when a Python gear is in the loop and the batched mode is not
+        possible.'''
+
+        from pygears.lib.verif import drv, typeseq
+        from pygears.core.graph import get_source_producer, PathError
+
+        if not self.batch or self.timeout < 0:
+            return None
+
+        in_seqs = {}
+        for cp in self.in_cosim_ports:
+            try:
+                src = get_source_producer(cp.port, sim=True)
+            except PathError:
+                return None
+
+            prod = src.consumers[0].gear
+            if prod.definition is not drv or len(src.end_consumers) != 1:
+                return None
+
+            t = prod.params['t']
+            seq = prod.params['seq']
+
+            # One-shot iterators would be depleted for the drv itself
+            if iter(seq) is seq:
+                return None
+
+            in_seqs[cp.name] = [v for s in seq for v in typeseq(t, s)]
+
+        return in_seqs
+
+    def batch_sinks(self):
+        '''Checks whether all the outputs are consumed by the gears that accept
+        the data in the same cycle it is output, since the output ready signals
+        are held high while the cosimulation is run natively.'''
+
+        for cp in self.out_cosim_ports:
+            intf = cp.port.consumer
+            if intf is None or not all(always_accepts(p) for p in intf.end_consumers):
+                return False
+
+        return True
+
     def forward(self):
         raise NotImplementedError()
 
@@ -83,11 +164,20 @@ class CosimBase(SimGear):
         else:
             return False
 
+    async def batch_func(self):
+        while not all(cp.done for cp in self.out_cosim_ports):
+            await clk()
+
+        raise GearDone
+
     async def func(self, *args, **kwds):
         self.activity_monitor = 0
         self.eval_needed = False
 
         try:
+            if self.batch_mode:
+                await self.batch_func()
+
             while True:
 
                 phase = None
@@ -1,4 +1,4 @@
-from pygears.sim import clk, delta, log
+from pygears.sim import clk, delta, log, timestep
 from pygears import GearDone
 
 
@@ -35,6 +35,12 @@ class InCosimPort:
 
         self.active = False
 
+        if self.main.batch_mode:
+            # Input data was already handed to the cosimulator in advance, so
+            # the interface is only drained
+            while True:
+                await intf.get()
+
         while True:
             if self.main.done:
                 intf.finish()
@@ -77,6 +83,7 @@ class OutCosimPort:
         self.parent = None
         self.child = None
         self.main = main
+        self.batch_data = None
 
     @property
     def gear(self):
@@ -96,6 +103,18 @@ class OutCosimPort:
     async def run(self):
         intf = self.port.producer
 
+        if self.main.batch_mode:
+            for cycle, data in self.batch_data:
+                while timestep() < cycle:
+                    await clk()
+
+                await intf.put(data)
+                await clk()
+
+            self.done = True
+            intf.finish()
+            raise GearDone
+
         while True:
             if self.main.done:
                 # log.info(f'CosimPort {self.name} finished')
@@ -54,14 +54,16 @@ class SimSocketInputDrv(SimSocketDrv):
         # print(
         #     f'{timestep()} [{self.port.name}] Sending {hex(data.code())}, {repr(data)}'
         # )
-        self.main.send_cmd(CMD_SET_DATA | self.index)
-        self.main.dtype_send(data, self.port.dtype)
+        self.main.send_data(CMD_SET_DATA | self.index, data, self.port.dtype)
 
     def reset(self):
         # print(f'{timestep()} [{self.port.name}] Reset valid')
         self.main.send_cmd(CMD_RESET | self.index)
 
     def ready(self):
+        if self.main.pipeline:
+            return self.main.poll()[self.index][0]
+
         self.main.send_cmd(CMD_READ | self.index)
 
         data = self.main.recv(4)
@@ -73,6 +75,13 @@ class SimSocketInputDrv(SimSocketDrv):
 
 class SimSocketOutputDrv(SimSocketDrv):
     def read(self):
+        if self.main.pipeline:
+            valid, data = self.main.poll()[self.index]
+            if valid:
+                return data
+            else:
+                raise CosimNoData
+
         # print(
         #     f'{timestep()} [{self.port.name}] Send read command for {self.index}'
         # )
@@ -159,6 +168,9 @@ class SVServerIntf:
     def read(self):
         return self.tenv.snippets.read(self.name, self.port.direction)
 
+    def poll(self):
+        return self.tenv.snippets.poll(self.name, self.port.direction)
+
     def ack(self):
         if self.port.direction == 'out':
             return self.tenv.snippets.ack(self.name)
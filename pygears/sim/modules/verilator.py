@@ -1,18 +1,23 @@
 import ctypes
+import functools
+import hashlib
+import platform
 import shutil
 import atexit
 import os
 import subprocess
+import tempfile
 from string import Template
 from pygears import Intf
 
-import jinja2
 
 from pygears import reg, find
+from pygears.conf import inject, Inject
 from pygears.sim import log
-from pygears.sim.c_drv import CInputDrv, COutputDrv
+from pygears.sim.c_drv import CInputDrv, COutputDrv, pack_batch, unpack_batch, batch_words
 from pygears.sim.modules.cosim_base import CosimBase
 from pygears.hdl import hdlgen, list_hdl_files
+from pygears.hdl.templenv import harness_env
 from pygears.util.fileio import save_file
 from pygears.core.port import InPort, OutPort
 from .cosim_port import InCosimPort, OutCosimPort
@@ -100,16 +105,8 @@ def create_project_script(outdir, top, lang):
     #         f.write(f'{fn}\n')
 
 
-def verilate(outdir, lang, top, top_name, tracing_enabled, rst=True, expand_data=True):
-    # include = ' '.join([f'-I{os.path.abspath(p)}' for p in reg[f'{lang}gen/include']])
-
-    # include += f' -I{outdir}'
-
-    # files = f'{wrap_name}.{lang}'
-    # create_project_script(outdir, top, lang)
-
-    verilate_cmd = [
-        f'cd {outdir};',
+def verilate_flags(top_name, tracing_enabled, rst=True, expand_data=True):
+    return [
         'verilator -cc -CFLAGS -fpic -LDFLAGS -shared --exe',
         '-Wno-fatal',
         # TODO: Not much of a speedup: '-O3 --x-assign fast --x-initial fast --noassert',
@@ -123,6 +120,17 @@ def verilate(outdir, lang, top, top_name, tracing_enabled, rst=True, expand_data
         'sim_main.cpp',
     ]
 
+
+def verilate(outdir, lang, top, top_name, tracing_enabled, rst=True, expand_data=True):
+    # include = ' '.join([f'-I{os.path.abspath(p)}' for p in reg[f'{lang}gen/include']])
+
+    # include += f' -I{outdir}'
+
+    # files = f'{wrap_name}.{lang}'
+    # create_project_script(outdir, top, lang)
+
+    verilate_cmd = [f'cd {outdir};'] + verilate_flags(top_name, tracing_enabled, rst, expand_data)
+
     # '--x-assign unique' if not rst else '',
 
     with open(os.path.join(outdir, 'verilate.log'), 'w') as f:
@@ -136,6 +144,125 @@ def verilate(outdir, lang, top, top_name, tracing_enabled, rst=True, expand_data
                                     f'Please inspect "{outdir}/verilate.log"')
 
 
+@functools.lru_cache(maxsize=None)
+def toolchain_version():
+    '''Identifies the toolchain used to build the library: versions of the
+    Verilator and the C++ compiler, the compiler flags taken from the
+    environment and the host architecture.'''
+
+    cxx = os.environ.get('CXX', 'c++')
+
+    ver = [platform.machine(), cxx] + [os.environ.get(v, '') for v in ('CXXFLAGS', 'LDFLAGS')]
+    for cmd in (['verilator', '--version'], [cxx, '--version']):
+        try:
+            ver.append(subprocess.run(cmd, capture_output=True).stdout.decode())
+        except OSError:
+            ver.append('')
+
+    return '\0'.join(ver)
+
+
+def build_digest(outdir, flags):
+    '''Computes SHA-256 digest of all the sources generated inside outdir
+    (HDL files and the rendered C++ harness), the Verilator flags and the
+    toolchain version.'''
+
+    hsh = hashlib.sha256()
+    hsh.update(toolchain_version().encode())
+    hsh.update(b'\0')
+    hsh.update(' '.join(flags).encode())
+
+    fns = []
+    for dirpath, dirnames, filenames in os.walk(outdir):
+        dirnames[:] = [d for d in dirnames if d != 'obj_dir']
+        fns.extend(os.path.join(dirpath, fn) for fn in filenames if not fn.endswith('.log'))
+
+    for fn in sorted(fns):
+        hsh.update(os.path.relpath(fn, outdir).encode())
+        hsh.update(b'\0')
+        with open(fn, 'rb') as f:
+            hsh.update(f.read())
+
+        hsh.update(b'\0')
+
+    return hsh.hexdigest()
+
+
+@inject
+def build_cache_fetch(digest, dll_path, cache_dir=Inject('sim/verilator/cache_dir')):
+    '''Copies the library from the build cache to dll_path if a build with the
+    same digest is cached. Returns True on the cache hit.'''
+
+    if not cache_dir:
+        return False
+
+    entry = os.path.join(cache_dir, digest)
+    try:
+        os.makedirs(os.path.dirname(dll_path), exist_ok=True)
+        shutil.copy(os.path.join(entry, os.path.basename(dll_path)), dll_path)
+    except OSError:
+        return False
+
+    # Entry modification time is used for the LRU eviction
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+
+    return True
+
+
+@inject
+def build_cache_store(digest,
+                      dll_path,
+                      cache_dir=Inject('sim/verilator/cache_dir'),
+                      cache_size=Inject('sim/verilator/cache_size')):
+    '''Stores the built library into the build cache under the given digest and
+    evicts the least recently used entries if the cache is full.'''
+
+    if not cache_dir:
+        return
+
+    entry = os.path.join(cache_dir, digest)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Entry is populated under a temporary name and renamed into place,
+        # so that concurrent processes never see a partially copied library
+        tmp_entry = tempfile.mkdtemp(dir=cache_dir, prefix='.tmp_')
+        shutil.copy(dll_path, tmp_entry)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # Same build was already cached by some other process
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+    except OSError as e:
+        log.warning(f'Failed to store Verilator build to the cache "{cache_dir}": {e}')
+        return
+
+    build_cache_evict(cache_dir, cache_size)
+
+
+def build_cache_evict(cache_dir, cache_size):
+    if cache_size is None:
+        return
+
+    entries = []
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.startswith('.') or not os.path.isdir(path):
+            continue
+
+        try:
+            entries.append((os.stat(path).st_mtime, path))
+        except OSError:
+            pass
+
+    entries.sort(reverse=True)
+    for _, path in entries[cache_size:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
 def build(top, outdir=None, postsynth=False, lang=None, rebuild=True, rst=True):
     if isinstance(top, str):
         top_name = top
@@ -200,12 +327,20 @@ def build(top, outdir=None, postsynth=False, lang=None, rebuild=True, rst=True):
         'aux_clock': reg['sim/aux_clock']
     }
 
-    jenv = jinja2.Environment(trim_blocks=True, lstrip_blocks=True)
-    jenv.globals.update(int=int)
-    jenv.loader = jinja2.FileSystemLoader([os.path.dirname(__file__)])
-    c = jenv.get_template('sim_veriwrap.j2').render(context)
+    c = harness_env(os.path.dirname(__file__)).get_template('sim_veriwrap.j2').render(context)
     save_file('sim_main.cpp', outdir, c)
 
+    digest = build_digest(
+        outdir,
+        verilate_flags(hdlmod.wrap_module_name,
+                       tracing_enabled,
+                       rst=rst,
+                       expand_data=reg['debug/expand_trace_data']))
+
+    if build_cache_fetch(digest, file_struct['dll_path']):
+        log.info(f'Reusing cached Verilator build {digest[:16]}')
+        return
+
     verilate(outdir,
              lang,
              top,
@@ -216,6 +351,8 @@ def build(top, outdir=None, postsynth=False, lang=None, rebuild=True, rst=True):
 
     make(file_struct['objdir'], hdlmod.wrap_module_name)
 
+    build_cache_store(digest, file_struct['dll_path'])
+
 
 class SimVerilated(CosimBase):
     def __init__(self,
@@ -227,9 +364,10 @@ class SimVerilated(CosimBase):
                  postsynth=False,
                  outdir=None,
                  lang=None,
-                 rst=True):
+                 rst=True,
+                 batch=0):
 
-        super().__init__(gear, timeout=timeout)
+        super().__init__(gear, timeout=timeout, batch=batch)
         self.name = gear.name[1:].replace('/', '_')
         self.outdir = outdir
         self.rst = rst
@@ -255,6 +393,42 @@ class SimVerilated(CosimBase):
     def back(self):
         self.verilib.back()
 
+    def run_batch(self, in_seqs):
+        # Buffers need to be kept alive while the cosimulation runs
+        in_bufs = []
+        for cp in self.in_cosim_ports:
+            dtype = cp.port.dtype
+            codes = [dtype(v).code() for v in in_seqs[cp.name]]
+            buf = pack_batch(codes, dtype.width)
+            in_bufs.append(buf)
+            getattr(self.verilib, f'batch_set_{cp.name}')(buf, ctypes.c_ulong(len(codes)))
+
+        outputs = {cp.name: [] for cp in self.out_cosim_ports}
+        self.verilib.run_batch.argtypes = [ctypes.c_ulong, ctypes.c_long]
+
+        while True:
+            out_bufs = []
+            for cp in self.out_cosim_ports:
+                width = cp.port.dtype.width
+                buf = (ctypes.c_uint * (batch_words(width) * self.batch))()
+                cycles = (ctypes.c_ulong * self.batch)()
+                out_bufs.append((buf, cycles))
+                getattr(self.verilib, f'batch_set_{cp.name}')(buf, cycles,
+                                                              ctypes.c_ulong(self.batch))
+
+            idle = self.verilib.run_batch(self.batch, self.timeout)
+
+            for cp, (buf, cycles) in zip(self.out_cosim_ports, out_bufs):
+                dtype = cp.port.dtype
+                num_api = getattr(self.verilib, f'batch_num_{cp.name}')
+                num_api.restype = ctypes.c_ulong
+                num = num_api()
+                values = (dtype.decode(c) for c in unpack_batch(buf, num, dtype.width))
+                outputs[cp.name].extend(zip(cycles[:num], values))
+
+            if idle:
+                return outputs
+
     def setup(self):
         # TODO: When reusing existing verilated build, add test to check
         # whether verilated module is the same as the current one (Maybe hash check?)
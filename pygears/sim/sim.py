@@ -1,4 +1,5 @@
 import asyncio
+import heapq
 import itertools
 import logging
 import os
@@ -10,13 +11,15 @@ import time
 import stopit
 import contextlib
 
-from functools import partial
+from functools import partial, lru_cache
 from pygears import GearDone, find, reg
 from pygears.conf import CustomLogger, LogFmtFilter, register_custom_log
 from pygears.core.gear import GearPlugin, Gear
 # from pygears.core.intf import get_consumer_tree as intf_get_consumer_tree
 from pygears.core.port import InPort, OutPort, HDLConsumer, HDLProducer
 from pygears.core.sim_event import SimEvent
+from pygears.core.mailbox import MailboxWaiter
+from pygears.core.graph import invalidate_graph
 from pygears.core.hier_node import HierVisitorBase
 from pygears.util.fileio import expand
 from pygears.sim import log
@@ -80,71 +83,142 @@ class SimFuture(asyncio.Future):
     __await__ = __iter__
 
 
-# A recursive function used by topo_sort
-def topo_sort_util(v, g, dag, visited, stack, cycle):
-
-    # Mark the current node as visited.
-    visited[v] = True
-    cycle.append(g)
+class ReadyQueue(set):
+    '''Set of ready simulation gears which additionally keeps the positions
+    of the ready gears in the execution order inside a heap.
+
+    Used by the "activity" scheduler, so that each simulation phase visits only
+    the gears that are runnable instead of sweeping the whole execution order.
+    In the back phase the order is reversed, so the positions are negated.
+    '''
+
+    def __init__(self, order=None, reverse=False):
+        super().__init__()
+        self.heap = []
+        self.reverse = reverse
+        self.reindex(order or {})
+
+    def reindex(self, order):
+        '''Sets new execution order as a dictionary mapping each top-level
+        simulation gear to the list of its positions.'''
+        sign = -1 if self.reverse else 1
+        self.keys = {g: [sign * i for i in pos] for g, pos in order.items()}
+        self.heap = [k for g in self for k in self.keys.get(g, ())]
+        heapq.heapify(self.heap)
+
+    def push(self, sim_gear):
+        for k in self.keys.get(sim_gear, ()):
+            heapq.heappush(self.heap, k)
+
+    def add(self, sim_gear):
+        if sim_gear not in self:
+            super().add(sim_gear)
+            self.push(sim_gear)
+
+    def remove_gear(self, sim_gear):
+        self.discard(sim_gear)
+        self.keys.pop(sim_gear, None)
+
+    def clear(self):
+        super().clear()
+        self.heap.clear()
+
+
+@lru_cache(maxsize=32)
+def topo_sort_idx(adj):
+    """Iterative DFS based topological sort over the graph given as a tuple of
+    adjacency tuples. Returns the order of vertex indices and, if the graph is
+    cyclic, the indices of the vertices forming the cycle.
+
+    Vertices and their consumers are visited in the same order as by the
+    recursive formulation, so the resulting order is the reverse postorder of
+    the DFS started from each unvisited vertex in turn.
+    """
+
+    # 0 - not visited, 1 - on the current DFS path, 2 - finished
+    state = [0] * len(adj)
+    postorder = []
+
+    for root in range(len(adj)):
+        if state[root]:
+            continue
 
-    # Recur for all the vertices adjacent to this vertex
-    for consumer in dag[g]:
-        i = list(dag.keys()).index(consumer)
-        if consumer in cycle:
-            index = cycle.index(consumer)
-            cycle.append(consumer)
-            raise SimCyclic('Simulation not possible, gear cycle found:'
-                            f' {" -> ".join([c.name for c in cycle[index:]])}')
+        state[root] = 1
+        path = [root]
+        stack = [iter(adj[root])]
 
-        if not visited[i]:
-            topo_sort_util(i, consumer, dag, visited, stack, cycle)
+        while stack:
+            for consumer in stack[-1]:
+                if state[consumer] == 1:
+                    index = path.index(consumer)
+                    return None, tuple(path[index:]) + (consumer, )
 
-    cycle.pop()
+                if state[consumer] == 0:
+                    state[consumer] = 1
+                    path.append(consumer)
+                    stack.append(iter(adj[consumer]))
+                    break
+            else:
+                stack.pop()
+                v = path.pop()
+                state[v] = 2
+                postorder.append(v)
 
-    # Push current vertex to stack which stores result
-    stack.insert(0, g)
+    postorder.reverse()
+    return tuple(postorder), None
 
 
 def topo_sort(dag):
-    # Mark all the vertices as not visited
-    visited = [False] * len(dag)
-    stack = []
+    vertices = list(dag)
+    index = {g: i for i, g in enumerate(vertices)}
 
-    # for i, g in enumerate(dag):
-    #     if not g.in_ports:
-    #         stack.append(g)
-    #         visited[i] = True
+    # Result is cached on the graph structure, so that the repeated simulations
+    # of the same design skip the sorting
+    order, cycle = topo_sort_idx(tuple(tuple(index[c] for c in consumers)
+                                       for consumers in dag.values()))
 
-    # Call the recursive helper function to store Topological
-    # Sort starting from all vertices one by one
-    for i, g in enumerate(dag):
-        if not visited[i]:
-            topo_sort_util(i, g, dag, visited, stack, [])
+    if cycle is not None:
+        raise SimCyclic('Simulation not possible, gear cycle found:'
+                        f' {" -> ".join([vertices[i].name for i in cycle])}')
 
-    return stack
+    return [vertices[i] for i in order]
 
 
-def _get_consumer_tree_rec(root_intf, cur_intf, consumers):
+def _get_consumer_tree_rec(cur_intf, consumers, sim_map, cache):
+    start = len(consumers)
     for port in cur_intf.consumers:
         if isinstance(port, HDLConsumer):
             continue
 
         cons_intf = port.consumer
-        if port in reg['sim/map']:
+        if port in sim_map:
             consumers.append(port)
         elif port.gear.hierarchical:
             if cons_intf is None:
                 raise Exception(f'Port {port.name} found dangling')
 
-            _get_consumer_tree_rec(root_intf, cons_intf, consumers)
+            if cons_intf in cache:
+                consumers.extend(cache[cons_intf])
+            else:
+                _get_consumer_tree_rec(cons_intf, consumers, sim_map, cache)
         else:
             consumers.append(port.gear)
 
+    cache[cur_intf] = consumers[start:]
+
+
+def get_consumer_tree(intf, cache=None):
+    '''Returns the simulation consumers of the interface. Consumer trees of all
+    the interfaces visited on the way are stored in the cache dictionary if
+    supplied, so that they are not traversed again.'''
 
-def get_consumer_tree(intf):
-    consumers = []
-    _get_consumer_tree_rec(intf, intf, consumers)
-    return consumers
+    if cache is None:
+        cache = {}
+
+    if intf not in cache:
+        _get_consumer_tree_rec(intf, [], reg['sim/map'], cache)
+
+    return list(cache[intf])
 
 
 class GearEnum(HierVisitorBase):
@@ -159,7 +233,7 @@ class GearEnum(HierVisitorBase):
 def cosim_build_dir(top):
     from pygears.core.gear_memoize import gear_inst_hash
     hsh = gear_inst_hash(top)
-    return f'{top.basename}_{hex(hsh & 0xfffffff)}'
+    return f'{top.basename}_{hsh[:12]}'
 
 
 def cosim(top, sim, *args, **kwds):
@@ -177,14 +251,6 @@ def cosim(top, sim, *args, **kwds):
 
     reg['sim/hook/cosim_build_before'](top, args, kwds)
 
-    if not kwds['rebuild']:
-        import sys
-        if sys.flags.hash_randomization:
-            raise Exception(
-                f"Reuse of previous cosim build turned on for module '{top}'.\n"
-                " In order to use this feature you need to turn off Python hash randomization.\n"
-                " Before running Python, you need to set environment variable 'PYTHONHASHSEED=0'")
-
     if isinstance(sim, str):
         if sim in ['cadence', 'xsim', 'questa']:
             from .modules import SimSocket
@@ -214,15 +280,19 @@ def cosim(top, sim, *args, **kwds):
     else:
         top.params['sim_cls'] = sim_cls
 
+    # End consumers are determined by the placement of the sim_cls modules
+    invalidate_graph()
+
 
 def simgear_exec_order(gears):
     sim_map = reg['sim/map']
+    tree_cache = {}
     dag = {}
 
     for g in gears:
         dag[g] = []
         for p in g.out_ports:
-            dag[g].extend(get_consumer_tree(p.consumer))
+            dag[g].extend(get_consumer_tree(p.consumer, tree_cache))
 
     for g, sim_gear in sim_map.items():
         if isinstance(g, OutPort):
@@ -238,7 +308,7 @@ def simgear_exec_order(gears):
             if (not g.gear.hierarchical):
                 dag[g] = [g.gear]
             else:
-                dag[g] = get_consumer_tree(g.consumer)
+                dag[g] = get_consumer_tree(g.consumer, tree_cache)
 
         elif isinstance(g, OutPort):
             # TODO: Test if this works
@@ -247,7 +317,7 @@ def simgear_exec_order(gears):
             if (not g.gear.hierarchical):
                 dag[g.gear].append(g)
 
-            dag[g] = get_consumer_tree(g.consumer)
+            dag[g] = get_consumer_tree(g.consumer, tree_cache)
 
     gear_order = topo_sort(dag)
 
@@ -284,8 +354,12 @@ def simgear_exec_order(gears):
 
 
 class EventLoop(asyncio.events.AbstractEventLoop):
-    def __init__(self, step_timeout=2):
+    def __init__(self, step_timeout=2, scheduler='sweep'):
+        if scheduler not in ('sweep', 'activity'):
+            raise Exception(f'Unsupported simulation scheduler: "{scheduler}"')
+
         self.step_timeout = step_timeout
+        self.scheduler = scheduler
         self.events = {
             'before_setup': SimEvent(),
             'before_run': SimEvent(),
@@ -306,7 +380,6 @@ class EventLoop(asyncio.events.AbstractEventLoop):
 
     def insert_gears(self, gears, pos=None):
         for g in gears:
-            g.phase = 'forward'
             if g not in self.sim_map:
                 raise Exception(f'Gear "{g.name}" of type "{g.definition.__name__}" has'
                                 f' no simulation model')
@@ -328,6 +401,19 @@ class EventLoop(asyncio.events.AbstractEventLoop):
             self.tasks[g] = g.run()
             self.task_data[g] = None
 
+        if self.scheduler == 'activity' and hasattr(self, 'forward_ready'):
+            self.reindex()
+
+    def reindex(self):
+        order = {}
+        for i, g in enumerate(self.sim_gears):
+            order.setdefault(g, []).append(i)
+
+        self.gear_pos = self.sim_gears.copy()
+        self.forward_ready.reindex(order)
+        self.back_ready.reindex(order)
+        self.parents = {g for g in self.sim_gears if g.child}
+
     def future_done(self, fut):
         # This will never be called, call_soon will be called first and handle the finishing
         pass
@@ -355,10 +441,13 @@ class EventLoop(asyncio.events.AbstractEventLoop):
         if sim_gear.parent is None:
             self.sim_gears.remove(sim_gear)
 
-        self.back_ready.discard(sim_gear)
-        self.forward_ready.discard(sim_gear)
-        self.back_ready.discard(sim_gear)
-        self.forward_ready.discard(sim_gear)
+        if self.scheduler == 'activity':
+            self.back_ready.remove_gear(sim_gear)
+            self.forward_ready.remove_gear(sim_gear)
+            self.parents.discard(sim_gear)
+        else:
+            self.back_ready.discard(sim_gear)
+            self.forward_ready.discard(sim_gear)
 
     def create_future(self):
         """Create a Future object attached to the loop."""
@@ -416,7 +505,7 @@ class EventLoop(asyncio.events.AbstractEventLoop):
             self.done.add(sim_gear)
         else:
             self.wait_list[data] = sim_gear
-            if isinstance(data, asyncio.Future):
+            if isinstance(data, (asyncio.Future, MailboxWaiter)):
                 self.wait_list[data] = sim_gear
             else:
                 if sim_gear.phase == 'back':
@@ -447,6 +536,25 @@ class EventLoop(asyncio.events.AbstractEventLoop):
         gear_reg['current_module'] = self.cur_gear
         gear_reg['current_sim'] = sim_gear
 
+    def specialize_intfs(self):
+        '''Interfaces of the simulated gears that have no callbacks registered
+        to their events by this point, are switched to the hook-free methods
+        for the duration of the simulation.'''
+
+        for g in self.sim_map:
+            if not isinstance(g, Gear):
+                continue
+
+            for p in g.in_ports:
+                if p.consumer is not None:
+                    p.consumer.specialize(pull=True)
+                    self.specialized_intfs.append(p.consumer)
+
+            for p in g.out_ports:
+                if p.producer is not None:
+                    p.producer.specialize(put=True)
+                    self.specialized_intfs.append(p.producer)
+
     def sim_list(self, sim_gears):
         if self.phase == 'forward':
             ready_dict = self.forward_ready
@@ -469,6 +577,58 @@ class EventLoop(asyncio.events.AbstractEventLoop):
 
                     unprocessed_children = cur_child_num < len(sim_gear.child)
 
+    def sim_ready(self):
+        '''Activity driven alternative to the sim_list(). Visits the top-level
+        simulation gears in the same order as sim_list() would, but only the
+        ones that are ready or have child gears.'''
+
+        if self.phase == 'forward':
+            ready_dict = self.forward_ready
+        else:
+            ready_dict = self.back_ready
+
+        heap = ready_dict.heap
+        for sim_gear in self.parents:
+            ready_dict.push(sim_gear)
+
+        # Gears that got ready for the positions that were already visited in
+        # this pass, are left for the next one
+        deferred = []
+        last = None
+        while heap:
+            key = heapq.heappop(heap)
+            sim_gear = self.gear_pos[abs(key)]
+
+            if last is not None and key <= last:
+                if sim_gear in ready_dict:
+                    deferred.append(key)
+
+                continue
+
+            last = key
+
+            if sim_gear in ready_dict:
+                self.maybe_run_gear(sim_gear, ready_dict)
+
+            if sim_gear.child:
+                unprocessed_children = True
+                while (unprocessed_children):
+                    self.sim_list(sim_gear.child)
+
+                    cur_child_num = len(sim_gear.child)
+                    if sim_gear in ready_dict:
+                        self.maybe_run_gear(sim_gear, ready_dict)
+
+                    unprocessed_children = cur_child_num < len(sim_gear.child)
+
+            if sim_gear.child:
+                self.parents.add(sim_gear)
+            else:
+                self.parents.discard(sim_gear)
+
+        for key in set(deferred):
+            heapq.heappush(heap, key)
+
     def sim_loop(self, timeout):
         clk = reg['sim/clk_event']
         delta = reg['sim/delta_event']
@@ -483,6 +643,11 @@ class EventLoop(asyncio.events.AbstractEventLoop):
         start_time = time.time()
         finished = False
 
+        if self.scheduler == 'activity':
+            run_phase = self.sim_ready
+        else:
+            run_phase = partial(self.sim_list, self.sim_gears)
+
         log.info("-------------- Simulation start --------------")
         while (self.forward_ready or self.back_ready or self._schedule_to_finish or not finished):
             # Conditional timeout context
@@ -508,7 +673,7 @@ class EventLoop(asyncio.events.AbstractEventLoop):
                 #     breakpoint()
 
                 self.phase = 'forward'
-                self.sim_list(self.sim_gears)
+                run_phase()
 
                 self.phase = 'delta'
                 delta.set()
@@ -520,7 +685,7 @@ class EventLoop(asyncio.events.AbstractEventLoop):
                         self._finish(sim_gear)
                         self._schedule_to_finish.remove(sim_gear)
 
-                self.sim_list(self.sim_gears)
+                run_phase()
 
                 self.phase = 'cycle'
                 self.events['before_timestep'](self, timestep)
@@ -570,6 +735,7 @@ class EventLoop(asyncio.events.AbstractEventLoop):
     def run(self, timeout=None):
         self.sim_map = reg['sim/map']
         self.sim_gears = []
+        self.specialized_intfs = []
         self.tasks = {}
         self.task_data = {}
 
@@ -579,8 +745,17 @@ class EventLoop(asyncio.events.AbstractEventLoop):
         self.insert_gears(simgear_exec_order(v.gears))
 
         self.wait_list = {}
-        self.forward_ready = set(self.sim_gears)
-        self.back_ready = set()
+
+        if self.scheduler == 'activity':
+            self.forward_ready = ReadyQueue()
+            self.back_ready = ReadyQueue(reverse=True)
+            self.reindex()
+            for g in self.sim_gears:
+                self.forward_ready.add(g)
+        else:
+            self.forward_ready = set(self.sim_gears)
+            self.back_ready = set()
+
         self._schedule_to_finish = set()
         self.done = set()
 
@@ -603,6 +778,7 @@ class EventLoop(asyncio.events.AbstractEventLoop):
         reg['gear/exec_context'] = 'sim'
         try:
             self.events['before_run'](self)
+            self.specialize_intfs()
             self.sim_loop(timeout)
         except SimFinish:
             pass
@@ -614,6 +790,11 @@ class EventLoop(asyncio.events.AbstractEventLoop):
             reg['sim/traceback'] = sys.exc_info()[2]
             reg['sim/exception'] = e
 
+        for intf in self.specialized_intfs:
+            intf.unspecialize()
+
+        self.specialized_intfs.clear()
+
         if reg['sim/postmortem'] and reg['sim/traceback']:
             import pdb
             pdb.post_mortem(reg['sim/traceback'])
@@ -675,7 +856,7 @@ def sim(resdir=None, timeout=None, extens=None, run=True, check_activity=False,
 
     log.info(f'Running sim with seed: {reg["sim/rand_seed"]}')
 
-    loop = EventLoop(reg['sim/step_timeout'])
+    loop = EventLoop(reg['sim/step_timeout'], reg['sim/scheduler'])
     asyncio.set_event_loop(loop)
     reg['sim/simulator'] = loop
 
@@ -744,8 +925,12 @@ class SimPlugin(GearPlugin):
         reg['sim/traceback'] = None
         reg.confdef('sim/rand_seed', None)
         reg.confdef('sim/clk_freq', 1000)
+        reg.confdef('sim/scheduler', default='sweep')
+        reg.confdef('sim/channel', default='queue')
         reg.confdef('results-dir', default=tempfile.mkdtemp())
         reg.confdef('sim/extens', default=[])
+        reg.confdef('sim/verilator/cache_dir', default=None)
+        reg.confdef('sim/verilator/cache_size', default=64)
 
         reg['gear/params/meta/sim_setup'] = None
         register_custom_log('sim', cls=SimLog)
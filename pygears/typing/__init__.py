@@ -6,6 +6,7 @@ from .array import Array
 from .base import TemplateArgumentsError, typeof, Any, is_type, T
 from .tuple import Tuple
 from .uint import Int, Uint, Integer, Bool, Integral, code, decode
+from .codec import encode_many, decode_many
 from .unit import Unit
 from .union import Union, Maybe, some, Nothing
 from .math import bitw, ceil_pow2, div, floor
@@ -26,7 +27,7 @@ __all__ = [
     'Bool', 'Queue', 'TemplateArgumentsError', 'Tuple', 'Int', 'Uint', 'Unit', 'Union',
     'Maybe', 'Array', 'Float', 'bitw', 'div', 'floor', 'typeof', 'Any', 'TLM',
     'ceil_pow2', 'is_type', 'flatten', 'expand', 'factor', 'Ufixp', 'Fixp', 'Number',
-    'Fixpnumber', 'Integral', 'cast', 'signed', 'code', 'decode',
+    'Fixpnumber', 'Integral', 'cast', 'signed', 'code', 'decode', 'encode_many', 'decode_many',
     'saturate', 'qround', 'get_match_conds', 'TypeMatchError', 'match', 'trunc', 'T'
 ]
 
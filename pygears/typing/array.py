@@ -1,5 +1,6 @@
 from .base import EnumerableGenericMeta, typeof, is_type, TemplateArgumentsError
 from .base import class_and_instance_method
+from .codec import codec
 
 # TODO: Check why array is specified when no length is specified
 
@@ -182,14 +183,7 @@ class Array(list, metaclass=ArrayType):
         return hash(tuple(self))
 
     def code(self):
-        w_dtype = type(self).data.width
-        ret = 0
-        for d in reversed(self):
-            ret <<= w_dtype
-            if d is not None:
-                ret |= d.code()
-
-        return ret
+        return codec(type(self)).code(self)
 
     @property
     def unknown(self):
@@ -197,14 +191,7 @@ class Array(list, metaclass=ArrayType):
 
     @classmethod
     def decode(cls, val):
-        ret = []
-        val = int(val)
-        mask = int(cls.data.width * '1', 2)
-        for t in cls:
-            ret.append(t.decode(val & mask))
-            val >>= t.width
-
-        return cls(ret)
+        return codec(cls).decode(int(val))
 
     @class_and_instance_method
     def copy(self):
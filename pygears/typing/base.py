@@ -1,9 +1,12 @@
+import ast
 import collections
 import copy
 import functools
 import copyreg
 import operator
 
+from .type_cache import cached_getitem
+
 
 
 class BlackBox:
@@ -310,6 +313,7 @@ class GenericMeta(TypingMeta):
 
         return self._specified
 
+    @cached_getitem
     def __getitem__(self, params):
         # if isinstance(params, tuple):
         #     params = list(params)
@@ -462,6 +466,30 @@ searched recursively. Each template is reported only once.
     #     return all(s == o for s, o in zip(self.args, other.args))
 
 
+@functools.lru_cache(maxsize=None)
+def compile_template(templ):
+    """Returns the compiled code object for the template expression, supplied
+    either as a string or as bytes, i.e. ``b'T1.width + 1'``."""
+    return compile(templ, '<template>', 'eval')
+
+
+@functools.lru_cache(maxsize=None)
+def template_names(templ):
+    """Returns the set of variable names the template expression refers to.
+
+    >>> sorted(template_names(b'T1.width + w'))
+    ['T1', 'w']
+    """
+    try:
+        tree = ast.parse(templ, mode='eval')
+    except SyntaxError:
+        return frozenset()
+
+    return frozenset(
+        node.id for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load))
+
+
 def param_subs(t, matches, namespace):
     t_orig = t
 
@@ -483,7 +511,7 @@ def param_subs(t, matches, namespace):
 
         err = None
         try:
-            return eval(t, namespace, matches)
+            return eval(compile_template(t), namespace, matches)
         except Exception as e:
             err = e
 
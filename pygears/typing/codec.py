@@ -0,0 +1,257 @@
+"""Compiled codecs, which pack the instances of the composite types into
+integers and back.
+
+The :meth:`Tuple.code` and :meth:`Tuple.decode` (and their :class:`Array`,
+:class:`Queue` and :class:`Union` counterparts) recurse through the type field
+by field, building the intermediate typed objects along the way. Instead, each
+concrete type is flattened once into a list of ``(offset, width, leaf type)``
+entries, from which the straight-line Python functions for packing and
+unpacking are generated. The resulting :class:`Codec` is cached on the type
+itself.
+
+>>> Point = Tuple[{'x': Uint[8], 'y': Uint[8]}]
+>>> codec(Point).leaves
+[(0, 8, Uint[8]), (8, 8, Uint[8])]
+>>> hex(codec(Point).code(Point((0xaa, 0xbb))))
+'0xbbaa'
+"""
+
+from .base import typeof
+
+# Composite types are joined into a single expression in chunks, so that the
+# Python compiler does not need to recurse through very long chains of binary
+# operators for wide arrays
+_CHUNK = 64
+
+
+def _array(cls, elems):
+    res = list.__new__(cls)
+    list.__init__(res, elems)
+    return res
+
+
+def _union(cls, data_t, ctrl_t, masks, data, ctrl):
+    mask = masks[ctrl]
+    if data & ~mask:
+        # Active subtype decides whether the data bits outside of it are an
+        # error (i.e. for Uint), otherwise they are cleared
+        cls.types[ctrl].decode(data)
+        data &= mask
+
+    return tuple.__new__(cls, (int.__new__(data_t, data), int.__new__(ctrl_t, ctrl)))
+
+
+class _CodecBuilder:
+    def __init__(self):
+        from . import Array, Queue, Tuple, Union, Integer, Fixpnumber, Int, Uint, Fixp, Ufixp
+
+        self.Array = Array
+        self.Union = Union
+        self.composite = (Tuple, Queue, Union, Array)
+        self.numeric = (Integer, Fixpnumber)
+        self.signed = (Int, Fixp)
+        self.unsigned = (Uint, Ufixp)
+
+        self.ns = {
+            '_new': int.__new__,
+            '_int': int.__int__,
+            '_tnew': tuple.__new__,
+            '_tget': tuple.__getitem__,
+            '_lget': list.__getitem__,
+            '_array': _array,
+            '_union': _union,
+        }
+        self.leaves = []
+        self.lines = []
+        self.terms = []
+
+    def const(self, obj):
+        name = f'_c{len(self.ns)}'
+        self.ns[name] = obj
+        return name
+
+    def tmp(self, expr):
+        name = f'_t{len(self.lines)}'
+        self.lines.append(f'    {name} = {expr}')
+        return name
+
+    def term(self, expr, offset, nullable):
+        if nullable:
+            expr = f'(0 if {nullable} is None else {expr})'
+
+        self.terms.append(f'({expr} << {offset})' if offset else expr)
+
+    def leaf(self, t, offset, enc, nullable):
+        width = t.width
+        mask = (1 << width) - 1
+        self.leaves.append((offset, width, t))
+
+        numeric = width and any(typeof(t, c) for c in self.numeric)
+
+        if enc is not None and width:
+            if numeric:
+                self.term(f'(_int({enc}) & {mask})', offset, nullable)
+            else:
+                self.term(f'({enc}.code() & {mask})', offset, nullable)
+
+        bits = f'(v >> {offset})' if offset else 'v'
+        tname = self.const(t)
+
+        if numeric and any(typeof(t, c) for c in self.signed):
+            half = 1 << (width - 1)
+            return f'_new({tname}, (({bits} + {half}) & {mask}) - {half})'
+        elif numeric and any(typeof(t, c) for c in self.unsigned):
+            return f'_new({tname}, {bits} & {mask})'
+        else:
+            return f'{tname}.decode({bits} & {mask})'
+
+    def walk(self, t, offset=0, enc='v', nullable=None):
+        '''Flattens the type ``t`` placed at the ``offset``. Emits the packing
+        terms for the value expression ``enc`` and returns the expression that
+        unpacks the value from the integer ``v``. Packing is skipped when
+        ``enc`` is None.'''
+
+        if not any(typeof(t, c) for c in self.composite):
+            return self.leaf(t, offset, enc, nullable)
+
+        if nullable:
+            # Array elements can be left unknown (None) and are then packed as
+            # zeros, so the packing is delegated to the element type codec
+            self.term(f'{self.const(codec(t).code)}({enc})', offset, nullable)
+            enc = None
+        elif enc is not None and enc != 'v':
+            enc = self.tmp(enc)
+
+        is_array = typeof(t, self.Array)
+        fields = [t.data] * len(t) if is_array else list(t)
+
+        start = offset
+        decs = []
+        for i, f in enumerate(fields):
+            f_enc = None
+            f_nullable = None
+            if enc is not None:
+                if is_array:
+                    f_enc = f_nullable = self.tmp(f'_lget({enc}, {i})')
+                else:
+                    f_enc = f'_tget({enc}, {i})'
+
+            decs.append(self.walk(f, offset, f_enc, f_nullable))
+            offset += f.width
+
+        tname = self.const(t)
+        if is_array:
+            return f'_array({tname}, [{", ".join(decs)}])'
+        elif typeof(t, self.Union):
+            data_t, ctrl_t = fields
+            masks = self.const(tuple((1 << s.width) - 1 for s in t.types))
+            data = f'(v >> {start})' if start else 'v'
+            ctrl = f'(v >> {start + data_t.width}) & {(1 << ctrl_t.width) - 1}'
+            return (f'_union({tname}, {self.const(data_t)}, {self.const(ctrl_t)}, {masks}, '
+                    f'{data}, {ctrl})')
+        else:
+            return f'_tnew({tname}, ({", ".join(decs)}, ))'
+
+    def build(self, t):
+        dec = self.walk(t)
+
+        src = ['def code(v):'] + self.lines
+        if self.terms:
+            src.append('    r = 0')
+            for i in range(0, len(self.terms), _CHUNK):
+                src.append(f'    r |= {" | ".join(self.terms[i:i + _CHUNK])}')
+
+            src.append('    return r')
+        else:
+            src.append('    return 0')
+
+        src.extend(['', 'def decode(v):', f'    return {dec}', ''])
+        src = '\n'.join(src)
+
+        exec(compile(src, f'<codec {t!r}>', 'exec'), self.ns)
+        return src, self.ns['code'], self.ns['decode']
+
+
+class Codec:
+    '''Packs the instances of the concrete type ``dtype`` into integers and
+    unpacks them back, using the functions generated from the flattened type.
+
+    Attributes:
+        dtype: The type the codec was compiled for
+        leaves: A list of ``(offset, width, leaf type)`` entries for all the
+          non-composite fields of the ``dtype``
+        code: Function which returns the packed integer for the ``dtype``
+          instance, same as ``dtype.code()`` would
+        decode: Function which returns the ``dtype`` instance for the packed
+          integer, same as ``dtype.decode()`` would
+    '''
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+        self.width = dtype.width
+
+        builder = _CodecBuilder()
+        self.src, self.code, self.decode = builder.build(dtype)
+        self.leaves = builder.leaves
+
+    def encode_many(self, vals, array=False):
+        '''Packs a sequence of values, converting them to the ``dtype`` first if
+        needed. If ``array`` is ``True``, the result is returned as NumPy
+        ``uint64`` array, which is only supported for the types up to 64 bits
+        wide.'''
+
+        dtype = self.dtype
+        code = self.code
+        codes = [code(v if type(v) is dtype else dtype(v)) for v in vals]
+
+        if not array:
+            return codes
+
+        if self.width > 64:
+            raise ValueError(f'Type {repr(dtype)} is {self.width} bits wide and cannot be packed'
+                             f' into uint64 array')
+
+        import numpy as np
+        return np.array(codes, dtype=np.uint64)
+
+    def decode_many(self, codes):
+        '''Unpacks a sequence of integers or a NumPy integer array into a list of
+        ``dtype`` instances.'''
+
+        if hasattr(codes, 'tolist'):
+            codes = codes.tolist()
+
+        decode = self.decode
+        return [decode(int(c)) for c in codes]
+
+    def __repr__(self):
+        return f'Codec({repr(self.dtype)})'
+
+
+def codec(dtype) -> Codec:
+    '''Returns the compiled :class:`Codec` for the concrete type ``dtype``,
+    building it on the first call.'''
+
+    c = dtype.__dict__.get('_codec', None)
+    # Type copies are created from the namespace of the original type, so check
+    # that the cached codec was made for this exact type
+    if c is None or c.dtype is not dtype:
+        c = Codec(dtype)
+        dtype._codec = c
+
+    return c
+
+
+def encode_many(dtype, vals, array=False):
+    '''Packs a sequence of values of type ``dtype`` into a list of integers, or
+    NumPy ``uint64`` array if ``array`` is ``True``. See
+    :meth:`Codec.encode_many`.'''
+
+    return codec(dtype).encode_many(vals, array)
+
+
+def decode_many(dtype, codes):
+    '''Unpacks a sequence of integers or a NumPy integer array into a list of
+    ``dtype`` instances. See :meth:`Codec.decode_many`.'''
+
+    return codec(dtype).decode_many(codes)
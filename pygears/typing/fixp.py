@@ -1,17 +1,20 @@
 from math import floor, ceil
 from .base import class_and_instance_method, typeof, is_type
+from .type_cache import cached_type_arith
 from .unit import Unit
 from .uint import IntegralType, Integral, Uint, Int, Integer, code, Bool
 from .math import bitw
 
 
 class FixpnumberType(IntegralType):
+    @cached_type_arith
     def __abs__(self):
         if not self.signed:
             return self
 
         return Fixp[self.integer + 1, self.width + 1]
 
+    @cached_type_arith
     def __add__(self, other):
         if not typeof(other, Integral):
             return NotImplemented
@@ -49,6 +52,7 @@ class FixpnumberType(IntegralType):
     def __float__(self):
         return float
 
+    @cached_type_arith
     def __floordiv__(self, other):
         return self.__truediv__(other, 0)
 
@@ -97,6 +101,7 @@ class FixpnumberType(IntegralType):
     def __isub__(self, other):
         return self
 
+    @cached_type_arith
     def __lshift__(self, others):
         shamt = int(others)
         return self.base[self.integer + shamt, self.width]
@@ -110,6 +115,7 @@ class FixpnumberType(IntegralType):
     def __mod__(self, other):
         return NotImplemented
 
+    @cached_type_arith
     def __mul__(self, other):
         if not typeof(other, Integral):
             return NotImplemented
@@ -136,6 +142,7 @@ class FixpnumberType(IntegralType):
         else:
             return Ufixp[integer_part, width]
 
+    @cached_type_arith
     def __neg__(self):
         return Fixp[self.integer + 1, self.width + 1]
 
@@ -167,6 +174,7 @@ class FixpnumberType(IntegralType):
         else:
             return self
 
+    @cached_type_arith
     def __rshift__(self, others):
         shamt = int(others)
         return self.base[self.integer - shamt, self.width]
@@ -186,6 +194,7 @@ class FixpnumberType(IntegralType):
         else:
             return super().__str__()
 
+    @cached_type_arith
     def __sub__(self, other):
         if not typeof(other, Integral):
             return NotImplemented
@@ -208,6 +217,7 @@ class FixpnumberType(IntegralType):
 
         return Fixp[integer_part, width]
 
+    @cached_type_arith
     def __truediv__(self, other, subprec=0):
         ops = [self, other]
 
@@ -319,11 +329,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
             return self
 
     def __add__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
@@ -408,11 +417,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
                 return int(self) > int(fixp_other) << (type(self).fract - type(fixp_other).fract)
 
     def __iadd__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
@@ -422,11 +430,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
 
 
     def __imul__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
@@ -436,11 +443,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
         return NotImplemented
 
     def __isub__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
@@ -491,11 +497,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
         return NotImplemented
 
     def __mul__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
@@ -541,11 +546,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
         return (type(self) >> other).decode(int(self))
 
     def __rsub__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
@@ -558,11 +562,10 @@ class Fixpnumber(Integral, metaclass=FixpnumberType):
         return f'{str(type(self))}({float(self)})'
 
     def __sub__(self, other):
-        if is_type(type(other)) and not isinstance(other, (Fixpnumber, Integer)):
-            return NotImplemented
-
         if isinstance(other, Fixpnumber):
             conv_other = other
+        elif is_type(type(other)) and not isinstance(other, Integer):
+            return NotImplemented
         else:
             conv_other = Fixpnumber(other)
 
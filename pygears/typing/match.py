@@ -1,5 +1,7 @@
+import builtins
+
 from pygears.conf import reg
-from pygears.typing.base import Any, GenericMeta, type_repr, typeof, T
+from pygears.typing.base import Any, GenericMeta, type_repr, typeof, T, compile_template
 
 
 class TypeMatchError(Exception):
@@ -32,10 +34,16 @@ def _get_match_conds_rec(t, pat, matches):
                     f'Ambiguous match for parameter "{pat}": {type_repr(t)} '
                     f"and {type_repr(matches[pat])}")
         else:
+            namespace = reg['gear/type_arith']
+            if (pat.isidentifier() and pat not in namespace and not hasattr(builtins, pat)):
+                # Unbound parameter name, spare the exception raised by eval()
+                matches[pat] = t
+                return t
+
             try:
                 # TODO: Should probably use globals of the string. See: Python
                 # 3.10. typing.get_type_hints()
-                res = eval(pat, reg['gear/type_arith'], matches)
+                res = eval(compile_template(pat), namespace, matches)
                 if t != res:
                     raise TypeMatchError(
                         f"{type_repr(t)} cannot be matched to {type_repr(res)}")
@@ -2,6 +2,7 @@ import inspect
 
 from .base import EnumerableGenericMeta, type_str, typeof
 from .base import TemplatedTypeUnspecified, class_and_instance_method, is_type
+from .codec import codec
 from .uint import Uint
 from .unit import Unit
 
@@ -151,9 +152,7 @@ class Queue(tuple, metaclass=QueueMeta):
     def code(self):
         """Returns a packed integer representation of the :class:`Queue` instance.
         """
-        data = super().__getitem__(0)
-        eot = super().__getitem__(1)
-        return data.code() | (int(eot) << type(data).width)
+        return codec(type(self)).code(self)
 
     @class_and_instance_method
     def sub(self, lvl=None):
@@ -194,10 +193,5 @@ class Queue(tuple, metaclass=QueueMeta):
 
     @classmethod
     def decode(cls, val):
-        data_t = cls.__args__[0]
-        data_t_width = data_t.width
-        data_t_mask = (1 << data_t_width) - 1
-        val = int(val)
-
-        return cls((data_t.decode(val & data_t_mask), val >> data_t_width))
+        return codec(cls).decode(int(val))
 
@@ -89,6 +89,7 @@ Uint[8](0)
 from .base import EnumerableGenericMeta, type_str, type_repr, is_type, typeof
 from .base import TemplatedTypeUnspecified
 from .base import class_and_instance_method
+from .codec import codec
 
 
 class TupleType(EnumerableGenericMeta):
@@ -450,14 +451,7 @@ class Tuple(tuple, metaclass=TupleType):
         >>> hex(48042)
         '0xbbaa'
         """
-        ret = 0
-
-        t = type(self).__args__
-        for i in range(len(t) - 1, -1, -1):
-            ret <<= t[i].width
-            ret |= super().__getitem__(i).code() & ((1 << t[i].width) - 1)
-
-        return ret
+        return codec(type(self)).code(self)
 
     code = __int__
 
@@ -472,12 +466,4 @@ class Tuple(tuple, metaclass=TupleType):
         >>> Point.decode(0xbbaa)
         (Uint[8](170), Uint[8](187))
         """
-        ret = []
-        val = int(val)
-        for t in cls:
-            t_width = t.width
-            t_mask = (1 << t_width) - 1
-            ret.append(t.decode(val & t_mask))
-            val >>= t_width
-
-        return cls(tuple(ret))
+        return codec(cls).decode(int(val))
@@ -0,0 +1,151 @@
+"""Bounded caches for the results of the type construction and the type
+arithmetic.
+
+Types compare equal whenever their hashes match, which disregards i.e. the
+field names of the :class:`Tuple` types. Hence, the types are keyed by their
+identity, and the cache entry keeps the references to them so that their ids
+are not reused while the entry is alive.
+"""
+
+import functools
+from collections import OrderedDict
+
+
+class TypeCache:
+    """LRU cache with hit and miss statistics. Setting ``maxsize`` to 0 disables
+    the cache."""
+
+    def __init__(self, name, maxsize=4096):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def lookup(self, key):
+        """Returns the cached entry for the ``key``, or ``None`` if there is
+        none."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key, res, refs):
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = (res, refs)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'maxsize': self.maxsize
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+getitem_cache = TypeCache('getitem')
+arith_cache = TypeCache('arith')
+
+
+def cache_key(obj, refs):
+    """Returns the hashable key for the type parameter or the operand ``obj``,
+    where the types are replaced by their ids and appended to ``refs``. Raises
+    TypeError if the ``obj`` cannot be used as a key."""
+
+    obj_type = type(obj)
+
+    if obj_type is int or obj_type is str:
+        return obj
+    elif isinstance(obj, type):
+        refs.append(obj)
+        return (type, id(obj))
+    elif obj_type is tuple:
+        return (tuple, ) + tuple([cache_key(o, refs) for o in obj])
+    elif isinstance(obj, dict):
+        return (dict, ) + tuple((k, cache_key(v, refs)) for k, v in obj.items())
+    elif obj_type is slice:
+        return (slice, cache_key(obj.start, refs), cache_key(obj.stop, refs),
+                cache_key(obj.step, refs))
+
+    hash(obj)
+    return (obj_type, obj)
+
+
+def cached_getitem(func):
+    """Caches the types created by indexing the generic types, i.e.
+    ``Uint[8]``."""
+
+    @functools.wraps(func)
+    def wrapper(self, params):
+        refs = [self]
+        try:
+            key = (id(self), cache_key(params, refs))
+        except TypeError:
+            return func(self, params)
+
+        entry = getitem_cache.lookup(key)
+        if entry is not None:
+            return entry[0]
+
+        res = func(self, params)
+        getitem_cache.store(key, res, refs)
+        return res
+
+    return wrapper
+
+
+def cached_type_arith(func):
+    """Caches the results of the type arithmetic operator ``func``, i.e. the
+    ``Uint[8] + Uint[9]``, keyed on the operator name and the operands."""
+
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwds):
+        if kwds:
+            return func(self, *args, **kwds)
+
+        refs = [self]
+        try:
+            key = (name, id(self), cache_key(args, refs))
+        except TypeError:
+            return func(self, *args)
+
+        entry = arith_cache.lookup(key)
+        if entry is not None:
+            return entry[0]
+
+        res = func(self, *args)
+        arith_cache.store(key, res, refs)
+        return res
+
+    return wrapper
+
+
+def type_cache_stats():
+    """Returns the hit and miss counts, and the sizes of the type caches, i.e.
+    ``{'getitem': {'hits': 10, 'misses': 2, 'size': 2, 'maxsize': 4096}, ...}``
+    """
+    return {c.name: c.stats for c in (getitem_cache, arith_cache)}
+
+
+def type_cache_clear():
+    for c in (getitem_cache, arith_cache):
+        c.clear()
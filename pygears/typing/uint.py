@@ -7,6 +7,7 @@ arithmetic capabilities.
 """
 
 from .base import class_and_instance_method
+from .type_cache import cached_type_arith
 from .base import typeof, EnumerableGenericMeta, is_type
 from .number import Number
 from .math import bitw
@@ -114,12 +115,14 @@ class IntegerType(IntegralType):
 
         return super().__new__(cls, name, bases, namespace, args=args)
 
+    @cached_type_arith
     def __abs__(self):
         if not self.signed:
             return self
 
         return Int[self.width + 1]
 
+    @cached_type_arith
     def __add__(self, other):
         if not typeof(other, Integer):
             return NotImplemented
@@ -132,6 +135,7 @@ class IntegerType(IntegralType):
 
         return res_type[max((w1, w2)) + 1]
 
+    @cached_type_arith
     def __and__(self, other):
         return self.base[max(op.width for op in (self, other))]
 
@@ -141,6 +145,7 @@ class IntegerType(IntegralType):
     def __float__(self):
         return float
 
+    @cached_type_arith
     def __floordiv__(self, other):
         return self.base[self.width - other.width + 1]
 
@@ -174,12 +179,14 @@ class IntegerType(IntegralType):
     def __lt__(self, other):
         return Bool
 
+    @cached_type_arith
     def __lshift__(self, other):
         return self.base[self.width + int(other)]
 
     def __mod__(self, other):
         return other
 
+    @cached_type_arith
     def __mul__(self, other):
         """Returns the same type, whose width is equal to the sum of operand widths
         if both operands are unsigned.
@@ -202,9 +209,11 @@ class IntegerType(IntegralType):
         else:
             return self.base[self.width + other.width]
 
+    @cached_type_arith
     def __neg__(self):
         return Int[self.width + 1]
 
+    @cached_type_arith
     def __or__(self, other):
         # return self.width | other.width
         return self.base[max(op.width for op in (self, other))]
@@ -222,6 +231,7 @@ class IntegerType(IntegralType):
 
     __rmul__ = __mul__
 
+    @cached_type_arith
     def __rshift__(self, other):
         shamt = int(other)
         width = len(self)
@@ -243,6 +253,7 @@ class IntegerType(IntegralType):
         else:
             return super().__str__()
 
+    @cached_type_arith
     def __sub__(self, other):
         if not typeof(other, Integer):
             return NotImplemented
@@ -254,9 +265,11 @@ class IntegerType(IntegralType):
 
         return Int[max((w1, w2)) + 1]
 
+    @cached_type_arith
     def __truediv__(self, other):
         return self.base[self.width - other.width + 1]
 
+    @cached_type_arith
     def __xor__(self, other):
         return self.base[max(op.width for op in (self, other))]
 
@@ -270,6 +283,13 @@ def check_width(val, width, type_):
         raise ValueError(f"{repr(type_)} cannot represent value '{val}'")
 
 
+# Trusted construction path for the values the library produces itself, i.e.
+# operator results and decoded values, whose width is correct by construction.
+# It skips all the conversions and checks of Integer.__new__(), which are kept
+# for the user supplied values.
+_trusted = int.__new__
+
+
 class Integer(Integral, metaclass=IntegerType):
     """Base type for both :class:`Int` and :class:`Uint` generic types.
     Corresponds to HDL logic vector types. For an example Integer[9] translates
@@ -344,17 +364,16 @@ class Integer(Integral, metaclass=IntegerType):
             return abs(type(self))(int(self))
 
     def __add__(self, other):
-        if is_type(type(other)) and not isinstance(other, Integer):
-            return NotImplemented
-
         if isinstance(other, Integer):
             conv_other = other
+        elif is_type(type(other)):
+            return NotImplemented
         elif isinstance(other, (int, float)):
             conv_other = Integer(other)
         else:
             return NotImplemented
 
-        return (type(self) + type(conv_other))(super().__add__(conv_other))
+        return _trusted(type(self) + type(conv_other), int.__add__(self, conv_other))
 
     def __eq__(self, other):
         if is_type(type(other)) and not isinstance(other, Integer):
@@ -390,7 +409,7 @@ class Integer(Integral, metaclass=IntegerType):
                 if stop <= start:
                     part = Unit()
                 else:
-                    part = Uint[stop - start]((int(self) & ((1 << stop) - 1)) >> start)
+                    part = _trusted(Uint[stop - start], (int(self) & ((1 << stop) - 1)) >> start)
 
             elif i < self.width:
                 part = Bool(int(self) & (1 << i))
@@ -449,7 +468,7 @@ class Integer(Integral, metaclass=IntegerType):
         return type(self)(super().__sub__(conv_other))
 
     def __lshift__(self, other):
-        return (type(self) << other)(super().__lshift__(other))
+        return _trusted(type(self) << other, int.__lshift__(self, other))
 
     def __len__(self):
         """Returns the number of bits used for the representation
@@ -460,15 +479,14 @@ class Integer(Integral, metaclass=IntegerType):
         return len(type(self))
 
     def __mul__(self, other):
-        if is_type(type(other)) and not isinstance(other, Integer):
-            return NotImplemented
-
         if isinstance(other, Integer):
             conv_other = other
+        elif is_type(type(other)):
+            return NotImplemented
         else:
             conv_other = Integer(other)
 
-        return (type(self) * type(conv_other))(super().__mul__(conv_other))
+        return _trusted(type(self) * type(conv_other), int.__mul__(self, conv_other))
 
     def __ne__(self, other):
         if not is_type(type(other)):
@@ -488,36 +506,34 @@ class Integer(Integral, metaclass=IntegerType):
         if typeof((type(self) >> other), Unit):
             return Unit()
 
-        return (type(self) >> other)(super().__rshift__(other))
+        return _trusted(type(self) >> other, int.__rshift__(self, other))
 
     def __rsub__(self, other):
-        if is_type(type(other)) and not isinstance(other, Integer):
-            return NotImplemented
-
-        if is_type(type(other)):
+        if isinstance(other, Integer):
             conv_other = other
+        elif is_type(type(other)):
+            return NotImplemented
         elif isinstance(other, (int, float)):
             conv_other = Integer(other)
         else:
             return NotImplemented
 
-        return (type(conv_other) - type(self))(super().__rsub__(conv_other))
+        return _trusted(type(conv_other) - type(self), int.__rsub__(self, conv_other))
 
     def __str__(self):
         return f'{str(type(self))}({int(self)})'
 
     def __sub__(self, other):
-        if is_type(type(other)) and not isinstance(other, Integer):
-            return NotImplemented
-
-        if is_type(type(other)):
+        if isinstance(other, Integer):
             conv_other = other
+        elif is_type(type(other)):
+            return NotImplemented
         elif isinstance(other, (int, float)):
             conv_other = Integer(other)
         else:
             return NotImplemented
 
-        return (type(self) - type(conv_other))(super().__sub__(conv_other))
+        return _trusted(type(self) - type(conv_other), int.__sub__(self, conv_other))
 
     @property
     def quant(self):
@@ -625,11 +641,12 @@ class Int(Integer, metaclass=IntType):
 
     @classmethod
     def decode(cls, val):
-        val = int(val & ((1 << cls.width) - 1))
-        if val >= (1 << (cls.width - 1)):
-            val -= 1 << cls.width
+        width = cls.width
+        val = int(val) & ((1 << width) - 1)
+        if val >= (1 << (width - 1)):
+            val -= 1 << width
 
-        return cls(val)
+        return _trusted(cls, val)
 
 
 class UintType(IntegerType):
@@ -656,6 +673,7 @@ class UintType(IntegerType):
     def specified(self):
         return IntegralType.specified.fget(self)
 
+    @cached_type_arith
     def __matmul__(self, other):
         if not typeof(other, (bool, Uint)):
             return NotImplemented
@@ -704,7 +722,7 @@ class Uint(Integer, metaclass=UintType):
 
     def __matmul__(self, other):
         if isinstance(other, bool):
-            return Uint[self.width + 1]((int(self) << 1) | int(other))
+            return _trusted(Uint[self.width + 1], (int(self) << 1) | int(other))
 
         if not is_type(type(other)):
             raise TypeError(
@@ -716,7 +734,7 @@ class Uint(Integer, metaclass=UintType):
         if not isinstance(other, Uint):
             other = Uint(other)
 
-        return Uint[self.width + other.width]((int(self) << other.width) | int(other))
+        return _trusted(Uint[self.width + other.width], (int(self) << other.width) | int(other))
 
     def __rmatmul__(self, other):
         if isinstance(other, bool):
@@ -727,6 +745,15 @@ class Uint(Integer, metaclass=UintType):
 
         return NotImplemented
 
+    @classmethod
+    def decode(cls, val):
+        val = int(val)
+        if not cls.specified or val >> cls.width:
+            # Constructor raises ValueError if the value does not fit
+            return cls(val)
+
+        return _trusted(cls, val)
+
 
 class BoolMeta(UintType):
     def __new__(cls, name, bases, namespace, args=None):
@@ -63,6 +63,7 @@ Uint[1](1)
 
 from .base import EnumerableGenericMeta, type_str, is_type
 from .base import class_and_instance_method, TemplatedTypeUnspecified
+from .codec import codec
 from .math import bitw
 from .unit import Unit
 from .uint import Uint
@@ -212,13 +213,7 @@ class Union(tuple, metaclass=UnionType):
     def code(self):
         """Returns a packed integer representation of the :class:`Union` instance.
         """
-        ret = 0
-
-        for d, t in zip(reversed(self), reversed(type(self))):
-            ret <<= t.width
-            ret |= d.code()
-
-        return ret
+        return codec(type(self)).code(self)
 
     @class_and_instance_method
     @property
@@ -240,18 +235,7 @@ class Union(tuple, metaclass=UnionType):
         """Returns a :class:`Union` instance from its packed integer representation.
         """
 
-        ret = []
-        val = int(val)
-        for t in cls:
-            t_width = t.width
-            t_mask = (1 << t_width) - 1
-            ret.append(val & t_mask)
-            val >>= t_width
-
-        data, ctrl = ret
-        subtype = cls.types[ctrl]
-
-        return cls((subtype.decode(data), cls[1].decode(ctrl)))
+        return codec(cls).decode(int(val))
 
 
 class classproperty(object):
@@ -0,0 +1,12 @@
+import os
+from pygears.entry import main
+
+
+def test_extern_design(tmpdir):
+    test_dir = os.path.dirname(__file__)
+
+    main(['pygears', 'hdl', os.path.join(test_dir, 'design.py'), '--top', '/qdeal', '-o',
+          str(tmpdir), '-j', '2'])
+
+    modules = {os.path.splitext(fn)[0] for fn in os.listdir(tmpdir)}
+    assert {'qdeal', 'qdeal_demux', 'qdeal_qdeal_impl'} <= modules
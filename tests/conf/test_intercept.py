@@ -1,5 +1,5 @@
 from pygears.conf.utils import intercept_arguments
-from pygears.conf.registry import inject, Inject
+from pygears.conf.registry import inject, Inject, MayInject
 
 
 @intercept_arguments
@@ -78,3 +78,28 @@ def get_from_reg(x=5, sim_lvl=Inject('logger/sim/level')):
 def test_registry():
     assert get_from_reg() == (5, 20)
     assert get_from_reg(1, 2) == (1, 2)
+    assert get_from_reg(sim_lvl=3) == (5, 3)
+    assert get_from_reg(1, Inject('logger/sim/level')) == (1, 20)
+
+
+@inject
+def may_get_from_reg(*args, a=MayInject('logger/sim/level'), b=MayInject('logger/unknown')):
+    return (args, a, b)
+
+
+def test_registry_may_inject():
+    assert may_get_from_reg(1, 2) == ((1, 2), 20, None)
+    assert may_get_from_reg(b=3) == ((), 20, 3)
+
+
+@inject
+def get_kwds_from_reg(x=Inject('logger/sim/level'), **kwds):
+    return (x, kwds)
+
+
+def test_registry_kwds():
+    assert get_kwds_from_reg() == (20, {})
+    assert get_kwds_from_reg(y=Inject('logger/sim/level'), z=MayInject('logger/unknown')) == (20, {
+        'y': 20,
+        'z': None
+    })
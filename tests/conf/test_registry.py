@@ -1,4 +1,6 @@
+import pytest
 from pygears import reg, clear
+from pygears.conf import reg_path
 from dataclasses import dataclass
 from typing import Any, Callable
 
@@ -59,3 +61,42 @@ def test_subreg():
 
     assert reg['a/b'] == 1
     assert reg['a/c/d'] == 2
+
+
+def test_path_handle():
+    clear()
+
+    reg['a/b/c'] = 1
+    reg['a/d'] = {'e': 2}
+    reg.confdef('a/f', default=3)
+
+    c = reg_path('a/b/c')
+    assert reg_path('a/b/c') is c
+    assert c.get() == 1
+
+    reg['a/b/c'] = 4
+    assert c.get() == 4
+
+    # Replacing the registry along the path
+    reg.subreg('a/b')
+    reg['a/b/c'] = 5
+    assert c.get() == 5
+
+    e = reg_path('a/d/e')
+    assert e.get() == 2
+    reg['a/d']['e'] = 6
+    assert e.get() == 6
+    reg['a/d'] = {'e': 7}
+    assert e.get() == 7
+
+    f = reg_path('a/f')
+    assert f.get() == 3
+    reg['a/f'] = 8
+    assert f.get() == 8
+
+    clear()
+    with pytest.raises(KeyError):
+        c.get()
+
+    reg['a/b/c'] = 9
+    assert c.get() == 9
@@ -155,6 +155,85 @@ def test_alternatives():
     assert len(root.child) == 5
 
 
+def test_alternatives_cache():
+    tried = []
+
+    @gear(enablement=b'trace(0, typeof(arg1, Queue) and arg1.lvl == 2)')
+    def fgear(arg1, *, lvl=2) -> b'arg1':
+        pass
+
+    @alternative(fgear)
+    @gear(enablement=b'trace(1, typeof(arg1, Queue) and arg1.lvl == 1)')
+    def fgear1(arg1, *, lvl=1) -> b'arg1':
+        pass
+
+    @alternative(fgear)
+    @gear(enablement=b'trace(2, typeof(arg1, Uint))')
+    def fgear0(arg1, *, lvl=0) -> b'arg1':
+        pass
+
+    def trace(i, res):
+        tried.append(i)
+        return res
+
+    reg['gear/type_arith']['trace'] = trace
+    reg['gear/memoize'] = False
+
+    Intf(Uint[1]) | fgear
+    assert tried == [0, 1, 2]
+
+    # Same argument types and parameters, dispatched directly
+    tried.clear()
+    Intf(Uint[1]) | fgear
+    assert tried == [2]
+
+    # Different parameters or argument types
+    tried.clear()
+    Intf(Uint[1]) | fgear(lvl=3)
+    Intf(Uint[2]) | fgear
+    assert tried == [0, 1, 2, 0, 1, 2]
+
+    tried.clear()
+    Intf(Queue[Uint[1], 1]) | fgear
+    Intf(Queue[Uint[1], 1]) | fgear
+    assert tried == [0, 1, 1]
+
+    root = reg['gear/root']
+    assert root['fgear1'].params['lvl'] == 0
+    assert root['fgear2'].params['lvl'] == 3
+    assert root['fgear5'].params['lvl'] == 1
+
+
+def test_alternatives_cache_err():
+    called = []
+
+    @gear(enablement=b'typeof(arg1, Queue)')
+    def fgear(arg1) -> b'arg1':
+        pass
+
+    @alternative(fgear)
+    @gear(enablement=b'typeof(arg1, Uint)')
+    def fgear0(arg1):
+        called.append(len(called))
+        if len(called) > 1:
+            raise ValueError('fgear0 failed')
+
+        return arg1
+
+    reg['gear/memoize'] = False
+
+    Intf(Uint[1]) | fgear
+
+    # Error of the cached alternative is not a type mismatch, so it is raised
+    # without retrying all the alternatives
+    with pytest.raises(ValueError) as excinfo:
+        Intf(Uint[1]) | fgear
+
+    assert called == [0, 1]
+    assert str(excinfo.value).count('fgear0 failed') == 1
+    assert len(reg['gear/root'].child) == 1
+
+
 def test_intf_name_inference():
     reg['gear/infer_signal_names'] = True
 
@@ -209,3 +288,12 @@ def test_varkw():
         assert kwds == {'c': 3}
 
     test(Intf(Uint[4]), b=2, c=3)
+
+
+def test_intf_events_lazy():
+    iin = Intf(Uint[1])
+    assert iin._events is None
+
+    events = iin.events
+    assert iin.events is events
+    assert all(not e for e in events.values())
@@ -205,3 +205,29 @@ def test_through_hier_cosim_out_channel():
     assert len(consumers) == 1
     assert consumers[0].name == '/si0.din'
     assert is_end_consumer(consumers[0])
+
+
+def test_index_invalidation():
+    @gear
+    def hier(din):
+        return din | leaf_pass
+
+    s = leaf_src(t=Unit)
+    h = s | hier
+    h | leaf_sink(name='si1')
+
+    intf = get_source_producer(s)
+    inner = find('/hier/leaf_pass.din').producer
+
+    assert [p.name for p in intf.end_consumers] == ['/hier/leaf_pass.din']
+
+    # Whole tree is indexed in a single pass
+    assert intf in reg['graph/consumer_tree']
+    assert inner in reg['graph/consumer_tree']
+    assert find('/hier.din') in reg['graph/end_producer']
+
+    s | leaf_sink(name='si2')
+
+    assert not reg['graph/consumer_tree']
+    assert [p.name for p in get_consumer_tree(intf)] == ['/hier/leaf_pass.din', '/si2.din']
+    assert [p.name for p in intf.end_consumers] == ['/hier/leaf_pass.din', '/si2.din']
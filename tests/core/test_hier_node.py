@@ -1,4 +1,6 @@
-from pygears.core.hier_node import NamedHierNode
+import sys
+
+from pygears.core.hier_node import HierVisitorBase, HierYielderBase, NamedHierNode
 
 
 def test_unique_renaming():
@@ -9,3 +11,44 @@ def test_unique_renaming():
 
     renames = [c.basename for c in root.child]
     assert renames == ['stem0', 'stem2', 'stem1', 'stem01', 'stem1_2']
+
+
+def test_visit_order_and_prune():
+    root = NamedHierNode('')
+    for n in ['a', 'b']:
+        parent = NamedHierNode(n, root)
+        for c in ['0', '1']:
+            NamedHierNode(f'{n}{c}', parent)
+
+    class Visitor(HierVisitorBase):
+        def __init__(self):
+            self.visited = []
+
+        def NamedHierNode(self, node):
+            self.visited.append(node.basename)
+            # Do not descend into 'b'
+            return node.basename == 'b'
+
+    v = Visitor()
+    v.visit(root)
+    assert v.visited == ['', 'a', 'a0', 'a1', 'b']
+
+    class Yielder(HierYielderBase):
+        def NamedHierNode(self, node):
+            yield node.basename
+
+    assert list(Yielder().visit(root)) == ['', 'a', 'a0', 'a1', 'b', 'b0', 'b1']
+
+
+def test_visit_deep_hierarchy():
+    depth = sys.getrecursionlimit() * 2
+
+    root = node = NamedHierNode('')
+    for i in range(depth):
+        node = NamedHierNode(f'n{i}', node)
+
+    class Yielder(HierYielderBase):
+        def NamedHierNode(self, node):
+            yield node
+
+    assert len(list(Yielder().visit(root))) == depth + 1
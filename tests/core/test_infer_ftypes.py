@@ -115,3 +115,22 @@ def test_complex():
 
     assert params['return'] == TProjection[Uint[16], Int[16], 3]
     assert params['din'] == TPointMaybeWord[Uint[16], Int[16], 3]
+
+
+def test_dependency_order():
+    # Templates are listed before the parameters they depend on
+    params = {
+        'din': Uint['T1'],
+        'w': b'half + 1',
+        'half': b'full // 2',
+        'full': b'T1 * 2',
+        'return': Uint['w']
+    }
+    args = {'din': Uint[4]}
+
+    params = infer_ftypes(params, args)
+
+    assert params['full'] == 8
+    assert params['half'] == 4
+    assert params['w'] == 5
+    assert params['return'] == Uint[5]
@@ -1,6 +1,6 @@
-from pygears import gear, find, reg
+from pygears import gear, find, reg, Intf
 from pygears.typing import Uint
-from pygears.lib import directed, drv
+from pygears.lib import directed, drv, dreg, collect
 from pygears.sim import sim, cosim
 from pygears.core.hier_node import HierYielderBase
 
@@ -74,3 +74,166 @@ def test_hier_level2(lang):
     cosim('/top', 'verilator', lang=lang)
 
     sim()
+
+
+stable_hash_script = """
+from pygears import gear, find
+from pygears.typing import Tuple, Uint
+from pygears.lib import drv
+from pygears.sim import cosim_build_dir
+
+class Opt:
+    def __init__(self, depth):
+        self.depth = depth
+
+@gear
+def test(a, b, *, f=None, cfg=None, opt=None):
+    return a
+
+test(drv(t=Uint[4], seq=[1]), drv(t=Tuple[{'x': Uint[2], 'y': Uint[3]}], seq=[(1, 2)]),
+     f=len, cfg={'depth': 4, 'name': 'buf', 'keys': (1, 'a')}, opt=Opt(4))
+
+print(cosim_build_dir(find('/test')))
+"""
+
+
+def test_stable_hash():
+    import subprocess
+    import sys
+    import os
+
+    build_dirs = set()
+    for seed in ['0', '1', 'random']:
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        res = subprocess.run([sys.executable, '-c', stable_hash_script],
+                             env=env,
+                             capture_output=True,
+                             check=True)
+        build_dirs.add(res.stdout.decode().strip().splitlines()[-1])
+
+    assert len(build_dirs) == 1
+
+
+def test_hash_script_file(tmpdir):
+    import subprocess
+    import sys
+    import os
+
+    build_dirs = set()
+    for name in ['a', 'b']:
+        fn = os.path.join(str(tmpdir), name, 'script.py')
+        os.makedirs(os.path.dirname(fn))
+        with open(fn, 'w') as f:
+            f.write(stable_hash_script)
+
+        res = subprocess.run([sys.executable, fn], capture_output=True, check=True)
+        build_dirs.add(res.stdout.decode().strip().splitlines()[-1])
+
+    # Same gears defined in different scripts
+    assert len(build_dirs) == 2
+
+
+class Opt:
+    def __init__(self, depth):
+        self.depth = depth
+        self.parent = self
+
+
+class SlotOpt:
+    __slots__ = ['depth']
+
+    def __init__(self, depth):
+        self.depth = depth
+
+
+def test_obj_param_hash():
+    from pygears.core.gear_memoize import gear_inst_hash
+
+    @gear
+    def test(a, *, opt):
+        return a
+
+    for opt in [Opt(4), Opt(4), Opt(8), SlotOpt(4)]:
+        test(Intf(Uint[4]), opt=opt)
+
+    digests = [gear_inst_hash(find(f'/test{i}')) for i in range(4)]
+
+    # Objects with the default __repr__ are hashed by their state
+    assert digests[0] is not None
+    assert digests[0] == digests[1]
+    assert digests[0] != digests[2]
+    assert digests[3] is None
+
+
+def test_clone():
+    reg['gear/memoize'] = True
+
+    @gear
+    def test(a, b):
+        return (a + b) | dreg
+
+    @gear
+    def top(a, b):
+        return test(a, b), test(a, b)
+
+    top(Intf(Uint[4]), Intf(Uint[4]))
+
+    assert check_memoized('/top/test1')
+
+    orig, cp = find('/top/test0'), find('/top/test1')
+    assert cp.params['memoized'] is orig
+    assert [c.basename for c in cp.child] == [c.basename for c in orig.child]
+    assert all(c.parent is cp for c in cp.child)
+    assert cp.trace is not orig.trace
+
+    for c, c_orig in zip(cp.child, orig.child):
+        assert c.params['memoized'] is c_orig
+        assert c.params['sigmap'] is not c_orig.params['sigmap']
+        assert [p.dtype for p in c.in_ports] == [p.dtype for p in c_orig.in_ports]
+        assert [p.dtype for p in c.out_ports] == [p.dtype for p in c_orig.out_ports]
+
+    assert cp.in_ports[0].consumer.consumers[0].gear is cp.child[0]
+    assert cp.out_ports[0].producer.producer.gear is cp.child[-1]
+
+
+def test_sim_memoized():
+    # Memoization is on by default
+    @gear
+    async def addk(din, *, k) -> Uint[8]:
+        async with din as d:
+            yield d + k
+
+    res0, res1 = [], []
+    drv(t=Uint[8], seq=[1, 2]) | addk(k=10) | collect(result=res0)
+    drv(t=Uint[8], seq=[1, 2]) | addk(k=10) | collect(result=res1)
+
+    assert check_memoized('/addk1')
+    assert not check_memoized('/collect1')
+
+    sim()
+
+    assert res0 == [11, 12]
+    assert res1 == [11, 12]
+
+
+def test_closure():
+    reg['gear/memoize'] = True
+
+    def make(k):
+        @gear
+        async def addc(din) -> Uint[8]:
+            async with din as d:
+                yield d + k
+
+        return addc
+
+    res0, res1 = [], []
+    drv(t=Uint[8], seq=[1, 2]) | make(10)() | collect(result=res0)
+    drv(t=Uint[8], seq=[1, 2]) | make(100)() | collect(result=res1)
+
+    assert not check_memoized('/addc1')
+
+    sim()
+
+    assert res0 == [11, 12]
+    assert res1 == [101, 102]
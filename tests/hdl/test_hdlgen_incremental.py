@@ -0,0 +1,75 @@
+import os
+
+import pygears.lib
+from pygears import Intf, clear, find, gear, reg
+from pygears.hdl import hdlgen, hdlmod
+from pygears.hdl.sv.resolvers import hls
+from pygears.typing import Uint, code
+
+
+@gear
+async def incr(din: Uint['w'], *, step=1) -> Uint['w']:
+    async with din as d:
+        yield (d + step)[:din.dtype.width]
+
+
+@gear
+def incr_chain(din, *, steps):
+    for s in steps:
+        din = din | incr(step=s)
+
+    return din
+
+
+def generate(outdir, steps):
+    clear()
+    reg['hls/cache_dir'] = None
+
+    incr_chain(Intf(Uint[8]), steps=steps)
+    hdlgen('/incr_chain', outdir=outdir, incremental=True)
+
+    return {fn: os.stat(os.path.join(outdir, fn)).st_mtime_ns for fn in os.listdir(outdir)}
+
+
+def test_unchanged(tmpdir, monkeypatch):
+    first = generate(tmpdir, steps=(1, 2))
+
+    assert sorted(os.path.basename(fn) for fn in reg['hdlgen/changed']) == [
+        'incr_chain.sv', 'incr_chain_incr0.sv', 'incr_chain_incr1.sv', 'incr_chain_wrap.sv'
+    ]
+
+    def compile_gear(*args, **kwds):
+        raise Exception('Unchanged module should not have been generated')
+
+    monkeypatch.setattr(hls, 'compile_gear', compile_gear)
+
+    second = generate(tmpdir, steps=(1, 2))
+
+    assert reg['hdlgen/changed'] == []
+    assert second == first
+
+
+def test_changed(tmpdir):
+    first = generate(tmpdir, steps=(1, 2))
+    second = generate(tmpdir, steps=(1, 3))
+
+    assert reg['hdlgen/changed'] == [os.path.join(tmpdir, 'incr_chain_incr1.sv')]
+    assert {fn for fn in first if first[fn] != second[fn]} == {
+        'incr_chain_incr1.sv', '.pygears_hdlgen.json'
+    }
+
+
+@gear
+async def muxed(*din: Uint[4]) -> b'din[0]':
+    # Gear reached through the module attribute
+    async with pygears.lib.mux(0, *din) as d:
+        yield code(d[0], Uint[4])
+
+
+def test_submodules(tmpdir):
+    for _ in range(2):
+        clear()
+        muxed(Intf(Uint[4]), Intf(Uint[4]))
+        hdlgen('/muxed', outdir=tmpdir, incremental=True)
+
+        assert hdlmod(find('/muxed')).files == ['muxed.sv', 'muxed_mux.sv']
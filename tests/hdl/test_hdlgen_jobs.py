@@ -0,0 +1,57 @@
+import os
+
+from pygears import Intf, clear, gear, reg
+from pygears.hdl import hdlgen
+from pygears.hdl.sv.resolvers import hls
+from pygears.typing import Uint
+
+
+@gear
+async def incr(din: Uint['w'], *, step=1) -> Uint['w']:
+    async with din as d:
+        yield (d + step)[:din.dtype.width]
+
+
+@gear
+def incr_chain(din, *, num):
+    for i in range(num):
+        din = din | incr(step=i)
+
+    return din
+
+
+def generate(outdir, jobs):
+    clear()
+    reg['hls/cache_dir'] = None
+
+    incr_chain(Intf(Uint[8]), num=4)
+    hdlgen('/incr_chain', outdir=outdir, jobs=jobs)
+
+    files = {}
+    for fn in sorted(os.listdir(outdir)):
+        with open(os.path.join(outdir, fn)) as f:
+            files[fn] = f.read()
+
+    return files
+
+
+def test_jobs(tmpdir, monkeypatch):
+    # Translations done by the pool workers are not recorded in this process
+    translated = []
+    compile_gear_body = hls.compile_gear_body
+
+    def compile_gear_body_rec(node, *args, **kwds):
+        translated.append(node.name)
+        return compile_gear_body(node, *args, **kwds)
+
+    monkeypatch.setattr(hls, 'compile_gear_body', compile_gear_body_rec)
+
+    serial = generate(os.path.join(tmpdir, 'serial'), jobs=1)
+    assert len(translated) == 4
+
+    translated.clear()
+    parallel = generate(os.path.join(tmpdir, 'parallel'), jobs=2)
+    assert translated == []
+
+    assert 'incr_chain_incr3.sv' in serial
+    assert parallel == serial
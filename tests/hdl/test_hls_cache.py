@@ -0,0 +1,107 @@
+import os
+
+import pygears.lib
+from pygears import Intf, clear, find, gear, reg
+from pygears.hdl import hdlgen, hdlmod
+from pygears.hdl.sv.resolvers import hls
+from pygears.typing import Uint, code
+
+
+@gear
+async def incr(din: Uint['w'], *, step=1) -> Uint['w']:
+    async with din as d:
+        yield (d + step)[:din.dtype.width]
+
+
+@gear
+def incr_chain(din, *, step=1):
+    return din | incr(step=step) | incr(step=step)
+
+
+def test_dedup(tmpdir):
+    # Persistent cache is opt-in
+    assert reg['hls/cache_dir'] is None
+    reg['gear/memoize'] = False
+
+    incr_chain(Intf(Uint[8]), name='c0')
+    incr_chain(Intf(Uint[8]), name='c1')
+    incr_chain(Intf(Uint[8]), step=2, name='c2')
+    incr_chain(Intf(Uint[4]), name='c3')
+
+    hdlgen('/', outdir=tmpdir)
+
+    modnames = {
+        g: hdlmod(find(g)).module_name
+        for g in ['/c0/incr0', '/c0/incr1', '/c1/incr0', '/c2/incr0', '/c3/incr0']
+    }
+
+    assert modnames == {
+        '/c0/incr0': 'c0_incr0',
+        '/c0/incr1': 'c0_incr0',
+        '/c1/incr0': 'c0_incr0',
+        '/c2/incr0': 'c2_incr0',
+        '/c3/incr0': 'c3_incr0',
+    }
+
+    hdl_files = {fn for fn in os.listdir(tmpdir) if fn.endswith('_incr0.sv')}
+    assert hdl_files == {'c0_incr0.sv', 'c2_incr0.sv', 'c3_incr0.sv'}
+
+
+def test_disk_cache(tmpdir, monkeypatch):
+    reg['hls/cache_dir'] = os.path.join(tmpdir, 'cache')
+
+    incr_chain(Intf(Uint[8]))
+    hdlgen('/incr_chain', outdir=os.path.join(tmpdir, 'first'))
+
+    assert len(os.listdir(reg['hls/cache_dir'])) == 1
+
+    with open(os.path.join(tmpdir, 'first', 'incr_chain_incr0.sv')) as f:
+        first = f.read()
+
+    def compile_gear_body(*args, **kwds):
+        raise Exception('Translation should have been fetched from the cache')
+
+    monkeypatch.setattr(hls, 'compile_gear_body', compile_gear_body)
+
+    clear()
+    reg['hls/cache_dir'] = os.path.join(tmpdir, 'cache')
+
+    incr_chain(Intf(Uint[8]))
+    hdlgen('/incr_chain', outdir=os.path.join(tmpdir, 'second'))
+
+    with open(os.path.join(tmpdir, 'second', 'incr_chain_incr0.sv')) as f:
+        assert f.read() == first
+
+
+def test_dedup_per_run(tmpdir):
+    reg['gear/memoize'] = False
+
+    incr_chain(Intf(Uint[8]), name='c0')
+    incr_chain(Intf(Uint[8]), name='c1')
+
+    hdlgen('/c0', outdir=os.path.join(tmpdir, 'c0'))
+    hdlgen('/c1', outdir=os.path.join(tmpdir, 'c1'))
+
+    assert hdlmod(find('/c1/incr0')).module_name == 'c1_incr0'
+    assert hdlmod(find('/c1/incr1')).module_name == 'c1_incr0'
+
+
+@gear
+async def muxed(*din: Uint[4]) -> b'din[0]':
+    async with pygears.lib.mux(0, *din) as d:
+        yield code(d[0], Uint[4])
+
+
+def test_dedup_submodules(tmpdir):
+    reg['gear/memoize'] = False
+
+    muxed(Intf(Uint[4]), Intf(Uint[4]), name='m0')
+    muxed(Intf(Uint[4]), Intf(Uint[4]), name='m1')
+
+    hdlgen('/', outdir=tmpdir)
+
+    # Each instance has its own mux submodule, so the modules are not shared
+    assert hls.translation_digest(find('/m0'), 'sv') is None
+    assert hdlmod(find('/m0')).module_name == 'm0'
+    assert hdlmod(find('/m1')).module_name == 'm1'
+    assert {'m0_mux.sv', 'm1_mux.sv'} <= set(os.listdir(tmpdir))
@@ -0,0 +1,60 @@
+import os
+
+from pygears import reg
+from pygears.hdl.sv import SVTemplateEnv
+from pygears.hdl.templenv import TemplateEnv
+
+
+def test_render_string(tmpdir):
+    reg['hdl/template_cache_dir'] = str(tmpdir)
+
+    env = SVTemplateEnv()
+    string = "{%- import 'snippet.j2' as snippet -%}{{ name }}"
+
+    assert env.render_string(string, {'name': 'first'}) == 'first'
+    template = env.strings[string]
+
+    assert env.render_string(string, {'name': 'second'}) == 'second'
+    assert env.strings[string] is template
+
+    assert os.listdir(tmpdir)
+
+
+def test_template_dirs(tmpdir):
+    reg['hdl/template_cache_dir'] = None
+
+    basedir = os.path.join(tmpdir, 'base')
+    for d, fn, content in [
+        (basedir, 'snippet.j2', "{% macro name() %}base{% endmacro %}"),
+        (tmpdir, 'snippet.j2', "{% macro name() %}local{% endmacro %}"),
+        (tmpdir, 'helper.j2', "{% macro name() %}helper{% endmacro %}"),
+        (tmpdir, 'module.j2', "{%- import 'snippet.j2' as snippet -%}"
+         "{%- import 'helper.j2' as helper -%}"
+         "{{ snippet.name() }} {{ helper.name() }}"),
+    ]:
+        os.makedirs(d, exist_ok=True)
+        with open(os.path.join(d, fn), 'w') as f:
+            f.write(content)
+
+    env = TemplateEnv(basedir)
+
+    assert env.render(tmpdir, 'module.j2', {}) == 'base helper'
+    assert env.load(tmpdir, 'snippet.j2').module.name() == 'base'
+
+
+def test_template_edited(tmpdir):
+    fn = os.path.join(tmpdir, 'module.j2')
+    with open(fn, 'w') as f:
+        f.write('first')
+
+    env = SVTemplateEnv.shared()
+    assert env.render(tmpdir, 'module.j2', {}) == 'first'
+
+    with open(fn, 'w') as f:
+        f.write('second')
+
+    # Make sure the modification time changes on the coarse filesystems
+    st = os.stat(fn)
+    os.utime(fn, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+
+    assert env.render(tmpdir, 'module.j2', {}) == 'second'
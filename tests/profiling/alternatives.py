@@ -0,0 +1,34 @@
+import timeit
+
+from pygears import Intf, clear, reg
+from pygears.typing import Queue, Tuple, Uint
+from pygears.lib import dreg, fmap
+
+
+def elaborate():
+    # fmap tries its alternatives in turn until the one for the Tuple succeeds
+    Intf(Tuple[Uint[8], Uint[4]]) | fmap(f=(dreg, None))
+    Intf(Queue[Tuple[Uint[8], Uint[4]]]) | fmap(f=fmap(f=(None, dreg)))
+
+
+def bench(number, cached):
+    clear()
+    reg['gear/memoize'] = False
+
+    def run():
+        if not cached:
+            reg['gear/alternatives_cache'].clear()
+
+        elaborate()
+
+    return timeit.timeit(run, number=number)
+
+
+if __name__ == '__main__':
+    number = 200
+    uncached = bench(number, cached=False) / number * 1e6
+    cached = bench(number, cached=True) / number * 1e6
+
+    print(f'uncached: {uncached:.1f} us')
+    print(f'cached: {cached:.1f} us')
+    print(f'speedup: {uncached / cached:.1f}x')
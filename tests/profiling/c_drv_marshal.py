@@ -0,0 +1,67 @@
+import random
+import timeit
+from math import ceil
+from types import SimpleNamespace
+
+from pygears.typing import Uint
+from pygears.sim.c_drv import CInputDrv, COutputDrv
+
+
+class VerilibMock:
+    '''Stands in for the Verilator library, providing no-op port handlers'''
+
+    def __getattr__(self, name):
+        def api(*args):
+            return 1
+
+        setattr(self, name, api)
+        return api
+
+
+def to_c_data_ref(c_dtype, width, data):
+    def dgen(data):
+        for i in range(ceil(width / 32)):
+            yield data & 0xffffffff
+            data >>= 32
+
+    return c_dtype(*list(dgen(data)))
+
+
+def from_c_data_ref(data):
+    dout = 0
+    for d in reversed(list(data)):
+        dout <<= 32
+        dout |= d
+
+    return dout
+
+
+def bench(width, number=20000):
+    port = SimpleNamespace(dtype=Uint[width], basename='din')
+    din = CInputDrv(VerilibMock(), port)
+    dout = COutputDrv(VerilibMock(), port)
+
+    val = random.getrandbits(width)
+    dout.dout_view[:] = val.to_bytes(len(dout.dout_view), 'little')
+    assert dout.from_c_data(dout.dout) == val
+
+    res = {
+        'to_c': timeit.timeit(lambda: din.to_c_data(val), number=number),
+        'from_c': timeit.timeit(lambda: dout.from_c_data(dout.dout), number=number),
+    }
+
+    if width > 64:
+        res['to_c_ref'] = timeit.timeit(lambda: to_c_data_ref(din.c_dtype, width, val),
+                                        number=number)
+        res['from_c_ref'] = timeit.timeit(lambda: from_c_data_ref(dout.dout), number=number)
+
+    return res
+
+
+if __name__ == '__main__':
+    number = 20000
+    print(f'{"width":>6} {"to_c [us]":>10} {"ref":>10} {"from_c [us]":>12} {"ref":>10}')
+    for width in [8, 32, 64, 128, 256, 512, 1024, 2048, 4096]:
+        res = {k: v / number * 1e6 for k, v in bench(width, number).items()}
+        print(f'{width:>6} {res["to_c"]:>10.2f} {res.get("to_c_ref", float("nan")):>10.2f}'
+              f' {res["from_c"]:>12.2f} {res.get("from_c_ref", float("nan")):>10.2f}')
@@ -0,0 +1,78 @@
+import gc
+import time
+import tracemalloc
+
+from pygears import Intf, clear, gear, reg
+from pygears.typing import Uint
+from pygears.core.hier_node import HierYielderBase
+
+
+@gear
+async def stage(din: Uint['w']) -> Uint['w']:
+    pass
+
+
+@gear
+def chain(din, *, depth):
+    for _ in range(depth):
+        din = din | stage
+
+    return din
+
+
+class GearIntfCounter(HierYielderBase):
+    def Gear(self, node):
+        yield node
+
+
+def intf_size(number=10000):
+    '''Returns the number of bytes allocated per standalone interface'''
+
+    tracemalloc.start()
+    intfs = [Intf(Uint[8]) for _ in range(number)]
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del intfs
+    return mem / number
+
+
+def elaborate(width, depth):
+    '''Builds ``width`` parallel chains of ``depth`` stages, returning the
+    elaboration time, the memory allocated for the design and the number of
+    gears and interfaces in it'''
+
+    clear()
+    reg['gear/memoize'] = False
+    gc.collect()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    for _ in range(width):
+        Intf(Uint[8]) | chain(depth=depth)
+
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    gears = list(GearIntfCounter().visit(reg['gear/root']))
+    intfs = {p.consumer for g in gears for p in g.in_ports + g.out_ports}
+
+    return elapsed, mem, len(gears), len(intfs)
+
+
+if __name__ == '__main__':
+    per_intf = intf_size()
+
+    print(f'{"gears":>8} {"intfs":>8} {"time [s]":>9} {"memory [MiB]":>13}'
+          f' {"bytes/gear":>11} {"bytes/intf":>11}')
+
+    for width, depth in ((10, 100), (100, 100), (2000, 20)):
+        elapsed, mem, gears, intfs = elaborate(width, depth)
+        # Gears are charged with everything but the interfaces, i.e. with
+        # their ports and parameters
+        per_gear = (mem - intfs * per_intf) / gears
+        print(f'{gears:>8} {intfs:>8} {elapsed:>9.2f} {mem / 2**20:>13.1f}'
+              f' {per_gear:>11.0f} {per_intf:>11.0f}')
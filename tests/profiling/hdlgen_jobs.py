@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import time
+
+from pygears import Intf, clear, gear, reg
+from pygears.hdl import hdlgen
+from pygears.typing import Uint
+
+
+@gear
+async def accum(din: Uint['w'], *, step) -> Uint['w']:
+    acc = din.dtype(0)
+    while True:
+        async with din as d:
+            if d > step:
+                acc = (acc + d - step)[:din.dtype.width]
+            else:
+                acc = (acc + step)[:din.dtype.width]
+
+            yield acc
+
+
+@gear
+def pipeline(din, *, depth):
+    for i in range(depth):
+        din = din | accum(step=i)
+
+    return din
+
+
+def generate(outdir, width, depth, jobs):
+    '''Generates ``width`` pipelines of ``depth`` distinct HLS modules, with the
+    translation cache disabled, returning the generation time'''
+
+    clear()
+    reg['hls/cache_dir'] = None
+    reg['hls/dedup'] = False
+    reg['gear/memoize'] = False
+
+    for _ in range(width):
+        Intf(Uint[16]) | pipeline(depth=depth)
+
+    start = time.perf_counter()
+    hdlgen('/', outdir=outdir, jobs=jobs)
+    return time.perf_counter() - start
+
+
+def read_files(outdir):
+    files = {}
+    for fn in os.listdir(outdir):
+        with open(os.path.join(outdir, fn)) as f:
+            files[fn] = f.read()
+
+    return files
+
+
+if __name__ == '__main__':
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+
+    print(f'{"modules":>8} {"serial [s]":>11} {f"jobs={jobs} [s]":>12} {"speedup":>8}')
+
+    for width, depth in ((1, 16), (4, 16), (8, 32)):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            serial = generate(os.path.join(tmpdir, 'serial'), width, depth, 1)
+            parallel = generate(os.path.join(tmpdir, 'parallel'), width, depth, jobs)
+
+            assert read_files(os.path.join(tmpdir, 'serial')) == read_files(
+                os.path.join(tmpdir, 'parallel'))
+
+        print(f'{width * depth:>8} {serial:>11.2f} {parallel:>12.2f} {serial / parallel:>8.2f}')
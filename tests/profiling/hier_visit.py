@@ -0,0 +1,75 @@
+import inspect
+import timeit
+
+from pygears import Intf, clear, gear, reg
+from pygears.typing import Uint
+from pygears.sim.sim import GearEnum
+
+
+@gear
+async def stage(din: Uint['w']) -> Uint['w']:
+    pass
+
+
+@gear
+def chain(din, *, depth):
+    for _ in range(depth):
+        din = din | stage
+
+    return din
+
+
+@gear
+def tree(din, *, width, depth):
+    if depth == 0:
+        return din | chain(depth=width)
+
+    return din | tree(width=width, depth=depth - 1) | tree(width=width, depth=depth - 1)
+
+
+class RecursiveGearEnum:
+    '''GearEnum with the recursive traversal and the MRO probing on each node,
+    as done before the dispatch tables were introduced'''
+
+    def __init__(self):
+        self.gears = []
+
+    def visit(self, node):
+        for base_class in inspect.getmro(node.__class__):
+            if hasattr(self, base_class.__name__):
+                if getattr(self, base_class.__name__)(node):
+                    return
+
+    def HierNode(self, node):
+        if hasattr(node, "child"):
+            for c in list(node.child):
+                self.visit(c)
+
+    def Gear(self, node):
+        if not node.hierarchical:
+            self.gears.append(node)
+
+
+def bench(visitor_cls, number):
+    def run():
+        v = visitor_cls()
+        v.visit(reg['gear/root'])
+        return v.gears
+
+    return timeit.timeit(run, number=number) / number, len(run())
+
+
+if __name__ == '__main__':
+    number = 20
+
+    print(f'{"gears":>8} {"recursive [ms]":>15} {"iterative [ms]":>15} {"speedup":>8}')
+    for width, depth in ((10, 4), (10, 7), (20, 9)):
+        clear()
+        reg['gear/memoize'] = False
+        Intf(Uint[8]) | tree(width=width, depth=depth)
+
+        recursive, gears = bench(RecursiveGearEnum, number)
+        iterative, _ = bench(GearEnum, number)
+
+        print(f'{gears:>8} {recursive * 1e3:>15.2f} {iterative * 1e3:>15.2f}'
+              f' {recursive / iterative:>8.1f}')
@@ -0,0 +1,44 @@
+import tempfile
+import time
+
+from pygears import Intf, clear, gear, reg
+from pygears.hdl import hdlgen
+from pygears.lib import qround, saturate
+from pygears.typing import Fixp
+
+
+@gear
+def pipeline(din):
+    return din | qround(fract=4) | saturate(t=Fixp[6, 10])
+
+
+def generate(n, dedup, cache_dir):
+    '''Generates HDL for N identical sub-pipelines, returning the generation
+    time'''
+
+    clear()
+    reg['gear/memoize'] = False
+    reg['hls/dedup'] = dedup
+    reg['hls/cache_dir'] = cache_dir
+
+    for _ in range(n):
+        pipeline(Intf(Fixp[8, 20]))
+
+    start = time.perf_counter()
+    hdlgen('/', outdir=tempfile.mkdtemp())
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    print(f'{"N":>6} {"uncached [s]":>13} {"dedup [s]":>10} {"disk cold [s]":>14}'
+          f' {"disk warm [s]":>14}')
+
+    for n in (10, 50, 200):
+        cache_dir = tempfile.mkdtemp()
+
+        uncached = generate(n, dedup=False, cache_dir=None)
+        dedup = generate(n, dedup=True, cache_dir=None)
+        cold = generate(n, dedup=True, cache_dir=cache_dir)
+        warm = generate(n, dedup=True, cache_dir=cache_dir)
+
+        print(f'{n:>6} {uncached:>13.2f} {dedup:>10.2f} {cold:>14.2f} {warm:>14.2f}')
@@ -0,0 +1,158 @@
+import functools
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+# Translations cached on disk by the previous runs would skip the analysis
+os.environ['XDG_CACHE_HOME'] = tempfile.mkdtemp()
+
+from pygears import Intf, clear, find, gear, reg
+from pygears.hls import cfg, ir
+from pygears.hls.translate import translate_gear
+from pygears.typing import Array, Bool, Uint
+
+
+class RecursiveReachingDefinitions:
+    '''Reaching definitions over the frozensets of (name, node) pairs, with the
+    successors re-visited recursively on each change, as done before the
+    worklist solver was introduced'''
+
+    def __init__(self):
+        self.reaching = {}
+
+    def gen(self, node, incoming):
+        if isinstance(node.value, ir.Await) and isinstance(node.value.expr, ir.Component):
+            intf_name = node.value.expr.val.name
+            gen = frozenset()
+            kill = frozenset(def_ for def_ in incoming if def_[0] == f'{intf_name}.data')
+        else:
+            definitions = cfg.get_updated(node.value)
+            gen = frozenset((id_, node) for id_ in definitions)
+            kill = frozenset(def_ for def_ in incoming if def_[0] in definitions)
+
+        return gen, kill
+
+    def visit(self, node):
+        if node not in self.reaching:
+            self.reaching[node] = {}
+
+        reaching = self.reaching[node]
+
+        if node.value:
+            if 'out' in reaching:
+                before = hash(reaching['out'])
+            else:
+                before = None
+
+            preds = [
+                self.reaching[pred]['out'] for pred in node.prev
+                if 'out' in self.reaching.get(pred, {})
+            ]
+            if preds:
+                incoming = functools.reduce(frozenset.union, preds[1:], preds[0])
+            else:
+                incoming = frozenset()
+
+            reaching['in'] = incoming
+            gen, kill = self.gen(node, incoming)
+            reaching['gen'] = gen
+            reaching['kill'] = kill
+            reaching['out'] = (incoming - kill) | gen
+
+            if hash(reaching['out']) != before:
+                for succ in node.next:
+                    self.visit(succ)
+
+
+class DataflowTimer:
+    '''Times both solvers on each CFG analysed while translating the gears,
+    and checks that they agree'''
+
+    def __init__(self):
+        self.cfgs = 0
+        self.nodes = 0
+        self.recursive = 0
+        self.worklist = 0
+        self.failed = 0
+        self.mismatched = 0
+
+    def timed(self, analysis, entry):
+        start = time.perf_counter()
+        try:
+            analysis.visit(entry)
+        except RecursionError:
+            return None
+
+        return time.perf_counter() - start
+
+    def forward(self, node, analysis):
+        node, entry, reaching = forward(node, analysis)
+
+        if not isinstance(analysis, cfg.ReachingDefinitions):
+            return node, entry, reaching
+
+        # Both solvers are run on the same CFG so that the results can be
+        # compared node by node
+        cfg_entry = cfg.CFG.build_cfg(node).entry
+        recursive = RecursiveReachingDefinitions()
+        recursive_time = self.timed(recursive, cfg_entry)
+        worklist = cfg.ReachingDefinitions()
+        worklist_time = self.timed(worklist, cfg_entry)
+
+        self.cfgs += 1
+        self.nodes += len(reaching)
+        self.worklist += worklist_time
+        if recursive_time is None:
+            self.failed += 1
+            return node, entry, reaching
+
+        self.recursive += recursive_time
+        if any(dict(worklist.reaching[n]) != r for n, r in recursive.reaching.items()):
+            self.mismatched += 1
+
+        return node, entry, reaching
+
+
+    def report(self):
+        print(f'CFGs analysed: {self.cfgs}, nodes: {self.nodes}')
+        print(f'recursive: {self.recursive * 1e3:.1f} ms'
+              f' ({self.failed} CFGs exceeded the recursion limit)')
+        print(f'worklist: {self.worklist * 1e3:.1f} ms'
+              f' ({self.mismatched} CFGs with different results)')
+
+
+@gear
+async def unrolled(din: Array[Uint[8], 'n']) -> Bool:
+    async with din as d:
+        found = False
+        for i in range(len(d)):
+            if d[i] > 4:
+                found = True
+
+        yield found
+
+
+forward = cfg.forward
+
+if __name__ == '__main__':
+    timer = DataflowTimer()
+    cfg.forward = timer.forward
+
+    print('HLS tests:')
+    tests_dir = os.path.join(os.path.dirname(__file__), '..', 'hls')
+    pytest.main(['-q', '-p', 'no:cacheprovider', tests_dir] + sys.argv[1:])
+    timer.report()
+
+    for n in (16, 32, 64, 128):
+        print(f'\nUnrolled loop with {n} iterations:')
+        clear()
+        reg['gear/memoize'] = False
+        unrolled(Intf(Array[Uint[8], n]))
+
+        timer = DataflowTimer()
+        cfg.forward = timer.forward
+        translate_gear(find('/unrolled'))
+        timer.report()
@@ -0,0 +1,41 @@
+import timeit
+
+from pygears import Intf, clear, gear
+from pygears.typing import Int, Queue, Tuple, Uint
+from pygears.core.infer_ftypes import infer_ftypes
+
+
+@gear
+async def templated(din: Tuple['T1', 'T2'],
+                    *,
+                    w=b'w1 + w2',
+                    w1=b'T1.width',
+                    w2=b'T2.width',
+                    half=b'w // 2') -> Queue[Uint['half'], 2]:
+    pass
+
+
+def bench_infer(number):
+    # Templates are listed before the parameters they depend on
+    params = {
+        'din': Tuple['T1', 'T2'],
+        'half': b'w // 2',
+        'w': b'w1 + w2',
+        'w1': b'T1.width',
+        'w2': b'T2.width',
+        'return': Queue[Uint['half'], 2]
+    }
+
+    return timeit.timeit(lambda: infer_ftypes(dict(params), {'din': Tuple[Uint[8], Int[4]]}),
+                         number=number)
+
+
+def bench_elab(number):
+    clear()
+    return timeit.timeit(lambda: templated(Intf(Tuple[Uint[8], Int[4]])), number=number)
+
+
+if __name__ == '__main__':
+    number = 2000
+    print(f'infer_ftypes: {bench_infer(number) / number * 1e6:.1f} us')
+    print(f'gear instance: {bench_elab(number // 4) / (number // 4) * 1e6:.1f} us')
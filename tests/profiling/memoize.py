@@ -0,0 +1,40 @@
+import time
+import tracemalloc
+
+from pygears import Intf, clear, gear, reg
+from pygears.typing import Fixp
+from pygears.lib import dreg, qround, saturate
+
+
+@gear
+def pipeline(din):
+    return din | qround(fract=4) | saturate(t=Fixp[6, 10]) | dreg | dreg
+
+
+def elaborate(n, memoize):
+    '''Elaborates N identical sub-pipelines, returning the elaboration time and
+    the memory allocated for the design'''
+
+    clear()
+    reg['gear/memoize'] = memoize
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    for _ in range(n):
+        pipeline(Intf(Fixp[8, 20]))
+
+    elapsed = time.perf_counter() - start
+    mem, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, mem
+
+
+if __name__ == '__main__':
+    print(f'{"N":>6} {"memoize":>8} {"time [ms]":>10} {"per inst [us]":>14} {"memory [KiB]":>13}')
+    for n in (10, 100, 1000):
+        for memoize in (False, True):
+            elapsed, mem = elaborate(n, memoize)
+            print(f'{n:>6} {str(memoize):>8} {elapsed * 1e3:>10.1f} {elapsed / n * 1e6:>14.1f}'
+                  f' {mem / 1024:>13.1f}')
@@ -0,0 +1,45 @@
+import timeit
+
+from pygears import reg
+from pygears.conf import Inject, inject, reg_path
+from pygears.conf.registry import Registry, get_args_from_registry
+from pygears.conf.utils import intercept_arguments
+
+
+def func(a, b=2, root=Inject('gear/root'), extra=Inject('gear/params/extra')):
+    return root, extra
+
+
+def bench_lookup(path, number):
+    handle = reg_path(path)
+    return {
+        'partition': timeit.timeit(lambda: Registry._getitem(reg, path), number=number),
+        'reg[]': timeit.timeit(lambda: reg[path], number=number),
+        'handle': timeit.timeit(handle.get, number=number),
+    }
+
+
+def bench_inject(number):
+    # Resolution of the injected arguments on each call, as done before the
+    # paths were bound at the decoration time
+    intercepted = intercept_arguments(func,
+                                      cb_named=get_args_from_registry,
+                                      cb_kwds=get_args_from_registry)
+    injected = inject(func)
+
+    return {
+        'intercept': timeit.timeit(lambda: intercepted(1), number=number),
+        'inject': timeit.timeit(lambda: injected(1), number=number),
+    }
+
+
+if __name__ == '__main__':
+    number = 100000
+
+    for path in ('results-dir', 'gear/root', 'gear/params/extra', 'gear/naming/default_out_name'):
+        res = bench_lookup(path, number)
+        print(f'{path:<32}' + ''.join(f' {k}: {v / number * 1e9:6.0f} ns' for k, v in res.items()))
+
+    res = bench_inject(number)
+    print(f'{"@inject call":<32}' + ''.join(f' {k}: {v / number * 1e9:6.0f} ns'
+                                            for k, v in res.items()))
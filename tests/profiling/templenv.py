@@ -0,0 +1,80 @@
+import tempfile
+import time
+
+from pygears import Intf, clear, gear, reg
+from pygears.hdl import hdlgen, hdlmod
+from pygears.hdl.sv import SVTemplateEnv
+from pygears.hdl.sv.svcompile import compile_gear
+from pygears.hdl.templenv import TemplateEnv
+from pygears.typing import Uint
+
+
+@gear
+async def incr(din: Uint['w'], *, step) -> Uint['w']:
+    async with din as d:
+        yield (d + step)[:din.dtype.width]
+
+
+def render_string_uncached(self, string, context):
+    # Template string compiled on each call, as before the templates were cached
+    return self.jenv.from_string(string).render(context)
+
+
+def render_modules(modules, render_string):
+    '''Renders the translated HLS modules, returning the average time per
+    module'''
+
+    orig_render_string = TemplateEnv.render_string
+    TemplateEnv.render_string = render_string
+
+    try:
+        template_env = reg['svgen/templenv']
+        start = time.perf_counter()
+        for node, svlines in modules:
+            compile_gear(node, template_env, hdlmod(node).module_name, None, svlines=svlines)
+
+        return (time.perf_counter() - start) / len(modules)
+    finally:
+        TemplateEnv.render_string = orig_render_string
+
+
+def create_env(cache_dir):
+    '''Returns the time it takes to create the environment and load the
+    snippets it needs'''
+
+    reg['hdl/template_cache_dir'] = cache_dir
+    start = time.perf_counter()
+    SVTemplateEnv()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    num = 200
+
+    clear()
+    reg['hls/cache_dir'] = None
+    reg['gear/memoize'] = False
+
+    for i in range(num):
+        Intf(Uint[8]) | incr(step=i)
+
+    with tempfile.TemporaryDirectory() as outdir:
+        hdlgen('/', outdir=outdir)
+
+    modules = []
+    for i in range(num):
+        resolver = hdlmod(reg['gear/root'].child[i]).resolver
+        modules.append((resolver.node, reg['hls/translations'][resolver.digest]))
+
+    uncached = render_modules(modules, render_string_uncached)
+    cached = render_modules(modules, TemplateEnv.render_string)
+    print(f'Module render: {uncached * 1e3:.2f} ms uncached,'
+          f' {cached * 1e3:.2f} ms cached ({uncached / cached:.1f}x)')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        no_cache = create_env(None)
+        cold = create_env(cache_dir)
+        warm = create_env(cache_dir)
+
+    print(f'Environment creation: {no_cache * 1e3:.1f} ms without bytecode cache,'
+          f' {cold * 1e3:.1f} ms cold, {warm * 1e3:.1f} ms warm')
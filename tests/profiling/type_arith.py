@@ -0,0 +1,57 @@
+import timeit
+
+from pygears.typing import Fixp, Int, Uint, Ufixp
+from pygears.typing.type_cache import getitem_cache, arith_cache, type_cache_stats
+
+
+def mac(coefs, samples):
+    '''Bit-accurate multiply-accumulate, as found in the DSP models'''
+    acc = Fixp[8, 24](0)
+    for c, s in zip(coefs, samples):
+        acc = acc + c * s
+
+    return acc
+
+
+def int_ops(a, b):
+    return (a + b) * (a - b) + (a << 2) + a[2:6]
+
+
+def bench(number):
+    coefs = [Fixp[2, 12](c) for c in (0.25, -0.5, 0.75, 0.125)]
+    samples = [Ufixp[1, 10](s) for s in (0.1, 0.2, 0.3, 0.4)]
+    a, b = Uint[8](200), Int[9](-100)
+
+    return {
+        'types': timeit.timeit(lambda: (Uint[8], Int[16], Fixp[3, 10]), number=number),
+        'type_arith': timeit.timeit(lambda: (Uint[8] + Uint[9], Fixp[3, 10] * Fixp[2, 8]),
+                                    number=number),
+        'mac': timeit.timeit(lambda: mac(coefs, samples), number=number),
+        'int_ops': timeit.timeit(lambda: int_ops(a, b), number=number),
+    }
+
+
+if __name__ == '__main__':
+    number = 2000
+
+    maxsize = getitem_cache.maxsize
+    for c in (getitem_cache, arith_cache):
+        c.maxsize = 0
+        c.clear()
+
+    uncached = bench(number)
+
+    for c in (getitem_cache, arith_cache):
+        c.maxsize = maxsize
+
+    cached = bench(number)
+
+    print(f'{"benchmark":<12} {"uncached [us]":>14} {"cached [us]":>12} {"speedup":>8}')
+    for name in uncached:
+        t_unc = uncached[name] / number * 1e6
+        t_c = cached[name] / number * 1e6
+        print(f'{name:<12} {t_unc:>14.2f} {t_c:>12.2f} {t_unc / t_c:>8.1f}')
+
+    print()
+    for name, stats in type_cache_stats().items():
+        print(f'{name}: {stats}')
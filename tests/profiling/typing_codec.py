@@ -0,0 +1,82 @@
+import random
+import timeit
+
+from pygears.typing import Array, Int, Queue, Tuple, Uint, Union, typeof
+from pygears.typing.codec import codec
+
+
+def code_ref(val):
+    '''Field by field packing, as done before the compiled codecs'''
+
+    dtype = type(val)
+    if typeof(dtype, Array):
+        ret = 0
+        for d in reversed(val):
+            ret <<= dtype.data.width
+            if d is not None:
+                ret |= code_ref(d)
+
+        return ret
+    elif typeof(dtype, (Tuple, Queue, Union)):
+        ret = 0
+        for i in range(len(dtype) - 1, -1, -1):
+            ret <<= dtype[i].width
+            ret |= code_ref(tuple.__getitem__(val, i)) & ((1 << dtype[i].width) - 1)
+
+        return ret
+
+    return val.code()
+
+
+def decode_ref(dtype, val):
+    '''Field by field unpacking, as done before the compiled codecs'''
+
+    if typeof(dtype, Union):
+        data = val & ((1 << dtype[0].width) - 1)
+        ctrl = val >> dtype[0].width
+        return dtype((decode_ref(dtype.types[ctrl], data), ctrl))
+    elif typeof(dtype, (Tuple, Queue, Array)):
+        ret = []
+        for t in dtype:
+            ret.append(decode_ref(t, val & ((1 << t.width) - 1)))
+            val >>= t.width
+
+        return dtype(ret)
+
+    return dtype.decode(val)
+
+
+def bench(dtype, number=5000):
+    c = codec(dtype)
+    val = random.getrandbits(dtype.width)
+    inst = dtype.decode(val)
+    assert decode_ref(dtype, val) == inst
+    assert code_ref(inst) == c.code(inst)
+
+    vals = [random.getrandbits(dtype.width) for _ in range(100)]
+
+    return {
+        'code': timeit.timeit(lambda: c.code(inst), number=number),
+        'code_ref': timeit.timeit(lambda: code_ref(inst), number=number),
+        'decode': timeit.timeit(lambda: c.decode(val), number=number),
+        'decode_ref': timeit.timeit(lambda: decode_ref(dtype, val), number=number),
+        'decode_many': timeit.timeit(lambda: c.decode_many(vals), number=number // 100),
+    }
+
+
+if __name__ == '__main__':
+    number = 5000
+    types = [
+        Tuple[Uint[8], Int[8]],
+        Queue[Tuple[Uint[8], Int[8]]],
+        Queue[Tuple[Uint[16], Tuple[Int[8], Uint[4]], Uint[2]], 2],
+        Queue[Array[Tuple[Uint[8], Int[8]], 8], 3],
+        Tuple[Queue[Uint[8]], Union[Int[4], Tuple[Uint[2], Uint[2]]]],
+    ]
+
+    print(f'{"type":<64} {"code [us]":>10} {"ref":>8} {"decode [us]":>12} {"ref":>8}'
+          f' {"decode_many [us/item]":>22}')
+    for dtype in types:
+        res = {k: v / number * 1e6 for k, v in bench(dtype, number).items()}
+        print(f'{repr(dtype):<64} {res["code"]:>10.2f} {res["code_ref"]:>8.2f}'
+              f' {res["decode"]:>12.2f} {res["decode_ref"]:>8.2f} {res["decode_many"]:>22.2f}')
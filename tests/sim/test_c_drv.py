@@ -0,0 +1,48 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from pygears.typing import Uint
+from pygears.sim import c_drv
+from pygears.sim.c_drv import CInputDrv, COutputDrv
+
+
+class VerilibMock:
+    def __getattr__(self, name):
+        def api(*args):
+            return 1
+
+        setattr(self, name, api)
+        return api
+
+
+@pytest.mark.parametrize('bulk', [True, False])
+@pytest.mark.parametrize('width', [8, 32, 33, 64, 65, 512, 4096])
+def test_marshal(width, bulk, monkeypatch):
+    monkeypatch.setattr(c_drv, '_bulk_copy', bulk and c_drv._bulk_copy)
+
+    port = SimpleNamespace(dtype=Uint[width], basename='din')
+    din = CInputDrv(VerilibMock(), port)
+    dout = COutputDrv(VerilibMock(), port)
+
+    for _ in range(10):
+        val = random.getrandbits(width)
+        c_data = din.to_c_data(val)
+
+        if width > 64:
+            # Buffer is reused between the transfers
+            assert c_data is din.din
+            for i in range(len(c_data)):
+                dout.dout[i] = c_data[i]
+        else:
+            dout.dout[0] = c_data.value
+
+        assert dout.from_c_data(dout.dout) == val
+
+
+def test_batch():
+    for width in [1, 31, 32, 33, 64, 65, 200]:
+        codes = [random.getrandbits(width) for _ in range(50)]
+        buf = c_drv.pack_batch(codes, width)
+        assert c_drv.unpack_batch(buf, len(codes), width) == codes
@@ -0,0 +1,178 @@
+from functools import partial
+
+import pytest
+
+from pygears import gear, datagear, clear, reg
+from pygears.lib import drv
+from pygears.sim import sim, timestep, clk
+from pygears.sim.modules.cosim_base import CosimBase, CosimNoData
+from pygears.typing import Uint, code
+
+
+class RegModel:
+    '''Registered pipeline stage which adds one to the passed values, and
+    accepts the new value only once the register is emptied'''
+
+    def __init__(self):
+        self.din_valid = False
+        self.din_data = 0
+        self.dout_ready = False
+        self.reg_valid = False
+        self.reg_data = 0
+
+    @property
+    def din_ready(self):
+        return not self.reg_valid
+
+    def clk(self):
+        if self.din_valid and self.din_ready:
+            self.reg_valid = True
+            self.reg_data = (self.din_data + 1) % 256
+        elif self.dout_ready:
+            self.reg_valid = False
+
+
+class ModelInDrv:
+    def __init__(self, model):
+        self.model = model
+
+    def send(self, data):
+        self.model.din_valid = True
+        self.model.din_data = int(data)
+
+    def reset(self):
+        self.model.din_valid = False
+
+    def ready(self):
+        return self.model.din_ready
+
+
+class ModelOutDrv:
+    def __init__(self, model, dtype):
+        self.model = model
+        self.dtype = dtype
+
+    def reset(self):
+        self.model.dout_ready = False
+
+    def ack(self):
+        self.model.dout_ready = True
+
+    def read(self):
+        if not self.model.reg_valid:
+            raise CosimNoData
+
+        return self.dtype(self.model.reg_data)
+
+
+class SimModel(CosimBase):
+    '''Cosimulates the Python model of the RTL via the same per-cycle port
+    protocol that is used for the Verilator'''
+
+    def __init__(self, gear, batch_log=None, **kwds):
+        super().__init__(gear, **kwds)
+        self.batch_log = batch_log
+
+    def setup(self):
+        self.model = RegModel()
+        self.handlers = {
+            'din': ModelInDrv(self.model),
+            'dout': ModelOutDrv(self.model, self.gear.out_ports[0].dtype)
+        }
+
+        super().setup()
+
+    def forward(self):
+        pass
+
+    def back(self):
+        pass
+
+    def cycle(self):
+        self.model.clk()
+
+    def run_batch(self, in_seqs):
+        # Mirrors run_batch() of the Verilator wrapper
+        self.batch_log.append(in_seqs)
+        din = in_seqs['din']
+        dout = []
+        idx = 0
+        idle = 0
+        cycle = 0
+        m = self.model
+
+        while True:
+            m.din_valid = idx < len(din)
+            if m.din_valid:
+                m.din_data = int(din[idx])
+
+            m.dout_ready = True
+
+            active = False
+            if m.din_valid and m.din_ready:
+                idx += 1
+                active = True
+
+            if m.reg_valid and m.dout_ready:
+                dout.append((cycle, self.handlers['dout'].read()))
+                active = True
+
+            m.clk()
+            cycle += 1
+
+            if active:
+                idle = 0
+            else:
+                idle += 1
+                if idle >= self.timeout:
+                    return {'dout': dout}
+
+
+@gear
+async def incr(din: Uint[8]) -> Uint[8]:
+    async with din as d:
+        yield code(d + 1, Uint[8])
+
+
+@datagear
+def timed_collect(val, *, result):
+    result.append((timestep(), int(val)))
+
+
+@gear
+async def stalled_collect(din, *, result):
+    async with din as d:
+        result.append((timestep(), int(d)))
+        await clk()
+
+
+def test_ports():
+    res = []
+    drv(t=Uint[8], seq=[1, 2, 3]) \
+        | incr(sim_cls=partial(SimModel, timeout=10)) \
+        | timed_collect(result=res)
+
+    sim()
+
+    assert res == [(1, 2), (3, 3), (5, 4)]
+
+
+@pytest.mark.parametrize('sink', [timed_collect, stalled_collect])
+def test_batch(tmpdir, sink):
+    res = {}
+    batch_log = []
+    for batch in [0, 16]:
+        clear()
+        reg['results-dir'] = tmpdir
+
+        res[batch] = []
+        drv(t=Uint[8], seq=[1, 2, 3]) \
+            | incr(sim_cls=partial(SimModel, timeout=10, batch=batch, batch_log=batch_log)) \
+            | sink(result=res[batch])
+
+        sim()
+
+    assert res[16] == res[0]
+
+    # Batched mode is only used if the consumer always accepts the data
+    assert len(batch_log) == (sink is timed_collect)
@@ -1,11 +1,13 @@
-from pygears import Intf, gear, reg
+from pygears import Intf, clear, gear, reg
 from pygears.lib.verif import directed
 from pygears.sim import sim
+from pygears.sim.sim import EventLoop
 from pygears.lib.verif import drv
 from pygears.sim.modules import SimVerilated
 from pygears.typing import Uint, Tuple
 from pygears.lib import add, fmap, decouple
 from functools import partial
+import pytest
 
 
 @gear
@@ -75,3 +77,163 @@ def test_multicycle_comb_middle():
 def test_multicycle_decouple_middle():
     # One additional cycle is needed for Verilator timeout set above
     multicycle_test_gen(dualcycle_wrap_decouple_middle, latency=5)
+
+
+def record_schedule(monkeypatch):
+    '''Records the order in which the simulation gears are run in each phase,
+    and counts how many times the scheduler checked whether a gear is ready.'''
+
+    runs = []
+    checks = [0]
+    scanning = [False]
+
+    def counting(ready):
+        class Counting(type(ready)):
+            def __contains__(self, sim_gear):
+                checks[0] += scanning[0]
+                return super().__contains__(sim_gear)
+
+        if type(ready) is set:
+            return Counting(ready)
+
+        ready.__class__ = Counting
+        return ready
+
+    def scan(method, run):
+        def wrapper(self, *args):
+            prev, scanning[0] = scanning[0], not run
+            try:
+                if run:
+                    sim_gear = args[0]
+                    name = sim_gear.port.name if hasattr(sim_gear, 'port') else sim_gear.gear.name
+                    runs.append((reg['sim/timestep'], self.phase, name))
+
+                return method(self, *args)
+            finally:
+                scanning[0] = prev
+
+        return wrapper
+
+    sim_loop = EventLoop.sim_loop
+
+    def sim_loop_counting(self, timeout):
+        self.forward_ready = counting(self.forward_ready)
+        self.back_ready = counting(self.back_ready)
+        return sim_loop(self, timeout)
+
+    monkeypatch.setattr(EventLoop, 'sim_loop', sim_loop_counting)
+    for name in ['sim_list', 'sim_ready', 'maybe_run_gear']:
+        monkeypatch.setattr(EventLoop, name,
+                            scan(getattr(EventLoop, name), run=(name == 'maybe_run_gear')))
+
+    return runs, checks
+
+
+@pytest.mark.parametrize('channel', ['queue', 'mailbox'])
+def test_scheduler(channel, monkeypatch):
+    data_num = 10
+    runs = {}
+    checks = {}
+
+    for scheduler in ['sweep', 'activity']:
+        clear()
+        reg['sim/scheduler'] = scheduler
+        reg['sim/channel'] = channel
+
+        directed(
+            drv(t=Uint[8], seq=list(range(data_num))) | decouple | decouple,
+            drv(t=Uint[8], seq=list(range(data_num))),
+            f=add,
+            ref=[2 * i for i in range(data_num)])
+
+        with monkeypatch.context() as m:
+            runs[scheduler], checks[scheduler] = record_schedule(m)
+            sim()
+
+        assert reg['sim/timestep'] == data_num + 5
+
+    # Same gears are run in the same order, but the idle ones are not visited
+    assert runs['sweep']
+    assert runs['activity'] == runs['sweep']
+    assert checks['activity'][0] < checks['sweep'][0]
+
+
+def test_topo_sort_deep_chain():
+    from pygears.sim.sim import topo_sort, topo_sort_idx
+
+    class Node:
+        def __init__(self, name):
+            self.name = name
+
+    nodes = [Node(str(i)) for i in range(5000)]
+    dag = {n: [c] for n, c in zip(nodes, nodes[1:])}
+    dag[nodes[-1]] = []
+
+    assert topo_sort(dag) == nodes
+
+    hits = topo_sort_idx.cache_info().hits
+    assert topo_sort(dag) == nodes
+    assert topo_sort_idx.cache_info().hits == hits + 1
+
+
+def test_topo_sort_cycle():
+    from pygears.sim.sim import topo_sort, SimCyclic
+
+    class Node:
+        def __init__(self, name):
+            self.name = name
+
+    a, b, c = Node('a'), Node('b'), Node('c')
+
+    with pytest.raises(SimCyclic, match='a -> b -> c -> a'):
+        topo_sort({a: [b], b: [c], c: [a]})
+
+
+@pytest.mark.parametrize('hooked', [False, True])
+def test_intf_hooks(hooked):
+    from pygears.sim.extens.sim_extend import SimExtend
+
+    puts = []
+    specialized = []
+
+    din = drv(t=Uint[8], seq=list(range(4)))
+
+    # Interface that the driver simulation gear puts the data to
+    src = din.producer.producer
+
+    class PutMonitor(SimExtend):
+        def before_run(self, sim):
+            if hooked:
+                src.events['put'].append(lambda intf, val: puts.append(val) or True)
+
+        def after_timestep(self, sim, timestep):
+            specialized.append('put_nb' in vars(src))
+            return True
+
+    directed(din, f=decouple, ref=list(range(4)))
+
+    sim(extens=[PutMonitor])
+
+    assert puts == (list(range(4)) if hooked else [])
+    assert all(s != hooked for s in specialized)
+    assert specialized
+    assert 'put_nb' not in vars(src)
+
+
+def test_broadcast_shared_value():
+    received = ([], [])
+
+    @gear
+    async def rec(din, *, i):
+        async with din as d:
+            received[i].append(d)
+
+    din = drv(t=Uint[8], seq=[1, 2, 3])
+    din | rec(i=0)
+    din | rec(i=1)
+
+    sim()
+
+    assert received[0] == [1, 2, 3]
+    assert all(type(v) is Uint[8] for v in received[0])
+    assert all(a is b for a, b in zip(*received))
@@ -0,0 +1,125 @@
+import array
+import socket
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from pygears import reg
+from pygears.typing import Tuple, Uint
+from pygears.sim.extens.svsock import (SVSock, CMD_FRAME, CMD_POLL, CMD_SET_DATA, CMD_ACK,
+                                       CMD_CYCLE, CMD_FINISH, u32_repr, u32_size)
+from pygears.sim.modules.cosim_base import CosimNoData
+from pygears.sim.modules.sim_socket import (SVServerIntf, SimSocketInputDrv,
+                                            SimSocketOutputDrv)
+
+
+def recv_words(conn, num):
+    data = b''
+    while len(data) < num * 4:
+        data += conn.recv(num * 4 - len(data))
+
+    return array.array('I', data)
+
+
+class StandInServer(threading.Thread):
+    '''Plays the role of the SystemVerilog side of the pipelined protocol. Each
+    response frame is sent byte by byte to exercise the partial reads.'''
+
+    def __init__(self, conn, intfs, outputs):
+        super().__init__(daemon=True)
+        self.conn = conn
+        self.intfs = intfs
+        self.outputs = outputs
+        self.frames = []
+        self.cmds = []
+        self.data = {}
+
+    def run(self):
+        while True:
+            header = recv_words(self.conn, 1)[0]
+            assert header & CMD_FRAME
+            words = recv_words(self.conn, header & 0xffff)
+            self.frames.append(words)
+
+            words = iter(words)
+            for cmd in words:
+                self.cmds.append(cmd)
+                index = cmd & 0xffff
+
+                if cmd & CMD_SET_DATA:
+                    size = u32_size(self.intfs[index].dtype) // 4
+                    self.data[index] = [next(words) for _ in range(size)]
+                elif cmd & CMD_POLL:
+                    self.poll()
+                elif cmd & CMD_FINISH:
+                    return
+
+    def poll(self):
+        resp = array.array('I')
+        for i, intf in enumerate(self.intfs):
+            if intf.port.direction == 'in':
+                resp.append(1)
+            else:
+                val = self.outputs[i]
+                resp.append(val is not None)
+                resp.extend(u32_repr(0 if val is None else val, intf.dtype))
+
+        pkt = array.array('I', [len(resp)]).tobytes() + resp.tobytes()
+        for b in pkt:
+            self.conn.sendall(bytes([b]))
+
+
+def test_pipelined_cycle():
+    t_din = Uint[16]
+    t_dout = Tuple[Uint[2], Uint[70], Uint[22]]
+
+    def port(name, dtype, direction):
+        return SimpleNamespace(basename=name, dtype=dtype, direction=direction)
+
+    intfs = [
+        SVServerIntf(port('din', t_din, 'in'), None),
+        SVServerIntf(port('dout', t_dout, 'out'), None),
+        SVServerIntf(port('dout_none', Uint[8], 'out'), None)
+    ]
+
+    reg['sim/svsock/intfs'] = intfs
+    # Protocol is exercised without running the simulation
+    reg['sim/simulator'] = SimpleNamespace(events={})
+
+    server_conn, client_conn = socket.socketpair()
+    server = StandInServer(server_conn, intfs, outputs={1: (1, 2**69 + 5, 3), 2: None})
+    server.start()
+
+    main = SVSock(run=False, pipeline=True)
+    main.conn = client_conn
+
+    din = SimSocketInputDrv(intfs[0].port, 0, main=main)
+    dout = SimSocketOutputDrv(intfs[1].port, 1, main=main)
+    dout_none = SimSocketOutputDrv(intfs[2].port, 2, main=main)
+
+    din.send(t_din(0x1234))
+
+    # All the ports are served from a single response frame
+    assert dout.read() == t_dout((1, 2**69 + 5, 3))
+    assert din.ready()
+    with pytest.raises(CosimNoData):
+        dout_none.read()
+
+    assert len(server.frames) == 1
+
+    dout.ack()
+    main.send_cmd(CMD_CYCLE)
+    main.send_cmd(CMD_FINISH)
+    server.join(timeout=5)
+
+    assert len(server.frames) == 2
+    assert server.data[0] == [0x1234]
+    assert server.cmds == [
+        CMD_SET_DATA | 0, CMD_POLL, CMD_ACK | 1, CMD_CYCLE, CMD_FINISH
+    ]
+
+    main.conn = None
+    server_conn.close()
+    client_conn.close()
+    reg['sim/simulator'] = None
@@ -0,0 +1,84 @@
+import os
+import time
+
+from pygears import reg
+from pygears.sim.modules import verilator
+from pygears.sim.modules.verilator import (build_digest, build_cache_fetch, build_cache_store)
+
+
+def write(fn, content):
+    os.makedirs(os.path.dirname(fn), exist_ok=True)
+    with open(fn, 'w') as f:
+        f.write(content)
+
+
+def test_digest(tmpdir):
+    outdir = str(tmpdir)
+    write(os.path.join(outdir, 'top.sv'), 'module top; endmodule')
+    write(os.path.join(outdir, 'sim_main.cpp'), 'int init();')
+    flags = ['verilator', '--top-module top']
+
+    digest = build_digest(outdir, flags)
+
+    # Build products and logs are not part of the digest
+    write(os.path.join(outdir, 'obj_dir', 'pygearslib'), 'lib')
+    write(os.path.join(outdir, 'verilate.log'), 'log')
+    assert build_digest(outdir, flags) == digest
+
+    assert build_digest(outdir, flags + ['--trace']) != digest
+
+    write(os.path.join(outdir, 'top.sv'), 'module top(input clk); endmodule')
+    assert build_digest(outdir, flags) != digest
+
+
+def test_digest_toolchain(tmpdir, monkeypatch):
+    outdir = str(tmpdir)
+    write(os.path.join(outdir, 'top.sv'), 'module top; endmodule')
+    flags = ['verilator', '--top-module top']
+
+    monkeypatch.setattr(verilator, 'toolchain_version', lambda: 'Verilator 4.038\0x86_64')
+    digest = build_digest(outdir, flags)
+
+    monkeypatch.setattr(verilator, 'toolchain_version', lambda: 'Verilator 4.038\0aarch64')
+    assert build_digest(outdir, flags) != digest
+
+
+def test_cache_disabled(tmpdir):
+    # Cache is opt-in
+    assert reg['sim/verilator/cache_dir'] is None
+
+    dll_path = os.path.join(str(tmpdir), 'build', 'pygearslib')
+    write(dll_path, 'a')
+    build_cache_store('a', dll_path)
+    assert not build_cache_fetch('a', os.path.join(str(tmpdir), 'fetch', 'pygearslib'))
+
+
+def test_cache_lru(tmpdir):
+    reg['sim/verilator/cache_dir'] = os.path.join(str(tmpdir), 'cache')
+    reg['sim/verilator/cache_size'] = 2
+
+    dll_path = os.path.join(str(tmpdir), 'build', 'pygearslib')
+    fetch_path = os.path.join(str(tmpdir), 'fetch', 'obj_dir', 'pygearslib')
+
+    assert not build_cache_fetch('a', fetch_path)
+
+    for digest in ['a', 'b']:
+        write(dll_path, digest)
+        build_cache_store(digest, dll_path)
+        time.sleep(0.01)
+
+    assert build_cache_fetch('a', fetch_path)
+    with open(fetch_path) as f:
+        assert f.read() == 'a'
+
+    time.sleep(0.01)
+
+    # 'b' is the least recently used
+    write(dll_path, 'c')
+    build_cache_store('c', dll_path)
+
+    assert build_cache_fetch('a', fetch_path)
+    assert not build_cache_fetch('b', fetch_path)
+    assert build_cache_fetch('c', fetch_path)
+    with open(fetch_path) as f:
+        assert f.read() == 'c'
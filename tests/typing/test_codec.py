@@ -1,5 +1,7 @@
 import pytest
-from pygears.typing import Queue, Uint, Tuple, Array
+from pygears.typing import Queue, Uint, Int, Tuple, Array, Union, Unit
+from pygears.typing import encode_many, decode_many
+from pygears.typing.codec import codec
 
 
 def test_uint():
@@ -51,3 +53,67 @@ def test_tuple():
 @pytest.mark.xfail(raises=TypeError)
 def test_tuple_fail():
     Tuple[Uint[16], Uint[8], Uint[8]]((1, 2)).code()
+
+
+def test_nested():
+    t = Queue[Tuple[{'a': Uint[4], 'b': Array[Int[3], 2]}], 2]
+    val = t(((0xa, (-1, 2)), 2))
+
+    assert val.code() == 0b10_010_111_1010
+    assert t.decode(0b10_010_111_1010) == val
+    assert codec(t).leaves == [(0, 4, Uint[4]), (4, 3, Int[3]), (7, 3, Int[3]),
+                               (10, 2, Uint[2])]
+
+
+def test_union():
+    t = Union[Uint[3], Int[2], Unit]
+
+    assert t((-1, 1)).code() == 0b01_011
+    assert t.decode(0b01_111) == t((-1, 1))
+    assert t.decode(0b10_111) == t((Unit(), 2))
+
+
+def test_union_decode_fail():
+    t = Union[Uint[3], Int[5]]
+
+    assert t.decode(0b1_01011) == t((Int[5](11), 1))
+
+    with pytest.raises(ValueError, match="Uint\\[3\\] cannot represent value '11'"):
+        t.decode(0b0_01011)
+
+
+def test_array_unknown():
+    t = Array[Tuple[Uint[2], Uint[2]], 3]
+    assert t(((1, 2), None, (3, 3))).code() == 0b1111_0000_1001
+
+
+def test_codec_cached():
+    t = Tuple[Uint[2], Queue[Uint[2]]]
+    assert codec(t) is codec(t)
+
+    t_copy = t.copy()
+    assert codec(t_copy).dtype is t_copy
+
+
+def test_many():
+    t = Queue[Tuple[Uint[8], Int[8]]]
+    vals = [((i, -i), i % 2) for i in range(8)]
+    codes = encode_many(t, vals)
+
+    assert codes == [t(v).code() for v in vals]
+    assert decode_many(t, codes) == [t(v) for v in vals]
+
+
+def test_many_numpy():
+    np = pytest.importorskip('numpy')
+
+    t = Tuple[Uint[16], Int[16]]
+    vals = [(i, -i) for i in range(8)]
+    codes = encode_many(t, vals, array=True)
+
+    assert codes.dtype == np.uint64
+    assert codes.tolist() == [t(v).code() for v in vals]
+    assert decode_many(t, codes) == [t(v) for v in vals]
+
+    with pytest.raises(ValueError):
+        encode_many(Tuple[Uint[64], Uint[1]], [(0, 0)], array=True)
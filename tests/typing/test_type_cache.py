@@ -0,0 +1,52 @@
+from pygears.typing import Fixp, Tuple, Uint
+from pygears.typing.type_cache import TypeCache, arith_cache, getitem_cache, type_cache_stats
+
+
+def test_stats():
+    Uint[13] + Uint[14]
+    hits = type_cache_stats()['arith']['hits']
+
+    res = Uint[13] + Uint[14]
+    assert res is Uint[15]
+    assert type_cache_stats()['arith']['hits'] == hits + 1
+
+    hits = type_cache_stats()['getitem']['hits']
+    assert Fixp[3, 11] is Fixp[3, 11]
+    assert type_cache_stats()['getitem']['hits'] >= hits + 1
+
+
+def test_field_names():
+    t_a = Tuple[{'a': Uint[2], 'b': Uint[3]}]
+    t_b = Tuple[{'b': Uint[2], 'a': Uint[3]}]
+
+    # Types with different field names compare equal, but are cached separately
+    assert t_a == t_b
+    assert Tuple[{'a': Uint[2], 'b': Uint[3]}].fields == ('a', 'b')
+    assert Tuple[{'b': Uint[2], 'a': Uint[3]}].fields == ('b', 'a')
+
+
+def test_disabled():
+    maxsize = arith_cache.maxsize
+    arith_cache.maxsize = 0
+    try:
+        size = len(arith_cache)
+        assert Uint[17] * Uint[18] is Uint[35]
+        assert len(arith_cache) == size
+    finally:
+        arith_cache.maxsize = maxsize
+
+    assert getitem_cache.maxsize > 0
+
+
+def test_lru():
+    cache = TypeCache('test', maxsize=2)
+    cache.store('a', 1, [])
+    cache.store('b', 2, [])
+
+    assert cache.lookup('a') == (1, [])
+    cache.store('c', 3, [])
+
+    assert cache.lookup('b') is None
+    assert cache.lookup('a') is not None
+    assert cache.lookup('c') is not None
+    assert cache.stats == {'hits': 3, 'misses': 1, 'size': 2, 'maxsize': 2}
@@ -1,4 +1,5 @@
-from pygears.typing import Int, Uint
+import pytest
+from pygears.typing import Bool, Int, Uint
 
 
 def test_abs():
@@ -39,3 +40,44 @@ def test_add():
     res = Uint[5].max + Int[5].max
     assert isinstance(res, Int[7])
     assert res == 46
+
+
+def test_decode():
+    res = Uint[4].decode(0xf)
+    assert isinstance(res, Uint[4])
+    assert res == 0xf
+
+    with pytest.raises(ValueError):
+        Uint[4].decode(0x1f)
+
+    res = Int[4].decode(0x1f)
+    assert isinstance(res, Int[4])
+    assert res == -1
+
+    res = Bool.decode(3)
+    assert type(res) is Bool
+    assert res == 1
+
+
+def test_trusted_results():
+    a = Uint[8](0xaa)
+    b = Int[4](-3)
+
+    for res, res_type, val in [(a - b, Int[10], 173), (a * b, Int[12], -510),
+                               (b - a, Int[10], -173), (a << 2, Uint[10], 0x2a8),
+                               (b >> 1, Int[3], -2), (a[1:5], Uint[4], 5),
+                               (a @ Uint[2](3), Uint[10], 0x2ab)]:
+        assert type(res) is res_type
+        assert res == val
+        assert res_type(val) == res
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        Uint[4](16)
+
+    with pytest.raises(ValueError):
+        Int[4](8)
+
+    with pytest.raises(ValueError):
+        Uint[4](-1)